@@ -0,0 +1,275 @@
+"""
+Command line: python -m easy_dc {solve,make_graphs,bench,memory,calibrate,render,export,verify} ...
+
+The subcommands import the solver (and numpy) only once they run, so `--help` starts with the standard library alone.
+
+    python -m easy_dc solve 32 80 160 --out solutions
+    python -m easy_dc solve 960 --polish 20000000 --out solutions
+    python -m easy_dc make_graphs 1373600 --output /path/to/graphs
+    python -m easy_dc bench --range 32 9120 --out bench.json
+    python -m easy_dc memory 960 9120 --project 1373600 --out memory.json
+    python -m easy_dc calibrate --orders 32 960 9120
+    python -m easy_dc render solutions/960.cycle --size 2048
+    python -m easy_dc export solutions/960.cycle --style tube
+    python -m easy_dc verify solutions/960.cycle
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+LAYOUTS = 'edist', 'nested', 'ranked'
+VARIANTS = 'weave_solution', 'weave_discocube', 'weave_classy', 'weave_vectors'
+
+
+def orders(start: int = 32, end: int = 2997280) -> List[int]:
+    """
+    The orders of the discocubes from start to end (utils.gens.uon without numpy).
+    """
+    return [o for s in range(1, 200) if start <= (o := (s + 2) * (s + 1) * s * 4 // 3) <= end]
+
+
+def order(text: str) -> int:
+    """
+    An order given on the command line, of any size (see make.is_order).
+    """
+    from easy_dc.make import is_order
+    if not is_order(value := int(text)):
+        raise argparse.ArgumentTypeError(f'{value} is not the order of a discocube, see --help for the orders')
+    return value
+
+
+def solve(args: argparse.Namespace) -> int:
+    from easy_dc import registry
+    from easy_dc.utils.io import get_G, save_cycle
+    from easy_dc.utils.lattice import RankedV
+    if args.store:
+        from easy_dc.utils.store import SolutionStore
+        store = SolutionStore(args.store)
+    for ORD in args.orders:
+        print(f'solving order {ORD}')
+        if args.sharded is not None:
+            variant = 'weave_sharded'
+        else:
+            variant = args.variant or (registry.select(ORD) if args.layout == 'edist' else registry.DEFAULT)
+        G = None if variant == 'weave_sharded' else get_G(ORD, layout=args.layout)
+        start = time.perf_counter()
+        if args.store:
+            cycle = store.solve(ORD, variant=variant, G=G, layout='nested' if G is None else args.layout)
+        elif G is None:
+            from easy_dc.shard import weave_sharded
+            cycle = weave_sharded(ORD, workers=args.sharded or None)
+        else:
+            cycle = registry.solve(G, variant)
+        print(f'time taken: {time.perf_counter() - start:.6f} ({variant})')
+        V = RankedV(ORD) if G is None else G['V']
+        if args.polish:
+            from easy_dc.mutate import polish
+            cycle = polish(cycle, V, steps=args.polish, seed=args.seed, show=True)
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            save_cycle(cycle, os.path.join(args.out, str(ORD)), V=V, encoding='dir3')
+        if args.png:
+            from easy_dc.utils.render import render_cycle
+            os.makedirs(args.png, exist_ok=True)
+            render_cycle(cycle, V, os.path.join(args.png, f'{ORD}.png'), size=args.size)
+        if args.glb:
+            from easy_dc.utils.mesh import export_cycle
+            os.makedirs(args.glb, exist_ok=True)
+            export_cycle(cycle, V, os.path.join(args.glb, f'{ORD}.glb'))
+        if args.plot:
+            from easy_dc.utils.plot import plot_cycle
+            plot_cycle(cycle, V)
+    return 0
+
+
+def make_graphs(args: argparse.Namespace) -> int:
+    from easy_dc.utils import io
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        io.FP_GRAPHS = args.output
+    if args.layout == 'nested':
+        io.get_nested(max(args.orders), make=True, path=args.output and os.path.join(args.output, 'nested.npy'))
+        return 0
+    from easy_dc.make import make_dcgraph
+    for ORD in args.orders:
+        io.save_G(make_dcgraph(ORD, save=False))
+    return 0
+
+
+def memory(args: argparse.Namespace) -> int:
+    from easy_dc.memory import run_memory
+    run_memory(args.orders, sample=args.sample, solve=not args.no_solve, projected=args.project, out=args.out)
+    return 0
+
+
+def calibrate(args: argparse.Namespace) -> int:
+    from easy_dc.registry import CALIBRATION, calibrate
+    table = calibrate(orders=args.orders, variants=args.variants, repeats=args.repeats, path=args.out or CALIBRATION)
+    for ORD, variant in table['fastest'].items():
+        print(f'{ORD:>8} | {variant}')
+    return 0
+
+
+def cycle_vectors(filename: str, layout: str):
+    """
+    The header and vectors of a .cycle file, the nodes of an int32 file numbered by layout.
+    """
+    from easy_dc.make import make_vertices
+    from easy_dc.utils.io import load_cycle, load_cycle_vectors
+    from easy_dc.utils.lattice import RankedV
+    header = load_cycle(filename)[0]
+    V = None if header['encoding'] != 'int32' else make_vertices(header['ORD']) if layout == 'edist' else (
+        RankedV(header['ORD']))
+    return header, load_cycle_vectors(filename, V)
+
+
+def export(args: argparse.Namespace) -> int:
+    from easy_dc.utils.mesh import write_glb
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    for filename in args.files:
+        vectors = cycle_vectors(filename, args.layout)[1]
+        out = os.path.join(args.out or os.path.dirname(filename), f'{os.path.basename(filename).rsplit(".", 1)[0]}.glb')
+        write_glb(vectors, out, style=args.style, radius=args.radius, sides=args.sides, metallic=args.metallic,
+                  roughness=args.roughness)
+    return 0
+
+
+def verify(args: argparse.Namespace) -> int:
+    """
+    Certify .cycle files without their graphs (utils.info.id_chain).
+    """
+    from easy_dc.utils.info import id_chain
+    failed = 0
+    for filename in args.files:
+        try:
+            header, vectors = cycle_vectors(filename, args.layout)
+        except (OSError, ValueError) as e:
+            print(f'💔 {filename}: {e}')
+            failed += 1
+            continue
+        certificate = id_chain(vectors, header['ORD'])
+        print(f'{"🔁" if certificate == "loop" else "💔"} {filename}: order {header["ORD"]}, {certificate or "broken"}')
+        failed += certificate != 'loop'
+    return 1 if failed else 0
+
+
+def render(args: argparse.Namespace) -> int:
+    from easy_dc.utils.render import render_vectors
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    for filename in args.files:
+        vectors = cycle_vectors(filename, args.layout)[1]
+        out = os.path.join(args.out or os.path.dirname(filename), f'{os.path.basename(filename).rsplit(".", 1)[0]}.png')
+        render_vectors(vectors, out, size=args.size, azimuth=args.azimuth, elevation=args.elevation)
+    return 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='easy_dc',
+        description='Solve the Hamiltonian cycle problem on discocube graphs.',
+        epilog=f'orders: {", ".join(map(str, orders()))} ... (any (s + 2)(s + 1)s * 4 / 3)',
+    )
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    solving = commands.add_parser('solve', help='solve one or more orders', epilog=parser.epilog)
+    solving.add_argument('orders', type=order, nargs='+', metavar='ORDER')
+    solving.add_argument('--layout', choices=LAYOUTS, default='edist', help='graph numbering (see utils.io.get_G)')
+    solving.add_argument('--variant', choices=VARIANTS,
+                         help='solver variant (see registry), by default the fastest calibrated for the order')
+    solving.add_argument('--sharded', type=int, nargs='?', const=0, metavar='WORKERS',
+                         help='solve over worker processes (shard.weave_sharded, nested ids), all cores by default')
+    solving.add_argument('--store', metavar='DIR',
+                         help='keep the solutions in a solution store (utils.store, edist layout or sharded)')
+    solving.add_argument('--polish', type=int, metavar='STEPS',
+                         help='anneal every solution over STEPS proposed square switches (see mutate.polish)')
+    solving.add_argument('--seed', type=int, help='seed of the random moves of --polish')
+    solving.add_argument('--out', metavar='DIR', help='write every solution to DIR/ORDER.cycle (dir3 encoding)')
+    solving.add_argument('--plot', action='store_true', help='plot every solution as a 3d line drawing (matplotlib)')
+    solving.add_argument('--png', metavar='DIR', help='render every solution to DIR/ORDER.png (utils.render)')
+    solving.add_argument('--size', type=int, default=1024, help='side of the rendered images in pixels')
+    solving.add_argument('--glb', metavar='DIR',
+                         help='export every solution as a box mesh to DIR/ORDER.glb (utils.mesh)')
+    solving.set_defaults(run=solve)
+
+    making = commands.add_parser('make_graphs', help='make and save the graphs of one or more orders',
+                                 epilog=parser.epilog)
+    making.add_argument('orders', type=order, nargs='+', metavar='ORDER')
+    making.add_argument('--output', metavar='DIR', help='directory of the graphs (FP_GRAPHS by default)')
+    making.add_argument('--layout', choices=('edist', 'nested'), default='edist',
+                        help='nested saves the one nested table of the largest order (see utils.io.get_nested)')
+    making.set_defaults(run=make_graphs)
+
+    # listed for --help only: the arguments are handed to easy_dc.bench as they are
+    commands.add_parser('bench', help='benchmark the solver stages (see python -m easy_dc bench --help)',
+                        add_help=False)
+
+    measuring = commands.add_parser('memory', help='measure the memory of the graph and solver state per order',
+                                    epilog=parser.epilog)
+    measuring.add_argument('orders', type=order, nargs='+', metavar='ORDER')
+    measuring.add_argument('--sample', type=int, default=0, metavar='ENTRIES',
+                           help='estimate every graph component from ENTRIES random entries instead of measuring it')
+    measuring.add_argument('--no-solve', action='store_true', help='measure the graph alone')
+    measuring.add_argument('--project', type=order, nargs='+', default=[], metavar='ORDER',
+                           help='orders to project the memory to, fitted over the orders measured')
+    measuring.add_argument('--out', help='write the report as json')
+    measuring.set_defaults(run=memory)
+
+    calibrating = commands.add_parser('calibrate', help='time the solver variants and keep the fastest per order')
+    calibrating.add_argument('--orders', type=order, nargs='+', default=[32, 960, 9120, 26208], metavar='ORDER')
+    calibrating.add_argument('--variants', nargs='+', choices=VARIANTS, default=VARIANTS)
+    calibrating.add_argument('--repeats', type=int, default=3)
+    calibrating.add_argument('--out', help='calibration table (FP_GRAPHS/calibration.json by default)')
+    calibrating.set_defaults(run=calibrate)
+
+    rendering = commands.add_parser('render', help='render .cycle files to PNG images of any order')
+    rendering.add_argument('files', nargs='+', metavar='FILE')
+    rendering.add_argument('--out', metavar='DIR', help='directory of the images (that of every file by default)')
+    rendering.add_argument('--size', type=int, default=1024, help='side of the images in pixels')
+    rendering.add_argument('--azimuth', type=float, default=30, help='turn about z in degrees')
+    rendering.add_argument('--elevation', type=float, default=25, help='tilt towards the viewer in degrees')
+    rendering.add_argument('--layout', choices=('edist', 'nested'), default='edist',
+                           help='numbering of the nodes of int32 files (dir3 files hold vectors)')
+    rendering.set_defaults(run=render)
+
+    exporting = commands.add_parser('export', help='export .cycle files as meshes (binary glTF)')
+    exporting.add_argument('files', nargs='+', metavar='FILE')
+    exporting.add_argument('--out', metavar='DIR', help='directory of the meshes (that of every file by default)')
+    exporting.add_argument('--style', choices=('box', 'tube'), default='box', help='geometry of the edges')
+    exporting.add_argument('--radius', type=float, default=0.25, help='half-width of the edges (edges are 2 long)')
+    exporting.add_argument('--sides', type=int, default=8, help='sides of the tubes')
+    exporting.add_argument('--metallic', type=float, default=0.0)
+    exporting.add_argument('--roughness', type=float, default=0.5)
+    exporting.add_argument('--layout', choices=('edist', 'nested'), default='edist',
+                           help='numbering of the nodes of int32 files (dir3 files hold vectors)')
+    exporting.set_defaults(run=export)
+
+    verifying = commands.add_parser('verify', help='certify .cycle files as hamiltonian cycles')
+    verifying.add_argument('files', nargs='+', metavar='FILE')
+    verifying.add_argument('--layout', choices=('edist', 'nested'), default='edist',
+                           help='numbering of the nodes of int32 files (dir3 files hold vectors)')
+    verifying.set_defaults(run=verify)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['bench']:
+        from easy_dc.bench import main as bench
+        return bench(argv[1:])
+    args = make_parser().parse_args(argv)
+    return args.run(args)
+
+
+def solve_main() -> int:
+    """
+    The easy_dc-solve script: python -m easy_dc solve.
+    """
+    return main(['solve', *sys.argv[1:]])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Benchmark the stages of the solver over a range of orders.
+
+    python -m easy_dc.bench --range 32 26208 --repeats 5 --out bench.json
+    python -m easy_dc.bench --orders 960 9120 --baseline bench.json --threshold 0.25
+
+Every stage (build the graph, load it from a pickle, solve, certify the solution) is timed separately, after warmup
+runs, and reported as min/median/p95 seconds, seconds per node, and the peak RSS of the process after the stage
+(getrusage is monotonic, so the peak of a stage includes the stages before it). Results are written as json and,
+given a baseline written by an earlier run, compared stage by stage: the run fails (exit code 1) when a median
+regresses by more than the threshold. With --memory, the report also holds the memory of the graph components and
+of the solver stages of every order (easy_dc.memory).
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+from easy_dc.defs import *
+from easy_dc.make import make_dcgraph, renumber_graph
+from easy_dc.solve import weave_solution
+from easy_dc.utils.gens import uon
+from easy_dc.utils.info import id_seq
+from easy_dc.utils.io import pickleload, picklesave
+from easy_dc.utils.trace import TRACE
+
+STAGES = 'build', 'load', 'solve', 'certify'
+NUMBERINGS = 'edist', 'zlevel', 'morton'
+BenchResult = Dict[str, Any]
+BenchReport = Dict[str, Any]
+
+
+def peak_rss() -> int:
+    """
+    Peak resident set size of the process in kilobytes.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def summarize(times: List[float]) -> Dict[str, float]:
+    """
+    min, median, p95 (nearest rank) and mean of a list of times.
+    """
+    ordered = sorted(times)
+    return {
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'p95': ordered[math.ceil(0.95 * len(ordered)) - 1],
+        'mean': statistics.fmean(ordered),
+    }
+
+
+def time_stage(fn, warmup: int = 1, repeats: int = 5) -> Tuple[List[float], Any]:
+    """
+    Run fn warmup times untimed, then repeats times timed. Returns the times and the last result.
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def build_graph(ORD: int, numbering: str = 'edist') -> Graph:
+    """
+    Build the graph of an order, renumbered unless numbering is the canonical edist order (see make.renumber_graph).
+    """
+    G = make_dcgraph(ORD, save=False)
+    return G if numbering == 'edist' else renumber_graph(G, numbering)[0]
+
+
+def bench_order(ORD: int, stages: Iterable[str] = STAGES, warmup: int = 1, repeats: int = 5,
+                trace: bool = False, numbering: str = 'edist') -> List[BenchResult]:
+    """
+    Benchmark the stages for one order, with the nodes numbered by numbering.
+    """
+    results, G, solution = [], None, None
+    with tempfile.TemporaryDirectory() as tmp:
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            if G is None and stage != 'build':
+                G = build_graph(ORD, numbering)
+            if stage == 'build':
+                fn = lambda: build_graph(ORD, numbering)  # noqa: E731
+            elif stage == 'load':
+                picklesave(G, filename := os.path.join(tmp, str(ORD)), show=False)
+                fn = lambda: pickleload(filename)  # noqa: E731
+            elif stage == 'solve':
+                fn = lambda: weave_solution(G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA'])  # noqa: E731
+            else:
+                solution = solution or weave_solution(G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA'])
+                fn = lambda: id_seq(solution, G['A'])  # noqa: E731
+            times, out = time_stage(fn, warmup=warmup, repeats=repeats)
+            if stage == 'build':
+                G = out
+            elif stage == 'solve':
+                solution = out
+                if trace:
+                    TRACE.enable()
+                    fn()
+                    TRACE.disable()
+            elif stage == 'certify' and out != 'loop':
+                raise AssertionError(f'order {ORD}: the solution is not a hamiltonian cycle ({out})')
+            stats = summarize(times)
+            results.append({
+                'order': ORD,
+                'stage': stage,
+                'numbering': numbering,
+                'repeats': repeats,
+                'times': times,
+                **stats,
+                'per_node': stats['median'] / ORD,
+                'peak_rss_kb': peak_rss(),
+                **({'spans': TRACE.summary()} if trace and stage == 'solve' else {}),
+            })
+    return results
+
+
+def run_bench(orders: Iterable[int], stages: Iterable[str] = STAGES, warmup: int = 1, repeats: int = 5,
+              trace: bool = False, out: Optional[str] = None, show: bool = True,
+              numberings: Iterable[str] = ('edist',), memory: bool = False) -> BenchReport:
+    """
+    Benchmark the stages for every order and node numbering, and with memory add the memory report of every order
+    (see easy_dc.memory), write the report to out if given.
+    """
+    orders = list(orders)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'warmup': warmup,
+            'repeats': repeats,
+        },
+        'results': [],
+    }
+    for ORD in orders:
+        for numbering in numberings:
+            for result in bench_order(ORD, stages=stages, warmup=warmup, repeats=repeats, trace=trace,
+                                      numbering=numbering):
+                report['results'].append(result)
+                if show:
+                    print(
+                        f'⭕️ {ORD:>8} | {numbering:<6} | {result["stage"]:<7} | min {result["min"]:.6f} '
+                        f'| median {result["median"]:.6f} '
+                        f'| p95 {result["p95"]:.6f} | {result["per_node"] * 1e6:.3f} µs/n | {result["peak_rss_kb"]} kB'
+                    )
+    if memory:
+        from easy_dc.memory import run_memory
+        report['memory'] = run_memory(orders, show=show)['results']
+    if out:
+        with open(out, 'w') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+def compare(report: BenchReport, baseline: BenchReport, threshold: float = 0.25, stat: str = 'median',
+            floor: float = 1e-3) -> List[Dict[str, Any]]:
+    """
+    Stages of the report slower than the baseline by more than threshold (a fraction of the baseline), ignoring
+    differences smaller than floor seconds.
+    """
+    key = lambda r: (r['order'], r['stage'], r.get('numbering', 'edist'))  # noqa: E731
+    base = {key(r): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        if (before := base.get(key(result))) is None:
+            continue
+        if result[stat] - before[stat] > max(threshold * before[stat], floor):
+            regressions.append({
+                'order': result['order'],
+                'stage': result['stage'],
+                'numbering': result.get('numbering', 'edist'),
+                'baseline': before[stat],
+                'current': result[stat],
+                'ratio': result[stat] / before[stat],
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='easy_dc bench', description='Benchmark the solver stages.')
+    orders = parser.add_mutually_exclusive_group()
+    orders.add_argument('--orders', type=int, nargs='+', help='orders to benchmark')
+    orders.add_argument('--range', type=int, nargs=2, metavar=('START', 'END'), help='every order from start to end')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--numbering', nargs='+', choices=NUMBERINGS, default=['edist'],
+                        help='node numberings to compare (see make.renumber_graph)')
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--trace', action='store_true', help='record the spans of a solve per order')
+    parser.add_argument('--memory', action='store_true',
+                        help='add the memory of the graph components and solver stages per order (see easy_dc.memory)')
+    parser.add_argument('--out', help='write the results as json')
+    parser.add_argument('--baseline', help='json results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown against the baseline')
+    args = parser.parse_args(argv)
+    report = run_bench(
+        args.orders or list(uon(*args.range) if args.range else uon(32, 9120)),
+        stages=args.stages, warmup=args.warmup, repeats=args.repeats, trace=args.trace, out=args.out,
+        numberings=args.numbering, memory=args.memory
+    )
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(report, json.load(f), threshold=args.threshold)
+    for r in regressions:
+        print(
+            f'💔 {r["order"]:>8} | {r["numbering"]:<6} | {r["stage"]:<7} | {r["baseline"]:.6f} -> {r["current"]:.6f} '
+            f'({r["ratio"]:.2f}x)'
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -94,6 +94,7 @@ Paths = List[Path]
 Verts = Tuple[Tuple[int, int, int]]
 EAdj = Dict[FrozenSet[int], Set[FrozenSet[int]]]
 Edges = Tuple[Tuple[int, int]]
+Ends = Tuple[int, int]
 IdxMap = Dict[Any, int]
 NodesMap = Dict[int, int]
 GLvls = Dict[int, Union[int, Dict[str, Any]]]
@@ -102,6 +103,7 @@ Cycle = Tuple[int]
 Mapping = Dict[int, int]
 QuickSet = Set[Iterable]
 Graph = Dict[str, Union[Verts, IdxMap, Edges, AdjDict, EAdj, Mapping]]
+Graphs = Iterator[Graph]
 NodesGroup = Dict[int, Set[int]]
 Warp = Deque[int]
 Start = Optional[int]
@@ -116,9 +118,12 @@ Certificate = str or bool
 Loom = List[Warp]
 WarpedLoom = Dict[int, Any]
 Solution = List[int]
+Solutions = Iterator[Tuple[int, Solution]]
 FrozenEdges = Set[FrozenSet[int]]
 ColoredYarn = Union[List[List[int]], np.ndarray]
 Yarn_Spool = Dict[str, ColoredYarn]
+CycleHeader = Dict[str, Any]
+Stitches = Iterator[Tuple[Tuple[int, int], Tuple[int, int]]]
 
 
 __all__ = [
@@ -131,14 +136,21 @@ __all__ = [
     'Certificate',
     'ColoredYarn',
     'Cycle',
+    'CycleHeader',
+    'Dict',
     'Edges',
+    'Ends',
     'EAdj',
     'FrozenEdges',
+    'FrozenSet',
     'FP_GRAPHS',
     'Graph',
+    'Graphs',
     'GLvls',
     'IdxMap',
     'Iterable',
+    'Iterator',
+    'List',
     'Loom',
     'Mapping',
     'NodesGroup',
@@ -149,8 +161,11 @@ __all__ = [
     'Paths',
     'QuickSet',
     'Solution',
+    'Solutions',
     'Spool',
     'Start',
+    'Stitches',
+    'Tuple',
     'UonGen',
     'Union',
     'Unpacker',
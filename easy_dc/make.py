@@ -2,9 +2,13 @@ from collections import defaultdict
 from itertools import product, chain, repeat, combinations
 
 from more_itertools import chunked
+import numpy as np
 
 from easy_dc.defs import *
-from easy_dc.utils.io import save_G
+from easy_dc.utils.chain import make_coord_index, to_nodes
+from easy_dc.utils.io import NESTED_DTYPE, save_G
+from easy_dc.utils.lattice import RankedV, RankedVI
+from easy_dc.utils.shared import SharedAdjacency, SharedEdgeAdjacency, SharedIndex, SharedLevel
 from easy_dc.utils.info import edist
 
 
@@ -115,18 +119,237 @@ def absumv(v):
     return sum(map(abs, v))
 
 
-def make_vertices(ORD: int = 8) -> Verts:
+def make_vertices(ORD: int = 8, layout: str = 'edist') -> Verts:
     """
     Quick vert maker
     8 = 1 level
+
+    layout 'edist' sorts the vertices by their distance to the origin, 'nested' shell by shell (see make_nested).
     """
-    max_xyz = next(filter(lambda n: round((4 / 3) * (n + 2) * (n + 1) * n) == ORD, range(ORD // 4))) * 2 - 1
+    max_xyz = get_max_xyz(ORD)
     return sorted(
         filter(lambda p: absumv(p) < (max_xyz + 4), product(range(-max_xyz, max_xyz + 1, 2), repeat=3)),
-        key=lambda x: (edist(x), x[0], x[1], x[2])
+        key=(lambda x: (edist(x), x[0], x[1], x[2])) if layout == 'edist' else (lambda x: (absumv(x), *x[::-1]))
     )
 
 
+def is_order(ORD: int) -> bool:
+    """
+    Whether ORD is the order of a discocube, of any size: (s + 2)(s + 1)s is just short of (s + 1) ** 3, so s + 1 is
+    the cube root of 3 / 4 of the order, rounded, and the order is checked against the s it gives.
+    """
+    s = round((0.75 * max(ORD, 0)) ** (1 / 3)) - 1
+    return s >= 1 and (s + 2) * (s + 1) * s * 4 // 3 == ORD
+
+
+def get_max_xyz(ORD: int) -> int:
+    """
+    The largest coordinate of the discocube of order ORD. Raises ValueError when ORD isn't the order of one.
+    """
+    if not is_order(ORD):
+        raise ValueError(f'{ORD} is not the order of a discocube')
+    return (round((0.75 * ORD) ** (1 / 3)) - 1) * 2 - 1
+
+
+def make_nested(ORD: int) -> np.ndarray:
+    """
+    Make the nested layout of a discocube: a table of the vertices (v) and their neighbours (nb, one per basis vector
+    in the order of basis_vectors, -1 where there is none), ordered shell by shell by octahedral level (the manhattan
+    distance to the origin), then by z, y and x.
+
+    Every order adds exactly one shell, so the table of any smaller order is a prefix of this one: table[:k] with the
+    neighbours >= k dropped (see graph_from_nested).
+    """
+    max_xyz = get_max_xyz(ORD)
+    axis = np.arange(-max_xyz, max_xyz + 1, 2, dtype=np.int64)
+    P = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), axis=-1).reshape(-1, 3)
+    P = P[np.abs(P).sum(axis=1) < max_xyz + 4]
+    P = P[np.lexsort((P[:, 0], P[:, 1], P[:, 2], np.abs(P).sum(axis=1)))]
+    table = np.empty(len(P), dtype=NESTED_DTYPE)
+    table['v'], table['nb'] = P, -1
+    index = make_coord_index(P)
+    for d, step in enumerate(np.array([bv.data for bv in basis_vectors()])):
+        inside = np.abs(P + step).sum(axis=1) < max_xyz + 4
+        table['nb'][inside, d] = to_nodes(P[inside] + step, index)
+    return table
+
+
+def graph_from_nested(table: np.ndarray, ranked: bool = False) -> Graph:
+    """
+    Make a discocube graph from a (prefix of a) nested table, see make_nested.
+
+    Nothing is built per node: as the graphs utils.shared.attach_graph makes, A, EA and ZA[-1] are mappings computing
+    their items from table['nb'] (leaving out the neighbours of larger orders), V the vertices as an array and VI a
+    grid of the nodes, and W the weights as an array, for weave_solution. ranked leaves V and VI unmaterialised: they
+    are computed from the index by utils.lattice.RankedV/RankedVI.
+    """
+    ORD, NB, P = len(table), np.asarray(table['nb']), np.asarray(table['v'], dtype=np.int32)
+    if ranked:
+        V, VI = RankedV(ORD), RankedVI(ORD)
+    else:
+        low = int(P.min())
+        grid = np.full(((int(P.max()) - low) // 2 + 1,) * 3, -1, dtype=np.int32)
+        grid[tuple(((P - low) // 2).T)] = np.arange(ORD, dtype=np.int32)
+        V, VI = P, SharedIndex(grid, low)
+    levels, counts = np.unique(P[:, 2][P[:, 2] < -1], return_counts=True)
+    return {
+        'ORD': ORD,
+        'V': V,
+        'VI': VI,
+        'A': SharedAdjacency(NB),
+        'EA': SharedEdgeAdjacency(NB),
+        'W': np.abs(P).sum(axis=1),
+        'ZA': {**dict(zip(levels.tolist(), counts.tolist())), -1: SharedLevel(np.flatnonzero(P[:, 2] == -1), NB)}
+    }
+
+
+class GraphBuilder:
+    """
+    Grows a discocube graph shell by shell: every call to grow appends the vertices of the next octahedral level, their
+    edges (to the previous outer shell and within the new one), the edge adjacencies they touch, and a new bottom
+    z-level, leaving everything already built in place. The vertices are in the nested layout (see make_nested), so
+    order k is always a prefix of order k + 1.
+
+    The graph returned by grow is updated in place by the next call: save or copy it first. The nested table (table)
+    and the python structures grow amortised (arrays double, lists and dicts resize themselves), so building every
+    order up to K costs about as much as building K once.
+
+    Examples:
+        >>> for G in GraphBuilder().graphs(32, 26208):
+        ...     save_G(G, layout='nested')
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.table = np.empty(capacity, dtype=NESTED_DTYPE)
+        self.size, self.level = 0, 0
+        self.V, self.VI, self.E, self.A, self.EA, self.W = [], {}, [], {}, {}, {}
+        self.CC, self.OE, self.Z1, self.counts = {}, {0: set(), 1: set()}, {}, {}
+        self.steps = [bv.data for bv in basis_vectors()]
+
+    def grow(self) -> Graph:
+        """
+        Append the next shell, return the graph of the new order.
+        """
+        self.level += 1
+        L1, max_xyz = 2 * self.level + 1, 2 * self.level - 1
+        shell = sorted(
+            (p for p in product(range(-max_xyz, max_xyz + 1, 2), repeat=3) if absumv(p) == L1),
+            key=lambda p: p[::-1]
+        )
+        self.reserve(self.size + len(shell))
+        new_edges = []
+        for v in shell:
+            n = self.size
+            self.table[n] = (v, (-1,) * 6)
+            self.V.append(v)
+            self.VI[v] = n
+            self.A[n], self.W[n] = set(), L1
+            self.OE[color := (sum(v) + 3) // 2 % 2].add(n)
+            self.CC[n] = color
+            for d, step in enumerate(self.steps):
+                if (m := self.VI.get((v[0] + step[0], v[1] + step[1], v[2] + step[2]))) is not None:
+                    self.table['nb'][n, d], self.table['nb'][m, d ^ 1] = m, n
+                    self.A[n].add(m)
+                    self.A[m].add(n)
+                    self.E += [(n, m), (m, n)]
+                    new_edges.append(frozenset((n, m)))
+            if v[2] == -1:
+                self.Z1[n] = {m for m in self.A[n] if self.V[m][2] == -1}
+                for m in self.Z1[n]:
+                    self.Z1[m].add(n)
+            if v[2] < -1:
+                self.counts[v[2]] = self.counts.get(v[2], 0) + 1
+            self.size += 1
+        for edge in new_edges:
+            u, p = edge
+            self.EA[edge] = {frozenset((a, b)) for a in self.A[u] - {p} for b in self.A[p] - {u} if b in self.A[a]}
+            for other in self.EA[edge]:
+                self.EA.setdefault(other, set()).add(edge)
+        return self.graph()
+
+    def graph(self) -> Graph:
+        """
+        The graph of the current order.
+        """
+        return {
+            'ORD': self.size,
+            'V': self.V,
+            'VI': self.VI,
+            'E': self.E,
+            'A': self.A,
+            'EA': self.EA,
+            'W': self.W,
+            'CC': self.CC,
+            'OE': self.OE,
+            'ZA': {**{z: self.counts[z] for z in sorted(self.counts)}, -1: self.Z1}
+        }
+
+    def graphs(self, start: int = 32, end: int = 26208) -> Graphs:
+        """
+        Grow the graph order by order, yield every order from start to end.
+        """
+        while self.size < end:
+            if (G := self.grow())['ORD'] >= start:
+                yield G
+
+    def reserve(self, size: int):
+        """
+        Make room in the nested table for size vertices, doubling its capacity.
+        """
+        if size > len(self.table):
+            table = np.empty(max(size, 2 * len(self.table)), dtype=NESTED_DTYPE)
+            table[:self.size] = self.table[:self.size]
+            self.table = table
+
+
+def make_permutation(V: Verts, scheme: str = 'zlevel') -> np.ndarray:
+    """
+    The nodes of V in a locality-preserving order: 'zlevel' sorts them by z, y and x so every z-level is a
+    contiguous range of ids, 'morton' by the interleaved bits of their coordinates (z-order curve), 'edist' by their
+    distance from the origin and then x, y and z, which is the numbering of make_dcgraph.
+    """
+    P = np.asarray(V, dtype=np.int64)
+    if scheme == 'edist':
+        return np.lexsort((P[:, 2], P[:, 1], P[:, 0], (P * P).sum(axis=1)))
+    P = (P - P.min(axis=0)) // 2
+    if scheme == 'zlevel':
+        return np.lexsort((P[:, 0], P[:, 1], P[:, 2]))
+    if scheme == 'morton':
+        keys = np.zeros(len(P), dtype=np.uint64)
+        for bit in range(int(P.max()).bit_length()):
+            for axis in range(3):
+                keys |= ((P[:, axis] >> bit) & 1).astype(np.uint64) << np.uint64(3 * bit + axis)
+        return np.argsort(keys, kind='stable')
+    raise ValueError(f'unknown numbering {scheme}, use zlevel, morton or edist')
+
+
+def renumber_graph(G: Graph, scheme: str = 'zlevel') -> Tuple[Graph, np.ndarray]:
+    """
+    Renumber every node of a graph (V, VI, E, A, EA, W, CC, OE and ZA) in the order of make_permutation.
+
+    Returns the renumbered graph and the permutation perm, perm[new] = old: a solution of the renumbered graph maps
+    back to the original numbering as perm[solution].
+    """
+    perm = make_permutation(G['V'], scheme)
+    old, new = perm.tolist(), np.argsort(perm).tolist()
+    V = [tuple(G['V'][o]) for o in old]
+    A = {n: {new[m] for m in G['A'][o]} for n, o in enumerate(old)}
+    E = tuple((new[u], new[p]) for u, p in G['E'])
+    ZA = {z: {new[n]: {new[m] for m in ms} for n, ms in za.items()} if z == -1 else za for z, za in G['ZA'].items()}
+    return {
+        'ORD': G['ORD'],
+        'V': V,
+        'VI': make_vi_map(V),
+        'E': E,
+        'A': A,
+        'EA': {frozenset(new[n] for n in e): {frozenset(new[n] for n in f) for f in fs} for e, fs in G['EA'].items()},
+        'W': {n: G['W'][o] for n, o in enumerate(old)},
+        'CC': {n: G['CC'][o] for n, o in enumerate(old)},
+        'OE': {c: {new[n] for n in ns} for c, ns in G['OE'].items()},
+        'ZA': ZA
+    }, perm
+
+
 def make_vi_map(V: Verts) -> IdxMap:
     """
     Make a mapping of key: data to value: idx_vert to avoid costly index lookups.
@@ -340,18 +563,55 @@ def make_vertices_grid(x, y, z: Optional[int] = None, cellsize: int = 2, offset=
     ]
 
 
-def assemble_cycle(x, y, z, snake):
-    #   REMAP SOLVED TO OTHER LVLS AND WEAVE THEM INTO A CYCLE:
-    prev, joined = [], []
+def make_snake(x: int, y: int, xstride: int = 1, ystride: Optional[int] = None) -> np.ndarray:
+    """
+    Boustrophedon hamiltonian path of an x by y grid, walking the rows along x and turning at the ends.
 
-    for ix in range(1, z, 2):
-        #   FOR EVERY PAIR: REVERSE SECOND. EXTEND TO FIRST
-        joined = [s + (x * y) * (ix - 1) for s in snake] + [s + (x * y) * ix for s in reversed(snake)]
+    Nodes are numbered as in make_grid_ae: n = ix * xstride + iy * ystride, with ystride defaulting to x.
+    """
+    ystride = x if ystride is None else ystride
+    xs = np.arange(x) * xstride
+    rows = np.broadcast_to(xs, (y, x)).copy()
+    rows[1::2] = xs[::-1]
+    return (rows + (np.arange(y) * ystride)[:, None]).ravel()
 
-        #   NEST PREVIOUS LOOP IN CURRENT LOOP
-        joined[1:1] = prev[-1:] + prev[:-1]
-        prev = joined
 
-    #   RETURN JOINED
-    return joined
+def make_spool(max_xyz: int) -> np.ndarray:
+    """
+    The hamiltonian path spun over the level z = -1 of a discocube (solve.weave_solution.spin), as (x, y) rows.
+
+    The path runs around concentric rings from the outside in, each ring a staircase between the manhattan distances
+    m - 1 and m + 1 (m = max_xyz, max_xyz - 4, ...). A ring is one quarter, the staircase Q from (1, m) to (m, 1),
+    and its three rotations by 90 degrees clockwise around z: (m, 1), R(Q), R²(Q), R³(Q), then Q up to (m, 1).
+    """
+    rings = []
+    for m in range(max_xyz, 0, -4):
+        j = np.arange(m)
+        turns = [np.stack((2 * (j // 2) + 1, m - 2 * ((j + 1) // 2)), axis=1)]
+        for _ in range(3):
+            turns.append(turns[-1][:, ::-1] * [1, -1])
+        rings += [turns[0][-1:], *turns[1:], turns[0][:-1]]
+    return np.concatenate(rings) if rings else np.empty((0, 2), dtype=np.int64)
+
+
+def assemble_cycle(x: int, y: int, z: int, snake: Path, stride: Optional[int] = None) -> np.ndarray:
+    """
+    Stack a 2d snake (hamiltonian path) z times along the stacking axis and weave the layers into one cycle.
 
+    Every pair of layers forms a loop (snake + the reversed snake one layer up), each loop nested in the next through
+    the first node of the snake. Written out, the cycle is the column of snake[0] walked down from the second highest
+    layer to the bottom, the rest of the snake walked back and forth up through every layer, and snake[0] of the top
+    layer closing the loop, so it is filled into one preallocated array instead of nesting lists pair by pair.
+
+    z must be even. stride is the node offset between layers, x * y by default.
+    """
+    snake = np.asarray(snake)
+    stride, head, tail = stride or x * y, snake[0], snake[1:]
+    layers = np.arange(z, dtype=np.int64) * stride
+    joined = np.empty(z * len(snake), dtype=np.int64 if layers[-1] + snake.max() >= 2 ** 31 else np.int32)
+    joined[:z - 1] = head + layers[z - 2::-1]
+    woven = joined[z - 1:-1].reshape(z, len(tail))
+    woven[0::2] = tail + layers[0::2, None]
+    woven[1::2] = tail[::-1] + layers[1::2, None]
+    joined[-1] = head + layers[-1]
+    return joined
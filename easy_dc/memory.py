@@ -0,0 +1,225 @@
+"""
+Memory accounting: what the graph of an order and the solver state take, to size the machines for an order.
+
+    graph   the deep size of every component of make.make_dcgraph (V, VI, E, A, EA, W, CC, OE, ZA): everything it holds,
+            each component on its own (the vectors VI shares with V are counted in both), and the whole graph once.
+            With sample, a component of more entries is estimated from that many random entries (high for components
+            of shared objects, see sampled_size).
+    build   the peak and retained traced memory of make_dcgraph.
+    solve   the peak and net traced memory of weave_solution, the peak of every stage (utils.trace spans), and at the
+            end of its main stages the live memory per source line of the package: the loom deques, the Loop.prev and
+            Loop.looped copies, the Loop._edges and Loop._eadjs sets...
+    project the bytes of every component and stage at larger orders, fitted linearly in the order over the orders
+            measured (one order: in proportion).
+
+    python -m easy_dc memory 960 9120 26208 --project 1373600 10039120 --out memory.json
+    python -m easy_dc bench --orders 960 9120 --memory --out bench.json
+"""
+import json
+import re
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from easy_dc.bench import peak_rss
+from easy_dc.defs import *
+from easy_dc.make import make_dcgraph
+from easy_dc.solve import weave_solution
+from easy_dc.utils.trace import TRACE
+
+COMPONENTS = 'V', 'VI', 'E', 'A', 'EA', 'W', 'CC', 'OE', 'ZA'
+SNAPSHOTS = 'spin', 'warp_loom', 'weave'
+MemoryReport = Dict[str, Any]
+
+
+def deep_size(obj: Any, seen: Optional[NodeSet] = None) -> int:
+    """
+    Bytes of obj and everything it holds (the items of containers, the keys and values of dicts, the attributes of
+    objects, numpy arrays with their buffers), every object once: seen, the ids already counted, is updated.
+    """
+    seen = set() if seen is None else seen
+    size, stack = 0, [obj]
+    while stack:
+        if id(o := stack.pop()) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        elif isinstance(o, np.ndarray):
+            if o.base is not None:
+                stack.append(o.base)
+            if o.dtype == object:
+                stack.extend(o.ravel().tolist())
+        elif hasattr(o, '__dict__'):
+            stack.append(vars(o))
+    return size
+
+
+def sampled_size(obj: Any, sample: int, rng: np.random.Generator) -> int:
+    """
+    The deep size of a container of more than sample entries estimated from sample random entries (a key and its value
+    for a dict): its own size plus their mean times its length. Smaller containers and other objects are measured.
+    Objects shared by the entries sampled count once, but those shared with the entries left out count in full, so
+    the estimate is high for containers of shared objects: at order 9120 by 1% for V, VI, W and CC, 10% for A and EA,
+    50% for E (the node ids of its edges).
+    """
+    if not isinstance(obj, (dict, list, tuple, set, frozenset)) or len(obj) <= sample:
+        return deep_size(obj)
+    entries = obj if isinstance(obj, (list, tuple)) else list(obj)
+    picks = rng.choice(len(entries), size=sample, replace=False)
+    seen = {id(i) for i in range(-5, 257)}
+    sizes = [
+        deep_size(entries[i], seen) + (deep_size(obj[entries[i]], seen) if isinstance(obj, dict) else 0)
+        for i in picks.tolist()
+    ]
+    return sys.getsizeof(obj) + round(np.mean(sizes) * len(obj))
+
+
+def graph_sizes(G: Graph, sample: int = 0, seed: int = 0) -> Dict[str, Any]:
+    """
+    The deep size of every component of G on its own (estimated from sample entries if sample) and, measured, of the
+    whole graph.
+    """
+    rng = np.random.default_rng(seed)
+    components = {}
+    for key in COMPONENTS:
+        if key in G:
+            size = sampled_size(G[key], sample, rng) if sample else deep_size(G[key])
+            components[key] = {
+                'bytes': size,
+                'per_node': size / G['ORD'],
+                'entries': len(G[key]) if hasattr(G[key], '__len__') else None,
+                'sampled': bool(sample) and hasattr(G[key], '__len__') and len(G[key]) > sample,
+            }
+    return {'components': components, 'total': None if sample else deep_size(G)}
+
+
+def traced(fn) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run fn under tracemalloc: its result, and the peak and retained traced memory and the wall time of the run.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    if started:
+        tracemalloc.stop()
+    return result, {'peak': peak - before, 'retained': current - before, 'seconds': seconds}
+
+
+def solver_memory(G: Graph, snapshots: Iterable[str] = SNAPSHOTS) -> Dict[str, Any]:
+    """
+    The peak of weave_solution on G and, per span path (the levels together), its calls, wall time and peak, and at
+    the end of the spans named in snapshots (once each: a snapshot takes as long as a small solve) the source lines
+    holding the most live memory.
+    """
+    TRACE.enable(memory=True, snapshots=snapshots)
+    try:
+        with TRACE.span('solve'):
+            weave_solution(G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA'])
+        records, summary = TRACE.records, TRACE.summary()
+    finally:
+        TRACE.disable()
+    total = next(record for record in records if record['path'] == 'solve')
+    spans = {}
+    for path, stats in summary.items():
+        merged = spans.setdefault(re.sub(r'\[[^]]*]', '', path), {'calls': 0, 'wall': 0.0, 'peak': 0})
+        merged['calls'] += stats['calls']
+        merged['wall'] += stats['wall']
+        merged['peak'] = max(merged['peak'], stats['peak'])
+    return {
+        'peak': total['peak'],
+        'net': total['net'],
+        'seconds': total['wall'],
+        'spans': spans,
+        'lines': {record['path']: record['lines'] for record in records if 'lines' in record},
+    }
+
+
+def measure_order(ORD: int, sample: int = 0, solve: bool = True, seed: int = 0) -> Dict[str, Any]:
+    """
+    The memory report of one order: the graph built under tracemalloc, its components, and the solver.
+    """
+    G, build = traced(lambda: make_dcgraph(ORD, save=False))
+    result = {'order': ORD, 'build': build, 'graph': graph_sizes(G, sample=sample, seed=seed)}
+    if solve:
+        result['solve'] = solver_memory(G)
+    result['peak_rss_kb'] = peak_rss()
+    return result
+
+
+def project(results: List[Dict[str, Any]], orders: Iterable[int]) -> Dict[str, Dict[str, int]]:
+    """
+    The bytes of every graph component, the graph build and the solver peak at orders, fitted as a + b * order over the
+    results (b alone from one order).
+    """
+    measured = np.array([r['order'] for r in results], dtype=float)
+    components = results[0]['graph']['components']
+    series = {key: [r['graph']['components'][key]['bytes'] for r in results] for key in components}
+    series['build'] = [r['build']['peak'] for r in results]
+    if all('solve' in r for r in results):
+        series['solve'] = [r['solve']['peak'] for r in results]
+    fits = {
+        key: np.polyfit(measured, values, 1) if len(set(measured)) > 1 else (values[0] / measured[0], 0.0)
+        for key, values in series.items()
+    }
+    return {
+        str(ORD): {key: max(round(slope * ORD + intercept), 0) for key, (slope, intercept) in fits.items()}
+        for ORD in orders
+    }
+
+
+def run_memory(orders: Iterable[int], sample: int = 0, solve: bool = True, projected: Iterable[int] = (),
+               out: Optional[str] = None, show: bool = True) -> MemoryReport:
+    """
+    The memory report of every order and the projection to the projected orders, written to out if given.
+    """
+    results = []
+    for ORD in orders:
+        results.append(result := measure_order(ORD, sample=sample, solve=solve))
+        if show:
+            show_order(result)
+    report = {
+        'meta': {'python': sys.version.split()[0], 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'sample': sample},
+        'results': results,
+        'projection': project(results, projected) if projected and results else {},
+    }
+    if show:
+        for ORD, sizes in report['projection'].items():
+            print(f'📐 {ORD:>8} | ' + ' | '.join(f'{key} {megabytes(size)}' for key, size in sizes.items()))
+    if out:
+        with open(out, 'w') as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+def megabytes(size: Optional[int]) -> str:
+    if size is None:
+        return '-'
+    return f'{size / 2 ** 20:.1f} MB' if size >= 2 ** 20 else f'{size / 2 ** 10:.1f} kB'
+
+
+def show_order(result: Dict[str, Any]):
+    ORD, graph = result['order'], result['graph']
+    sizes = ' | '.join(f'{key} {megabytes(c["bytes"])}' for key, c in graph['components'].items())
+    print(f'⭕️ {ORD:>8} | graph {megabytes(graph["total"])} | {sizes}')
+    print(f'⭕️ {ORD:>8} | build peak {megabytes(result["build"]["peak"])} | {result["peak_rss_kb"]} kB RSS')
+    if 'solve' in result:
+        spans = ' | '.join(f'{path.removeprefix("solve;")} {megabytes(s["peak"])}'
+                           for path, s in result['solve']['spans'].items() if 0 < path.count(';') < 3)
+        print(f'⭕️ {ORD:>8} | solve peak {megabytes(result["solve"]["peak"])} | {spans}')
+        for path, lines in result['solve']['lines'].items():
+            for line in lines[:3]:
+                print(f'   {path:<12} {megabytes(line["bytes"]):>9} {line["line"]:<14} {line["code"]}')
@@ -0,0 +1,315 @@
+"""
+Mutation: polishing a solution towards no non-turns and edges spread evenly over the three axes, by switching the
+edges of the cycle around the unit squares of the lattice (EA: the parallel edges of every edge).
+
+Two parallel edges (a, b) and (c, d) of the cycle on a square, a next to c and b next to d, are switched for its
+other two sides (a, c) and (b, d):
+
+    traversed the same way round   the nodes between them are reversed and the cycle stays one cycle (2-opt).
+    traversed opposite ways        the cycle splits in two. An edge of one of them a step or two from the square and
+                                   its neighbour across another square, an edge of the other, are switched too and
+                                   join them again: one move, blocks of the cycle trading places.
+
+Everything a move changes is local: the edges of the cycle are a bitmap over the lattice (edge low * 3 + axis, low its
+lower end), so a move is proposed, checked and scored in O(1) from the bitmap, the neighbours of every node along
+each axis (lattice_steps) and the positions of its nodes, and the non-turn and axis counts are updated by its deltas.
+The moves start from a pool of the edges of the cycle with a parallel edge in it, updated around every move. Only an
+accepted move touches the order of the nodes, rewriting all but the largest block of the cycle (numpy).
+
+    >>> mutator = Mutator(cycle, V, seed=0)
+    >>> mutator.run(10 ** 6, temperature=24), mutator.nonturns, mutator.axes
+    >>> polished = polish(cycle, V)
+"""
+import math
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.utils.chain import to_vectors
+from easy_dc.utils.cycle import CycleIndex
+
+BATCH = 2 ** 16
+WEIGHT = 16
+TEMPERATURE = 24
+Block = Tuple[int, int, bool]
+Move = Tuple[List[int], List[int], List[Block], NodeSet]
+
+
+def lattice_steps(vectors: np.ndarray, unit: int = 2) -> np.ndarray:
+    """
+    The neighbour of every vector one edge away along each axis m, down at 2 * m and up at 2 * m + 1, -1 off the graph:
+    (n, 6) int64, looked up in a dense grid of the box around the vectors (a discocube fills about a sixth of it).
+    """
+    cells = (vectors - vectors.min(axis=0)) // unit
+    dims = cells.max(axis=0) + 1
+    grid = np.full(dims, -1, dtype=np.int64)
+    grid[tuple(cells.T)] = np.arange(len(cells))
+    padded = np.pad(grid, 1, constant_values=-1)
+    steps = np.empty((len(cells), 6), dtype=np.int64)
+    for m in range(3):
+        for side, delta in enumerate((-1, 1)):
+            moved = cells + 1
+            moved[:, m] += delta
+            steps[:, 2 * m + side] = padded[tuple(moved.T)]
+    return steps
+
+
+class Mutator(CycleIndex):
+    """
+    A cycle under square switches, with its edge bitmap (edges), non-turns and edges per axis (axes) kept up to date.
+    The cost of a cycle is weight per non-turn plus a quarter of the sum of the squared axis counts (moving two edges
+    from axis k to axis j changes it by axes[j] - axes[k] + 2), and the moves are applied by attempt. Almost every
+    node of a base solution turns and its squares with two edges are few, so the moves open up as it is annealed.
+    """
+
+    def __init__(self, cycle: Solution, V: Verts, weight: int = WEIGHT, reach: int = 2, unit: int = 2,
+                 seed: Optional[int] = None):
+        super().__init__(np.array(cycle, dtype=np.int64))
+        n = len(self.nodes)
+        self.vectors = to_vectors(np.arange(n), V).astype(np.int64, copy=False)
+        following = np.roll(self.nodes, -1)
+        delta = self.vectors[following] - self.vectors[self.nodes]
+        if not (np.abs(delta).sum(axis=1) == unit).all():
+            raise ValueError('the cycle does not follow the edges of the lattice')
+        axes = np.abs(delta).argmax(axis=1)
+        low = np.where(delta[np.arange(n), axes] > 0, self.nodes, following)
+        bitmap = np.zeros(3 * n, dtype=np.uint8)
+        bitmap[low * 3 + axes] = 1
+        self.edges = bytearray(bitmap.tobytes())
+        self.axes = np.bincount(axes, minlength=3).tolist()
+        self.nonturns = int((axes == np.roll(axes, 1)).sum())
+        self.steps = lattice_steps(self.vectors, unit)
+        self.weight = weight
+        self.reach = reach
+        self.rng = np.random.default_rng(seed)
+        self.accepted = 0
+        self._nodes, self._at, self._steps = memoryview(self.nodes), memoryview(self.at), memoryview(self.steps.ravel())
+        partnered = np.zeros(3 * n, dtype=bool)
+        for slot in range(4):
+            for k in range(3):
+                j, side = (k + 1 + (slot >> 1)) % 3, slot & 1
+                c = self.steps[:, 2 * j + side]
+                partnered[k::3] |= (c >= 0) & (bitmap[c * 3 + k] == 1)
+        self.pool = np.flatnonzero(partnered & (bitmap == 1)).tolist()
+        self.where = np.full(3 * n, -1, dtype=np.int64)
+        self.where[self.pool] = np.arange(len(self.pool))
+        self._where = memoryview(self.where)
+
+    def nonturn(self, node: int) -> int:
+        """
+        Whether the two edges of node in the cycle are along one axis, its edges up and down it.
+        """
+        edges, steps = self.edges, self._steps
+        for m in range(3):
+            if edges[node * 3 + m] and (other := steps[node * 6 + 2 * m]) >= 0 and edges[other * 3 + m]:
+                return 1
+        return 0
+
+    def edge_id(self, u: int, v: int) -> int:
+        """
+        The id of the edge (u, v) in the bitmap, -1 if u and v are not neighbours.
+        """
+        steps, base = self._steps, u * 6
+        for m in range(3):
+            if steps[base + 2 * m + 1] == v:
+                return u * 3 + m
+            if steps[base + 2 * m] == v:
+                return v * 3 + m
+        return -1
+
+    def partners(self, edge: int) -> Iterator[int]:
+        """
+        The ids of the (up to 4) edges parallel to edge on a square.
+        """
+        a, k = divmod(edge, 3)
+        for j in (k + 1) % 3, (k + 2) % 3:
+            for side in 0, 1:
+                if (c := self._steps[a * 6 + 2 * j + side]) >= 0:
+                    yield c * 3 + k
+
+    def refresh(self, edge: int):
+        """
+        Keep edge in the pool of the edges moves start from, the edges of the cycle with a parallel edge in it, if
+        and only if it is one (O(1): the last of the pool takes the place of an edge leaving it).
+        """
+        where, pool = self._where, self.pool
+        active = self.edges[edge] and any(self.edges[other] for other in self.partners(edge))
+        if active and where[edge] < 0:
+            where[edge] = len(pool)
+            pool.append(edge)
+        elif not active and (i := where[edge]) >= 0:
+            last = pool.pop()
+            if last != edge:
+                pool[i], where[last] = last, i
+            where[edge] = -1
+
+    def propose(self, edge: int, slot: int, offset: int = 0) -> Optional[Move]:
+        """
+        The move switching edge (low * 3 + axis k) with its parallel edge in slot (0..3: the other two axes, down or
+        up), joining at offset (12 * steps from an end of the split + 6 * end + direction across, below 12 * reach) if
+        the switch splits the cycle. None if an edge is not in the cycle or the cycle would not stay one: (edges
+        removed, edges added, the blocks of positions (start, length, reversed) in their new order, the nodes whose
+        turns change).
+        """
+        edges, steps, at, nodes, n = self.edges, self._steps, self._at, self._nodes, len(self.nodes)
+        if not edges[edge]:
+            return None
+        a, k = divmod(edge, 3)
+        j, side = (k + 1 + (slot >> 1)) % 3, slot & 1
+        c = steps[a * 6 + 2 * j + side]
+        if c < 0 or not edges[c * 3 + k]:
+            return None
+        b, d = steps[a * 6 + 2 * k + 1], steps[c * 6 + 2 * k + 1]
+        forward, parallel = (at[b] - at[a]) % n == 1, (at[d] - at[c]) % n == 1
+        p, q = at[a] if forward else at[b], at[c] if parallel else at[d]
+        inner = (q - p) % n
+        removed, added = [a * 3 + k, c * 3 + k], [(a if side else c) * 3 + j, (b if side else d) * 3 + j]
+        if forward == parallel:
+            return removed, added, [(p + 1, inner, True), (q + 1, n - inner, False)], {a, b, c, d}
+        # the split: (p + 1 .. q) closed by (q, p + 1), the rest (q + 1 .. p) closed by (p, q + 1). Joined by the edge
+        # (r, r + 1) of the first, t steps from either end, and its neighbour across the square in direction
+        t, rest = divmod(offset, 12)
+        end, direction = divmod(rest, 6)
+        if t > inner - 2:
+            return None
+        r = (q - 1 - t if end else p + 1 + t) % n
+        e, f = nodes[r], nodes[(r + 1) % n]
+        g, h = steps[e * 6 + direction], steps[f * 6 + direction]
+        if g < 0 or h < 0 or (at[g] - q - 1) % n >= n - inner or (at[h] - q - 1) % n >= n - inner:
+            return None
+        if (at[h] - at[g]) % n == 1:
+            s, cross = at[g], False
+        elif (at[g] - at[h]) % n == 1:
+            s, cross = at[h], True
+        else:
+            return None
+        first, second = ((p + 1) % n, (r - p) % n), ((r + 1) % n, (q - r) % n)
+        third, fourth = ((q + 1) % n, (s - q) % n), ((s + 1) % n, (p - s) % n)
+        blocks = [(*first, False), (*fourth, False), (*third, False), (*second, False)] if cross else [
+            (*first, False), (*third, True), (*fourth, True), (*second, False)]
+        axis, up = divmod(direction, 2)
+        return removed + [self.edge_id(e, f), self.edge_id(g, h)], added + [
+            (e if up else g) * 3 + axis, (f if up else h) * 3 + axis
+        ], blocks, {a, b, c, d, e, f, g, h}
+
+    def switch(self, move: Move, undo: bool = False) -> int:
+        """
+        Switch the edges of move in the bitmap (back if undo): the change in non-turns.
+        """
+        removed, added, _, touched = move
+        before = sum(map(self.nonturn, touched))
+        for edge in added if undo else removed:
+            self.edges[edge] = 0
+        for edge in removed if undo else added:
+            self.edges[edge] = 1
+        return sum(map(self.nonturn, touched)) - before
+
+    def cost(self, move: Move, nonturns: int) -> int:
+        """
+        The change in cost of move, times 4: the squares of the axis counts change by an integer.
+        """
+        axes = self.axes[:]
+        for edge in move[0]:
+            axes[edge % 3] -= 1
+        for edge in move[1]:
+            axes[edge % 3] += 1
+        return 4 * self.weight * nonturns + sum(x * x for x in axes) - sum(x * x for x in self.axes)
+
+    def attempt(self, move: Move, temperature: float = 0, draw: float = 1) -> bool:
+        """
+        Apply move if it does not raise the cost or, at a temperature, with probability exp(-rise / temperature)
+        (draw uniform in [0, 1)).
+        """
+        nonturns = self.switch(move)
+        if (rise := self.cost(move, nonturns) / 4) > 0 and (not temperature or draw >= math.exp(-rise / temperature)):
+            self.switch(move, undo=True)
+            return False
+        for edge in move[0]:
+            self.axes[edge % 3] -= 1
+        for edge in move[1]:
+            self.axes[edge % 3] += 1
+        self.nonturns += nonturns
+        self.rearrange(move[2])
+        for edge in {*move[0], *move[1]}:
+            for other in (edge, *self.partners(edge)):
+                self.refresh(other)
+        self.accepted += 1
+        return True
+
+    def rearrange(self, blocks: List[Block]):
+        """
+        Put the blocks of positions (start, length, reversed) in their new order around the cycle: the largest stays
+        where it is, read forward (the whole cycle read backward if need be), and the rest is written after it.
+        """
+        n = len(self.nodes)
+        largest = max(range(len(blocks)), key=lambda i: blocks[i][1])
+        if blocks[largest][2]:
+            blocks, largest = [(s, size, not r) for s, size, r in blocks[::-1]], len(blocks) - 1 - largest
+        start, size, _ = blocks[largest]
+        rest = blocks[largest + 1:] + blocks[:largest]
+        if not rest:
+            return
+        positions = np.concatenate([
+            np.arange(s + size - 1, s - 1, -1) if r else np.arange(s, s + size) for s, size, r in rest
+        ]) % n
+        targets = np.arange(start + size, start + n) % n
+        moved = self.nodes[positions]
+        self.nodes[targets] = moved
+        self.at[moved] = targets
+
+    def polished(self) -> bool:
+        """
+        No non-turns and the axes within one move (2 edges) of each other.
+        """
+        return not self.nonturns and max(self.axes) - min(self.axes) <= 2
+
+    def run(self, steps: int, temperature: float = 0, cooling: bool = True, stop: bool = True) -> int:
+        """
+        Propose steps random moves, an edge of the pool, slot and offset each, applying them by attempt at a
+        temperature falling linearly to 0 over the steps (unless not cooling), until polished if stop: the number of
+        moves applied.
+        """
+        accepted, pool = self.accepted, self.pool
+        propose, attempt = self.propose, self.attempt
+        for lo in range(0, steps, BATCH):
+            count = min(BATCH, steps - lo)
+            heat = temperature * (1 - lo / steps) if cooling else temperature
+            draws = zip(self.rng.random(count).tolist(), *(
+                self.rng.integers(0, high, count).tolist() for high in (4, 12 * self.reach)
+            ), self.rng.random(count).tolist())
+            for pick, slot, offset, draw in draws:
+                if not pool:
+                    return self.accepted - accepted
+                move = propose(pool[int(pick * len(pool))], slot, offset)
+                if move is not None and attempt(move, heat, draw):
+                    if stop and self.polished():
+                        return self.accepted - accepted
+        return self.accepted - accepted
+
+    def recount(self) -> Tuple[int, List[int]]:
+        """
+        The non-turns and edges per axis counted over the whole cycle, to check the counts kept by the moves.
+        """
+        delta = self.vectors[np.roll(self.nodes, -1)] - self.vectors[self.nodes]
+        axes = np.abs(delta).argmax(axis=1)
+        return int((axes == np.roll(axes, 1)).sum()), np.bincount(axes, minlength=3).tolist()
+
+    def cycle(self) -> Solution:
+        return self.nodes.tolist()
+
+
+def polish(cycle: Solution, V: Verts, steps: int = 10 ** 7, weight: int = WEIGHT, temperature: float = TEMPERATURE,
+           seed: Optional[int] = None, show: bool = False) -> Solution:
+    """
+    The cycle annealed over steps proposed moves (Mutator.run) and then, unless polished, quenched over steps / 4 more
+    at temperature 0.
+    """
+    mutator = Mutator(cycle, V, weight=weight, seed=seed)
+    if show:
+        print(f'⭕️ {len(cycle)} | non-turns {mutator.nonturns} | axes {mutator.axes}')
+    moves = mutator.run(steps, temperature)
+    if not mutator.polished():
+        moves += mutator.run(steps // 4)
+    if show:
+        print(f'⭕️ {len(cycle)} | non-turns {mutator.nonturns} | axes {mutator.axes} | {moves} moves')
+    return mutator.cycle()
@@ -0,0 +1,389 @@
+"""
+Out-of-core weaving: weave_solution for orders whose graph doesn't fit in memory.
+
+The graph is never built. Nodes are numbered in the nested layout and computed from their vectors (utils.lattice), the
+only level held in memory is the one being cut, and every thread of the loom is written to disk as it grows (two
+append-only arrays, one per end) with only its ends kept in memory. The loops are sewn at their stitch points without
+being read back: every node of the stitch columns is marked with its thread and position as it is spun, the joined
+cycle is kept as a rope of (loop, start, stop, reversed) segments, and it is streamed from the threads to a .cycle
+file at the end (the upper half of every loop being the mirror image of its thread).
+
+    weave_out_of_core(ORD, 'solution', budget=2 ** 30)
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.make import get_max_xyz, make_spool
+from easy_dc.utils.io import CycleWriter
+from easy_dc.utils.lattice import RankedV, rank, unrank
+from easy_dc.utils.trace import span
+
+"""
+Columns (x, y) of the stitch points (see solve.weave_solution.stitches).
+"""
+STITCH_COLUMNS = (1, 1), (3, 1), (1, 3), (3, 3)
+MIRROR = np.array([1, 1, -1])
+"""
+Working memory per node (bytes, measured) of a level being cut and of a chunk being streamed to the file.
+"""
+LEVEL_BYTES = 256
+CHUNK_BYTES = 512
+
+
+class Spill:
+    """
+    Append-only int array on disk, buffered in memory up to size items.
+    """
+
+    def __init__(self, path: str, size: int, dtype=np.int64):
+        self.path, self.dtype = path, np.dtype(dtype)
+        self.buffer, self.used, self.length = np.empty(size, dtype=dtype), 0, 0
+
+    def extend(self, values: np.ndarray):
+        if self.used + len(values) > len(self.buffer):
+            self.flush()
+        if len(values) > len(self.buffer):
+            with open(self.path, 'ab') as f:
+                f.write(np.asarray(values, dtype=self.dtype).tobytes())
+        else:
+            self.buffer[self.used:self.used + len(values)] = values
+            self.used += len(values)
+        self.length += len(values)
+
+    def flush(self):
+        if self.used:
+            with open(self.path, 'ab') as f:
+                f.write(self.buffer[:self.used].tobytes())
+            self.used = 0
+
+    def close(self):
+        """
+        Flush and drop the buffer.
+        """
+        self.flush()
+        self.buffer = None
+
+    def read(self, lo: int, hi: int) -> np.ndarray:
+        """
+        Items lo to hi, read from the file (not mapped, so they don't stay resident).
+        """
+        if hi <= lo:
+            return np.empty(0, dtype=self.dtype)
+        with open(self.path, 'rb') as f:
+            f.seek(lo * self.dtype.itemsize)
+            return np.fromfile(f, dtype=self.dtype, count=hi - lo)
+
+
+class Strand:
+    """
+    A thread of the loom on disk, closed into its loop by the mirror image: left holds the nodes added to its start
+    (in the order added), right the nodes added to its end. Position i < m of the loop (m the length of the thread)
+    is the i-th node of the thread, position 2m - 1 - i its mirror image.
+    """
+
+    def __init__(self, idx: int, path: str, size: int):
+        self.idx, self.first, self.last = idx, None, None
+        self.left, self.right = Spill(f'{path}.{idx}.l', size), Spill(f'{path}.{idx}.r', size)
+        self.marks: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self):
+        return 2 * (self.left.length + self.right.length)
+
+    def extend(self, nodes: np.ndarray, left: bool, marks: np.ndarray):
+        """
+        Add nodes to one end, marking the stitch points (marks) among them.
+        """
+        spill = self.left if left else self.right
+        for at in np.flatnonzero(np.isin(nodes, marks)).tolist():
+            self.marks[int(nodes[at])] = left, spill.length + at
+        spill.extend(nodes)
+        if left:
+            self.first = int(nodes[-1])
+        else:
+            self.last = int(nodes[-1])
+            self.first = int(nodes[0]) if self.first is None else self.first
+
+    def close(self):
+        self.left.close(), self.right.close()
+        n, half = self.left.length, len(self) // 2
+        self.marks = {node: n - 1 - at if left else n + at for node, (left, at) in self.marks.items()}
+        self.marks.update({int(mirror(np.array([node]))[0]): 2 * half - 1 - at for node, at in self.marks.items()})
+
+    def thread(self, lo: int, hi: int) -> np.ndarray:
+        """
+        The nodes of the thread from lo to hi.
+        """
+        n = self.left.length
+        parts = []
+        if lo < n:
+            parts.append(self.left.read(n - min(hi, n), n - lo)[::-1])
+        if hi > n:
+            parts.append(self.right.read(max(lo, n) - n, hi - n))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def get(self, lo: int, hi: int) -> np.ndarray:
+        """
+        The nodes of the loop from lo to hi.
+        """
+        half, parts = len(self) // 2, []
+        if lo < half:
+            parts.append(self.thread(lo, min(hi, half)))
+        if hi > half:
+            parts.append(mirror(self.thread(2 * half - hi, 2 * half - max(lo, half))[::-1]))
+        return np.concatenate(parts)
+
+
+class Rope:
+    """
+    A cycle as a list of segments (strand, start, stop, reversed) of loops on disk.
+    """
+
+    def __init__(self, strand: Strand):
+        self.segments = [(strand, 0, len(strand), False)]
+        self.length = len(strand)
+
+    def index(self, strand: Strand, at: int) -> int:
+        """
+        The position in the rope of position at of strand.
+        """
+        offset = 0
+        for s, lo, hi, rev in self.segments:
+            if s is strand and lo <= at < hi:
+                return offset + (hi - 1 - at if rev else at - lo)
+            offset += hi - lo
+        raise ValueError(f'position {at} of loop {strand.idx} is not in the rope')
+
+    def node(self, i: int) -> int:
+        """
+        The node at position i of the rope.
+        """
+        i %= self.length
+        for s, lo, hi, rev in self.segments:
+            if i < hi - lo:
+                return int(s.get(at := hi - 1 - i if rev else lo + i, at + 1)[0])
+            i -= hi - lo
+        raise IndexError(i)
+
+    def slice(self, start: int, stop: int) -> List[Tuple[Strand, int, int, bool]]:
+        """
+        The segments from position start to stop.
+        """
+        out, offset = [], 0
+        for s, lo, hi, rev in self.segments:
+            size = hi - lo
+            a, b = max(start - offset, 0), min(stop - offset, size)
+            if a < b:
+                out.append((s, hi - b, hi - a, True) if rev else (s, lo + a, lo + b, False))
+            offset += size
+        return out
+
+    @staticmethod
+    def flip(segments: List[Tuple[Strand, int, int, bool]]) -> List[Tuple[Strand, int, int, bool]]:
+        return [(s, lo, hi, not rev) for s, lo, hi, rev in reversed(segments)]
+
+    def chunks(self, size: int) -> Iterator[np.ndarray]:
+        """
+        The nodes of the rope in chunks of at most size nodes.
+        """
+        for s, lo, hi, rev in self.segments:
+            for a in range(0, hi - lo, size):
+                b = min(a + size, hi - lo)
+                yield s.get(hi - b, hi - a)[::-1] if rev else s.get(lo + a, lo + b)
+
+
+def mirror(nodes: np.ndarray) -> np.ndarray:
+    """
+    The nodes (x, y, -z) of nodes (x, y, z), in the nested layout.
+    """
+    return rank(unrank(nodes) * MIRROR) if len(nodes) else nodes
+
+
+def level_count(max_xyz: int, z: int) -> int:
+    """
+    The number of nodes in the level z of a discocube.
+    """
+    half = (max_xyz + 4 - abs(z)) // 2
+    return 2 * (half - 1) * half
+
+
+def spin(max_xyz: int) -> Dict[int, np.ndarray]:
+    """
+    solve.weave_solution.spin on the coordinates of the level z = -1, returning the spool as (n, 2) arrays.
+    """
+    natural = make_spool(max_xyz)
+    return {3: natural, 1: natural[-level_count(max_xyz, -3):] * -1 + [0, 2]}
+
+
+def cut(tour: np.ndarray, bobbins: NodeSet) -> List[np.ndarray]:
+    """
+    solve.weave_solution.cut on arrays.
+    """
+    idxs = np.flatnonzero(np.isin(tour, np.fromiter(bobbins, dtype=np.int64)))
+    if len(idxs) != len(bobbins):
+        raise ValueError('bobbins missing from the level')
+    subtours, prev, last_ix = [], -1, len(tour) - 1
+    for e, idx in enumerate(idxs.tolist()):
+        if e == len(idxs) - 1 and idx != last_ix:
+            subtours += [tour[prev + 1: idx], tour[idx:]]
+        else:
+            subtours += [tour[prev + 1:idx + 1]]
+            prev = idx
+    return [t if int(t[0]) in bobbins else t[::-1] for t in subtours if len(t)]
+
+
+def warp_loom(max_xyz: int, path: str, size: int) -> Tuple[List[Strand], List[int]]:
+    """
+    solve.weave_solution.warp_loom level by level with the threads on disk. Returns the loops (sorted as there) and
+    their extents.
+    """
+    with span('spin'):
+        spool = spin(max_xyz)
+    bobbins, loom, levels = None, [], []
+    for z in [*range(-max_xyz, -1, 2), -1]:
+        with span('level', z=z):
+            xy = spool[z % 4][-(len(spool[3]) if z == -1 else level_count(max_xyz, z)):]
+            yarn = rank(np.column_stack((xy, np.full(len(xy), z))))
+            marks = rank(np.array([(*c, z) for c in STITCH_COLUMNS]))
+            warps = cut(yarn, bobbins) if bobbins else [yarn]
+            heads = {int(warp[0]): idx for idx, warp in enumerate(warps)}
+            woven = set()
+            for strand in loom:
+                for left, end in (True, strand.first), (False, strand.last):
+                    if (idx := heads.get(end)) is not None and idx not in woven:
+                        woven.add(idx)
+                        strand.extend(warps[idx][1:], left, marks)
+            for idx, warp in enumerate(warps):
+                if idx not in woven:
+                    loom.append(strand := Strand(len(loom), path, size))
+                    strand.extend(warp, False, marks)
+            levels.extend([-z] * (len(loom) - len(levels)))
+            if z != -1:
+                bobbins, up = set(), rank(np.array([(*c, z + 2) for c in STITCH_COLUMNS]))
+                for strand in loom:
+                    left, right = rank(unrank([strand.first, strand.last]) + [0, 0, 2]).tolist()
+                    strand.extend(np.array([left]), True, up)
+                    strand.extend(np.array([right]), False, up)
+                    bobbins |= {left, right}
+    for strand in loom:
+        strand.close()
+    order = sorted(range(len(loom)), key=lambda idx: loom[idx].first)
+    return [loom[idx] for idx in order], [levels[idx] for idx in order]
+
+
+def weave_out_of_core(ORD: int, filename: str, budget: int = 2 ** 30, encoding: str = 'dir3',
+                      tmpdir: Optional[str] = None) -> str:
+    """
+    Solve the discocube of order ORD out of core and write the cycle to filename (a .cycle file, see utils.io), with
+    the nodes numbered in the nested layout.
+
+    budget (bytes) bounds the working memory on top of the interpreter: the level being cut (O(ORD^(2/3)) nodes, a
+    MemoryError is raised up front if it alone exceeds the budget), and with what is left the threads' buffers and
+    the chunks streamed to the file. The threads are written to tmpdir (a temporary directory by default), which
+    needs about 8 * ORD bytes.
+
+    The loops of every order tried (all up to 300000) are joined at their stitch points. Should those of some order
+    not be, RuntimeError is raised: solving it in core would break the budget.
+    """
+    max_xyz = get_max_xyz(ORD)
+    if (level := LEVEL_BYTES * level_count(max_xyz, -1)) > budget:
+        raise MemoryError(f'order {ORD} needs {level} bytes for its widest level, over the budget of {budget}')
+    chunk = max(1024, (budget - level) // CHUNK_BYTES)
+    workdir = tempfile.mkdtemp(dir=tmpdir, prefix='easy_dc.')
+    try:
+        with span('warp_loom'):
+            loom, extents = warp_loom(max_xyz, os.path.join(workdir, 'thread'), max(1024, chunk // max_xyz))
+        with span('weave'):
+            rope = sew(loom, extents)
+        if rope is None:
+            raise RuntimeError(f'the loops of order {ORD} could not all be joined at their stitch points')
+        with span('write'), CycleWriter(filename, ORD=ORD, V=RankedV(ORD), encoding=encoding) as writer:
+            for nodes in rope.chunks(chunk):
+                writer.write(nodes)
+        return writer.filename
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def sew(loom: List[Strand], extents: List[int]) -> Optional[Rope]:
+    """
+    solve.weave_solution.sew on ropes: join every weft to the warp (the first loop) at its stitch points. Returns the
+    joined rope, None if some weft couldn't be joined.
+    """
+    warp, wefts = Rope(loom[0]), dict(enumerate(loom[1:]))
+    sewn = {loom[0].idx}
+    owner = {node: strand for strand in loom for node in strand.marks}
+    while wefts:
+        before = len(wefts)
+        for idx in [*wefts]:
+            weft = wefts[idx]
+            for warp_e, weft_e in stitches(extents[idx + 1], owner):
+                if all(owner[n].idx in sewn for n in warp_e) and is_edge(Rope(weft), weft, *weft_e) and \
+                        is_edge(warp, None, *warp_e, owner):
+                    sewn.add(weft.idx)
+                    join(warp, warp_e, weft, weft_e, owner)
+                    del wefts[idx]
+                    break
+        if len(wefts) == before:
+            return None
+    return warp
+
+
+def stitches(h: int, owner: Dict[int, Strand]) -> Stitches:
+    """
+    solve.weave_solution.stitches with the nodes computed by rank (the stitch points are all marked).
+    """
+    for (x, y, lo, hi), (ox, oy) in (
+        *(((1, 1, s * (h - 2), s * h), (3, 1)) for s in (1, -1)),
+        *(((3, 1, lo, hi), (1, 1)) for lo, hi in ((-1, 1), (1, 3), (-3, -1))),
+    ):
+        pair = rank(np.array([(x, y, lo), (x, y, hi), (ox, oy, lo), (ox, oy, hi)])).tolist()
+        if all(n in owner for n in pair):
+            yield tuple(pair[:2]), tuple(pair[2:])
+    for z in h, -h:
+        pair = rank(np.array([(1, 1, z), (3, 1, z), (1, 3, z), (3, 3, z)])).tolist()
+        if all(n in owner for n in pair):
+            yield tuple(pair[:2]), tuple(pair[2:])
+
+
+def position(rope: Rope, node: int, owner: Dict[int, Strand]) -> int:
+    return rope.index(strand := owner[node], strand.marks[node])
+
+
+def is_edge(rope: Rope, strand: Optional[Strand], u: int, v: int, owner: Optional[Dict[int, Strand]] = None) -> bool:
+    """
+    Whether u and v are next to each other in the rope.
+    """
+    try:
+        i = rope.index(strand, strand.marks[u]) if strand else position(rope, u, owner)
+    except (KeyError, ValueError):
+        return False
+    return v in (rope.node(i - 1), rope.node(i + 1))
+
+
+def rotate_to_edge(rope: Rope, start: int, end: int, owner: Dict[int, Strand]):
+    """
+    solve.weave_solution.Loop.rotate_to_edge on a rope.
+    """
+    n = rope.length
+    if rope.node(-1) == start and rope.node(0) == end:
+        rope.segments = Rope.flip(rope.segments)
+    elif (i_s := position(rope, start, owner)) > (i_e := position(rope, end, owner)):
+        rope.segments = rope.slice(i_s, n) + rope.slice(0, i_s)
+    else:
+        rope.segments = Rope.flip(rope.slice(0, i_e)) + Rope.flip(rope.slice(i_e, n))
+
+
+def join(warp: Rope, edge: Tuple[int, int], strand: Strand, oedge: Tuple[int, int], owner: Dict[int, Strand]):
+    """
+    solve.weave_solution.Loop.join on ropes.
+    """
+    rotate_to_edge(warp, *edge, owner)
+    other = Rope(strand)
+    a, b = unrank([oedge[0], edge[-1]])
+    rotate_to_edge(other, *(oedge if np.abs(a - b).sum() == 2 else oedge[::-1]), owner)
+    warp.segments += other.segments
+    warp.length += other.length
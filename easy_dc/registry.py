@@ -0,0 +1,146 @@
+"""
+Solver registry: the implementations of the weaving algorithm behind one interface, solve(G, variant), each taking
+a graph (make.make_dcgraph) and returning the cycle in its numbering.
+
+    weave_solution   easy_dc.solve, the solver
+    weave_discocube  easy_dc.solves.solve, stratifying the adjacency itself
+    weave_classy     easy_dc.solves.solve_classy, the weaver and its loops as classes
+    weave_vectors    easy_dc.solves.solve_as_vectors, on vectors instead of nodes
+
+Which is fastest depends on the order and the machine, so calibrate times them on a few orders and keeps the
+fastest per order in a small json table (FP_GRAPHS/calibration.json). Without a variant, solve runs the fastest for
+the calibrated order nearest to the order of the graph (on a log scale), weave_solution if there is no calibration or
+it was made by another version of the variants (see utils.store.solver_version).
+
+    python -m easy_dc calibrate --orders 32 960 9120 26208
+    >>> cycle = solve(G)
+"""
+import json
+import math
+import os
+import platform
+import time
+from functools import lru_cache
+
+from easy_dc.defs import *
+from easy_dc.utils.store import solver_version
+
+DEFAULT = 'weave_solution'
+CALIBRATION = os.path.join(FP_GRAPHS, 'calibration.json')
+CALIBRATION_ORDERS = 32, 960, 9120, 26208
+Calibration = Dict[str, Any]
+
+
+def run_solution(G: Graph) -> Solution:
+    from easy_dc.solve import weave_solution
+    return weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+
+
+def run_discocube(G: Graph) -> Solution:
+    from easy_dc.solves.solve import weave_discocube
+    return weave_discocube(G['A'], G['V'], G['VI'], G['EA'])
+
+
+def run_classy(G: Graph) -> Solution:
+    """
+    solve_classy takes the levels as adjacencies (solves.solve.stratify_A), and times itself over 1000 runs unless
+    unwrapped.
+    """
+    from easy_dc.solves.solve import stratify_A
+    from easy_dc.solves.solve_classy import weave_discocube
+    return weave_discocube.__wrapped__(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W')), stratify_A(G['A'], G['V']))
+
+
+def run_vectors(G: Graph) -> Solution:
+    """
+    solve_as_vectors takes the graph keyed by vectors and returns vectors, numbered back through VI. It runs unwrapped
+    from its profiler.
+    """
+    from easy_dc.solves.solve_as_vectors import stratify_A2, weave_solution
+    V, VI = G['V'], G['VI']
+    AV, ZA = stratify_A2(G['A'], V)
+    EA = {frozenset(V[n] for n in edge): {frozenset(V[n] for n in e) for e in edges} for edge, edges in G['EA'].items()}
+    W = {V[n]: w for n, w in G['W'].items()}
+    return [VI[vector] for vector in weave_solution.__wrapped__(AV, EA, W, ZA)]
+
+
+SOLVERS = {
+    'weave_solution': run_solution,
+    'weave_discocube': run_discocube,
+    'weave_classy': run_classy,
+    'weave_vectors': run_vectors,
+}
+
+
+def solve(G: Graph, variant: Optional[str] = None, calibration: Optional[str] = None) -> Solution:
+    """
+    Solve G with variant, by default the fastest variant for its order (see select).
+    """
+    if (variant := variant or select(len(G['A']), calibration)) not in SOLVERS:
+        raise ValueError(f'unknown variant {variant}, use one of {[*SOLVERS]}')
+    return SOLVERS[variant](G)
+
+
+def select(ORD: int, calibration: Optional[str] = None) -> str:
+    """
+    The fastest variant at the calibrated order nearest to ORD, DEFAULT without a calibration valid for the variants.
+    """
+    if not (fastest := load_calibration(calibration or CALIBRATION).get('fastest')):
+        return DEFAULT
+    nearest = min(fastest, key=lambda order: abs(math.log(int(order) / ORD)))
+    return fastest[nearest]
+
+
+@lru_cache(maxsize=4)
+def load_calibration(path: str) -> Calibration:
+    """
+    The calibration table at path, empty if there is none or its versions are not those of the variants.
+    """
+    try:
+        with open(path) as f:
+            table = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if table.get('versions') != {variant: solver_version(variant) for variant in SOLVERS}:
+        return {}
+    return table
+
+
+def calibrate(orders: Iterable[int] = CALIBRATION_ORDERS, variants: Iterable[str] = tuple(SOLVERS), repeats: int = 3,
+              path: Optional[str] = CALIBRATION, show: bool = True) -> Calibration:
+    """
+    Time every variant on the graph of every order (the best of repeats runs after a warmup), certify its solution,
+    and write the table to path: the times per order and variant, and the fastest certified variant per order.
+    """
+    from easy_dc.bench import time_stage
+    from easy_dc.make import make_dcgraph
+    from easy_dc.utils.info import id_seq
+    table = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeats': repeats,
+        },
+        'versions': {variant: solver_version(variant) for variant in SOLVERS},
+        'seconds': {},
+        'fastest': {},
+    }
+    for ORD in orders:
+        G, seconds = make_dcgraph(ORD, save=False), {}
+        for variant in variants:
+            times, cycle = time_stage(lambda: SOLVERS[variant](G), warmup=1, repeats=repeats)
+            if (certificate := id_seq(cycle, G['A'])) == 'loop':
+                seconds[variant] = min(times)
+            if show:
+                print(f'⭕️ {ORD:>8} | {variant:<15} | {min(times):.6f} | {certificate or "💔"}')
+        table['seconds'][str(ORD)] = seconds
+        table['fastest'][str(ORD)] = min(seconds, key=seconds.get)
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=1)
+        load_calibration.cache_clear()
+    return table
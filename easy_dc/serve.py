@@ -0,0 +1,214 @@
+"""
+Solver service: keeps graphs and solutions hot between requests instead of paying the cold start of every run.
+
+    python -m easy_dc.serve --socket /tmp/easy_dc.sock --workers 4
+    python -m easy_dc.serve --port 8642                        # localhost tcp instead of a unix socket
+
+The server runs on asyncio and hands the solves to a pool of worker processes, each keeping an LRU of the graphs it
+loaded (get_G), while the server keeps an LRU of the solutions, as .cycle bytes. Concurrent requests for the same
+solution share one solve.
+
+Protocol: a request is one json line, {"op": "solve", "order": 960, "encoding": "dir3"} or {"op": "stats"}. The
+response is one json line, {"ok": true, "bytes": n, ...} (or {"ok": false, "error": ...}), followed by n bytes of
+payload: the solution in the compact cycle format (see utils.io.load_cycle), streamed in chunks. A connection may send
+any number of requests.
+
+    >>> header, data = request({'op': 'solve', 'order': 960}, path='/tmp/easy_dc.sock')
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from easy_dc.defs import *
+from easy_dc.make import is_order
+from easy_dc.utils.io import CYCLE_ENCODINGS, cycle_bytes, get_G
+
+SOCKET = '/tmp/easy_dc.sock'
+CHUNK = 2 ** 20
+LATENCIES = 1024
+Response = Tuple[Dict[str, Any], bytes]
+load_graph = lru_cache(maxsize=4)(get_G)
+
+
+def init_worker(graphs: int, layout: str):
+    """
+    Pool initializer: the LRU of the graphs loaded by the worker.
+    """
+    global load_graph
+
+    @lru_cache(maxsize=graphs)
+    def load_graph(ORD: int) -> Graph:
+        return get_G(ORD, layout=layout)
+
+
+def solve_cycle(ORD: int, encoding: str) -> bytes:
+    """
+    Solve order ORD in a worker, returning the solution as .cycle bytes.
+    """
+    from easy_dc.solve import weave_solution
+    G = load_graph(ORD)
+    cycle = weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+    return cycle_bytes(cycle, V=G['V'], encoding=encoding)
+
+
+class SolverService:
+    """
+    The state of the server: the pool, the LRU of solutions, the solves in flight and the latency stats.
+    """
+
+    def __init__(self, workers: Optional[int] = None, graphs: int = 4, solutions: int = 64, layout: str = 'edist'):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(graphs, layout))
+        self.solutions: OrderedDict = OrderedDict()
+        self.capacity = solutions
+        self.inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.latency: Dict[str, Deque[float]] = {'solve': deque(maxlen=LATENCIES), 'hit': deque(maxlen=LATENCIES)}
+        self.counts = {'requests': 0, 'hits': 0, 'misses': 0, 'shared': 0, 'errors': 0}
+        self.started = time.time()
+
+    async def solve(self, ORD: int, encoding: str = 'dir3') -> Tuple[bytes, bool]:
+        """
+        The solution of order ORD as .cycle bytes, and whether it was cached (a request joining a solve in flight
+        waits for it like the one that started it).
+        """
+        key = ORD, encoding
+        if (data := self.solutions.get(key)) is not None:
+            self.solutions.move_to_end(key)
+            self.counts['hits'] += 1
+            return data, True
+        if key not in self.inflight:
+            self.counts['misses'] += 1
+            self.inflight[key] = asyncio.get_running_loop().run_in_executor(self.pool, solve_cycle, ORD, encoding)
+            try:
+                data = await self.inflight[key]
+            finally:
+                del self.inflight[key]
+            self.solutions[key] = data
+            while len(self.solutions) > self.capacity:
+                self.solutions.popitem(last=False)
+            return data, False
+        self.counts['shared'] += 1
+        return await asyncio.shield(self.inflight[key]), False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth (solves in flight), counts, cache sizes and latency percentiles (seconds) of the recent requests.
+        """
+        latency = {}
+        for name, times in self.latency.items():
+            if times:
+                ordered = sorted(times)
+                latency[name] = {
+                    'count': len(ordered),
+                    'p50': ordered[len(ordered) // 2],
+                    'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                    'max': ordered[-1],
+                }
+        return {
+            'queue': len(self.inflight),
+            **self.counts,
+            'solutions': len(self.solutions),
+            'solution_bytes': sum(map(len, self.solutions.values())),
+            'latency': latency,
+            'uptime': time.time() - self.started,
+        }
+
+    async def respond(self, message: Dict[str, Any]) -> Response:
+        op = message.get('op')
+        if op == 'stats':
+            return {'ok': True, **self.stats()}, b''
+        if op != 'solve':
+            raise ValueError(f'unknown op {op!r}, use solve or stats')
+        if (encoding := message.get('encoding', 'dir3')) not in CYCLE_ENCODINGS:
+            raise ValueError(f'unknown encoding {encoding}, use one of {[*CYCLE_ENCODINGS]}')
+        if not is_order(ORD := int(message['order'])):
+            self.counts['errors'] += 1
+            return {'ok': False, 'error': f'{ORD} is not the order of a discocube'}, b''
+        start = time.perf_counter()
+        data, cached = await self.solve(ORD, encoding)
+        self.latency['hit' if cached else 'solve'].append(seconds := time.perf_counter() - start)
+        return {'ok': True, 'bytes': len(data), 'cached': cached, 'seconds': seconds}, data
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve the requests of one connection until it closes.
+        """
+        try:
+            while line := await reader.readline():
+                self.counts['requests'] += 1
+                try:
+                    header, data = await self.respond(json.loads(line))
+                except Exception as e:
+                    self.counts['errors'] += 1
+                    header, data = {'ok': False, 'error': f'{type(e).__name__}: {e}'}, b''
+                writer.write(json.dumps({'bytes': 0, **header}).encode() + b'\n')
+                view = memoryview(data)
+                for i in range(0, len(view), CHUNK):
+                    writer.write(view[i:i + CHUNK])
+                    await writer.drain()
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path: Optional[str] = SOCKET, host: str = '127.0.0.1', port: Optional[int] = None):
+        """
+        Listen on the unix socket path, or on host:port if port is given, until cancelled.
+        """
+        if port is None:
+            if os.path.exists(path):
+                os.unlink(path)
+            server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if port is None and os.path.exists(path):
+                os.unlink(path)
+
+
+def request(message: Dict[str, Any], path: str = SOCKET, host: str = '127.0.0.1',
+            port: Optional[int] = None) -> Response:
+    """
+    Send one request to a running server (blocking) and return the response header and payload.
+    """
+    if port is None:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(path)
+    else:
+        conn = socket.create_connection((host, port))
+    with conn, conn.makefile('rwb') as stream:
+        stream.write(json.dumps(message).encode() + b'\n')
+        stream.flush()
+        header = json.loads(stream.readline())
+        data = stream.read(header['bytes'])
+    return header, data
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Serve discocube solutions over a local socket.')
+    parser.add_argument('--socket', default=SOCKET, help='unix socket to listen on')
+    parser.add_argument('--port', type=int, help='listen on localhost:PORT (tcp) instead of the unix socket')
+    parser.add_argument('--workers', type=int, help='solver processes (default: one per core)')
+    parser.add_argument('--graphs', type=int, default=4, help='graphs each worker keeps loaded')
+    parser.add_argument('--solutions', type=int, default=64, help='solutions the server keeps in memory')
+    parser.add_argument('--layout', default='edist', choices=('edist', 'nested', 'ranked'), help='see utils.io.get_G')
+    args = parser.parse_args(argv)
+    service = SolverService(workers=args.workers, graphs=args.graphs, solutions=args.solutions, layout=args.layout)
+    try:
+        asyncio.run(service.serve(path=args.socket, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
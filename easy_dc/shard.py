@@ -0,0 +1,183 @@
+"""
+Sharded weaving: weave_solution for large orders over a pool of worker processes.
+
+The z range below the origin is split into contiguous slabs of levels holding about the same number of nodes. Almost
+all the work is per node, spinning the yarn of every level and numbering it, and every slab is spun by a worker,
+below the origin and mirrored above it, and sent back as flat int arrays. What depends on the levels below, where
+the bobbins cut each level, only needs the positions of the ends of the threads in the spool: it is followed level by
+level in the main process without touching the nodes, the threads crossing from one slab into the next through the
+vertical edges at the slab boundaries. The threads are then cut out of the slabs' arrays and closed into their loops,
+which are joined at their stitch points in one walk (solve.splice).
+
+    cycle = weave_sharded(10827200, workers=64)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from collections import defaultdict
+from itertools import repeat
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.make import get_max_xyz
+from easy_dc.ooc import level_count, spin, stitches
+from easy_dc.solve import splice
+from easy_dc.utils.lattice import rank
+from easy_dc.utils.trace import span
+
+
+def spin_slab(max_xyz: int, levels: List[int], dtype: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The yarn of the levels z of a slab (below the origin) as nested ids, one level after the other, the same yarn
+    mirrored to the levels -z, and the indices of the stitch points (ooc.STITCH_COLUMNS) in both.
+    """
+    spool, below, above, marks, offset = spin(max_xyz), [], [], [], 0
+    for z in levels:
+        xy = spool[z % 4][-level_count(max_xyz, z):]
+        below.append(rank(np.column_stack((xy, np.full(len(xy), z)))).astype(dtype))
+        above.append(rank(np.column_stack((xy, np.full(len(xy), -z)))).astype(dtype))
+        marks.append(offset + np.flatnonzero(np.isin(xy, (1, 3)).all(axis=1)))
+        offset += len(xy)
+    return np.concatenate(below), np.concatenate(above), np.concatenate(marks)
+
+
+def make_slabs(max_xyz: int, slabs: int) -> List[List[int]]:
+    """
+    The levels below the origin, bottom up, in at most slabs contiguous runs of about the same number of nodes.
+    """
+    levels = [*range(-max_xyz, 0, 2)]
+    counts = np.cumsum([level_count(max_xyz, z) for z in levels])
+    cuts = np.searchsorted(counts, counts[-1] * np.arange(1, slabs) / slabs)
+    return [run for run in np.split(levels, np.unique(cuts)) if len(run)]
+
+
+def warp_positions(max_xyz: int) -> Tuple[List[List[Tuple[int, int, int, bool]]], List[int]]:
+    """
+    solve.weave_solution.warp_loom on positions: every level is cut at the positions of the ends of the threads in
+    its yarn, found through a grid of the positions of the spool, and the ends of the pieces are the threads' new
+    ends. Returns the threads, sorted as there, as lists of pieces (level, start, stop, reversed) in the order of the
+    thread, and their extents.
+    """
+    spool = spin(max_xyz)
+    grid = {}
+    for key, xy in spool.items():
+        grid[key] = np.full((max_xyz + 4, max_xyz + 4), -1, dtype=np.int64)
+        grid[key][(xy[:, 0] + max_xyz + 3) // 2, (xy[:, 1] + max_xyz + 3) // 2] = np.arange(len(xy))
+    loom, ends, levels = [], [], []
+    for level, z in enumerate(range(-max_xyz, 0, 2)):
+        size, xy = level_count(max_xyz, z), spool[z % 4]
+        base = len(xy) - size
+        if not loom:
+            pieces = [(0, size, False)]
+        else:
+            at = np.array([end for pair in ends for end in pair])
+            found = grid[z % 4][(at[:, 0] + max_xyz + 3) // 2, (at[:, 1] + max_xyz + 3) // 2] - base
+            bobbins = sorted({*found.tolist()})
+            cuts, prev = [], -1
+            for e, idx in enumerate(bobbins):
+                if e == len(bobbins) - 1 and idx != size - 1:
+                    cuts += [(prev + 1, idx), (idx, size)]
+                else:
+                    cuts += [(prev + 1, idx + 1)]
+                    prev = idx
+            pieces = [(lo, hi, lo not in wound) for wound in [{*bobbins}] for lo, hi in cuts if hi > lo]
+        heads = {(hi - 1 if rev else lo): idx for idx, (lo, hi, rev) in enumerate(pieces)}
+        woven = set()
+        for strand, pair in zip(loom, ends):
+            for side, end in enumerate(pair):
+                p = int(grid[z % 4][(end[0] + max_xyz + 3) // 2, (end[1] + max_xyz + 3) // 2]) - base
+                if (idx := heads.get(p)) is not None and idx not in woven:
+                    woven.add(idx)
+                    lo, hi, rev = pieces[idx]
+                    strand[side].append((level, lo, hi, rev))
+                    pair[side] = xy[base + (lo if rev else hi - 1)]
+        for idx, (lo, hi, rev) in enumerate(pieces):
+            if idx not in woven:
+                loom.append(([], [(level, lo, hi, rev)]))
+                ends.append([xy[base + (hi - 1 if rev else lo)], xy[base + (lo if rev else hi - 1)]])
+        levels.extend([-z] * (len(loom) - len(levels)))
+    threads = [[(lv, lo, hi, not rev) for lv, lo, hi, rev in left[::-1]] + right for left, right in loom]
+    firsts = [tuple(pair[0]) for pair in ends]
+    order = sorted(range(len(loom)), key=lambda idx: int(rank(np.array([(*firsts[idx], -1)]))[0]))
+    return [threads[idx] for idx in order], [levels[idx] for idx in order]
+
+
+def weave_sharded(ORD: int, workers: Optional[int] = None, slabs: Optional[int] = None) -> np.ndarray:
+    """
+    Solve the discocube of order ORD over workers processes (all cores by default), the levels split into slabs
+    slabs (workers by default). Returns the cycle as an array of nested ids (see utils.lattice), like
+    weave_out_of_core without the disk.
+
+    The loops are joined at their stitch points as they were spun, before any join, so no stitch is lost to an earlier
+    join and every order from 32 to 2997280 is joined there. Should the loops of some order not be, RuntimeError is
+    raised.
+    """
+    max_xyz = get_max_xyz(ORD)
+    workers = workers or os.cpu_count() or 1
+    runs = make_slabs(max_xyz, slabs or workers)
+    dtype = 'int32' if ORD < 2 ** 31 else 'int64'
+    with span('spin'):
+        if workers == 1:
+            spun = [*map(spin_slab, repeat(max_xyz), runs, repeat(dtype))]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                spun = [*pool.map(spin_slab, repeat(max_xyz), runs, repeat(dtype))]
+    with span('warp_loom'):
+        threads, extents = warp_positions(max_xyz)
+    with span('mirror'):
+        where, offsets = [], []
+        for slab, run in enumerate(runs):
+            counts = [level_count(max_xyz, z) for z in run]
+            where += [slab] * len(run)
+            offsets += np.concatenate(([0], np.cumsum(counts)[:-1])).tolist()
+        loops, owner = [], {}
+        for idx, thread in enumerate(threads):
+            below, above, at = [], [], 0
+            for level, lo, hi, rev in thread:
+                slab, offset = where[level], offsets[level]
+                part = slice(offset + lo, offset + hi)
+                below.append(spun[slab][0][part][::-1] if rev else spun[slab][0][part])
+                above.append(spun[slab][1][part][::-1] if rev else spun[slab][1][part])
+                marks = spun[slab][2]
+                for m in marks[(marks >= offset + lo) & (marks < offset + hi)].tolist():
+                    pos = at + (offset + hi - 1 - m if rev else m - offset - lo)
+                    owner[int(spun[slab][0][m])] = idx, pos
+                    owner[int(spun[slab][1][m])] = idx, -1 - pos
+                at += hi - lo
+            loops.append(np.concatenate((*below, *(part[::-1] for part in above[::-1]))))
+        owner = {node: (idx, pos % len(loops[idx])) for node, (idx, pos) in owner.items()}
+    with span('weave'):
+        joins = plan_stitches(loops, extents, owner)
+    if joins is None:
+        raise RuntimeError(f'the loops of order {ORD} could not all be joined at their stitch points')
+    with span('splice'):
+        return splice(loops, joins)
+
+
+def plan_stitches(loops: Paths, extents: List[int], owner: Dict[int, Tuple[int, int]]) -> Optional[List[Tuple]]:
+    """
+    ooc.sew as a plan for splice: every weft is joined to a loop already joined at one of its stitch points, the
+    edges of both being edges of their loops that no other join uses. Returns the joins, None if some weft couldn't
+    be joined.
+    """
+    joins, sewn, used, wefts = [], {0}, defaultdict(set), [*range(1, len(loops))]
+
+    def edge(u: int, v: int) -> Optional[Tuple[int, int, int]]:
+        (idx, p), (other, q) = owner[u], owner[v]
+        if idx == other and (p - q) % len(loops[idx]) in (1, len(loops[idx]) - 1) and used[idx].isdisjoint((p, q)):
+            return idx, p, q
+
+    while wefts:
+        before = len(wefts)
+        for idx in [*wefts]:
+            for warp_e, weft_e in stitches(extents[idx], owner):
+                if (parent := edge(*warp_e)) and parent[0] in sewn and (child := edge(*weft_e)) and child[0] == idx:
+                    used[parent[0]].update(parent[1:])
+                    used[idx].update(child[1:])
+                    joins.append((idx, parent, child))
+                    sewn.add(idx)
+                    wefts.remove(idx)
+                    break
+        if len(wefts) == before:
+            return None
+    return joins
@@ -1,12 +1,17 @@
 import numpy as np
-from collections import deque
+from collections import defaultdict, deque
 
-from defs import *
-from utils.decs import profile
+from easy_dc.defs import *
+from easy_dc.make import assemble_cycle, make_snake, make_spool
+from easy_dc.utils.decs import profile
+from easy_dc.utils.trace import span
 
 
 # @profile()
-def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: GLvls) -> Solution:
+def weave_solution(
+    A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: GLvls, stitch: bool = False, plan: bool = False,
+    symmetry: bool = False
+) -> Solution:
     """
     Solves the hamiltonian cycle problem in discocube graphs deterministically using divide and conquer (
     non-recursive) and in linear time (the time it takes grows to solve the problem grows linearly to the size of the
@@ -33,7 +38,14 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
     Weights = Dict[int, Union[int, float]]: Weights for each node based on their accretion level.
     GLvls = Dict[int, Dict[str, Any]]: The adjacency dictionary partitioned according to their x value, so that they
     are planes of x, y.
+
+    The modes below are opt-in, off by default: each is faster, but gives a different cycle from the default one.
+    stitch: join the loops at their stitch points (see stitches) instead of searching for bridges.
+    plan: join the loops left over (all of them without stitch) along a spanning tree of their contact graph (see
+    weave_loops) instead of searching for bridges. The search remains the fallback for whatever neither joins.
+    symmetry: make the spool from the rotations of one quadrant (see make_spool) instead of walking the level.
     """
+    extents: List[int] = []
 
     class Loop:
         """
@@ -205,19 +217,79 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
             540_200  ->  37
             762_272  ->  42
         """
-        warp, *wefts = warp_loom()
-        warp = Loop(warp, lead=True)
-        loom = {idx: Loop(weft) for idx, weft in enumerate(wefts)}
-        last_idx = len(loom) - 1
+        with span('warp_loom'):
+            warp, *wefts = warp_loom()
+        with span('weave'):
+            warp = Loop(warp, lead=True)
+            loom = {idx: Loop(weft) for idx, weft in enumerate(wefts)}
+            last_idx = len(loom) - 1
+            if stitch and loom:
+                with span('stitch'):
+                    sew(warp, loom)
+                warp.last = True
+            if plan and loom:
+                with span('plan'):
+                    wefts = [weft.data for weft in loom.values()]
+                    warp.data[:], *rest = weave_loops([*wefts, warp.data], A, EA, root=len(wefts))
+                loom = {idx: Loop(weft) for idx, weft in enumerate(rest)}
+                warp.joined = warp.last = True
+            while loom:
+                for idx in loom.keys():
+                    if idx == last_idx:
+                        warp.last = True
+                    if bridge := warp.edges & loom[idx].eadjs:
+                        if weft_e := EA[warp_e := bridge.pop()] & loom[idx].edges:
+                            warp.join(edge=tuple(warp_e), oedge=tuple(weft_e.pop()), other=loom.pop(idx))
+                            break
+        return warp.data
+
+    def sew(warp, loom: Dict[int, Any]):
+        """
+        Join the wefts to the warp at their stitch points, checking that both edges are still in their loops before
+        joining. Wefts left over are joined by the bridge search in weave.
+        """
+        sewn, at = {*warp.data}, {node: i for i, node in enumerate(warp.data)}
+        weft_at = {idx: {node: i for i, node in enumerate(weft.data)} for idx, weft in loom.items()}
         while loom:
-            for idx in loom.keys():
-                if idx == last_idx:
-                    warp.last = True
-                if bridge := warp.edges & loom[idx].eadjs:
-                    if weft_e := EA[warp_e := bridge.pop()] & loom[idx].edges:
-                        warp.join(edge=tuple(warp_e), oedge=tuple(weft_e.pop()), other=loom.pop(idx))
+            before = len(loom)
+            for idx in [*loom]:
+                for warp_e, weft_e in stitches(extents[idx + 1]):
+                    if sewn.issuperset(warp_e) and is_edge(loom[idx].data, weft_at[idx], *weft_e) and (
+                            is_edge(warp.data, at, *warp_e)):
+                        sewn.update(loom[idx].data)
+                        warp.join(edge=warp_e, oedge=weft_e, other=loom.pop(idx))
+                        at = {node: i for i, node in enumerate(warp.data)}
                         break
-        return warp.data
+            if len(loom) == before:
+                return
+
+    def stitches(h: int) -> Stitches:
+        """
+        Pairs of parallel edges (warp edge, weft edge) at which a weft of extent h (the loop spun at level -h, spanning
+        z from -h to h) meets the warp. They always sit in the columns x = 1 | 3, y = 1 (see Loop.edges):
+            every weft: the vertical edges between z = ±(h - 2) and ±h of the columns (1, 1) and (3, 1).
+            the last weft: the horizontal edges (1, 1)-(3, 1) and (1, 3)-(3, 3) of its top or bottom level.
+            the first weft joined to the lead: the columns (3, 1) and (1, 1) through the middle levels.
+        """
+        for (x, y, lo, hi), (ox, oy) in (
+            *(((1, 1, s * (h - 2), s * h), (3, 1)) for s in (1, -1)),
+            *(((3, 1, lo, hi), (1, 1)) for lo, hi in ((-1, 1), (1, 3), (-3, -1))),
+        ):
+            pair = VI.get((x, y, lo)), VI.get((x, y, hi)), VI.get((ox, oy, lo)), VI.get((ox, oy, hi))
+            if None not in pair:
+                yield pair[:2], pair[2:]
+        for z in h, -h:
+            pair = VI.get((1, 1, z)), VI.get((3, 1, z)), VI.get((1, 3, z)), VI.get((3, 3, z))
+            if None not in pair:
+                yield pair[:2], pair[2:]
+
+    def is_edge(seq: Path, at: IdxMap, u: int, v: int) -> bool:
+        """
+        Whether u and v are next to each other in the loop seq, at the position of every node of seq.
+        """
+        if (idx := at.get(u)) is None:
+            return False
+        return v == seq[idx - 1] or v == seq[(idx + 1) % len(seq)]
 
     def warp_loom() -> WarpedLoom:
         """
@@ -228,24 +300,32 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
         Repeat until all the levels are finished.
         Return loom.
         """
-        bobbins, loom = None, []
-        spool = spin()
+        bobbins, loom, levels = None, [], []
+        with span('spin'):
+            spool = spin()
         for z, zorder in ZA.items():
-            woven = set()
-            yarn = [VI[(*xy, z)] for xy in spool[z % 4][-len(zorder) if z == -1 else -zorder:]]
-            warps = cut(yarn, bobbins) if bobbins else [yarn]
-            for thread in loom:
-                for idx, warp in enumerate(warps):
-                    if idx not in woven:
-                        for end in 0, -1:
-                            if thread[end] == warp[0]:
-                                woven.add(idx)
-                                thread.extend(warp[1:]) if end else thread.extendleft(warp[1:])
-            loom.extend((deque(wp) for wp in (w for idx, w in enumerate(warps) if idx not in woven)))
-            bobbins = wind(loom) if z != -1 else None
-        for w in loom:
-            w += [VI[(vector := V[node])[0], vector[1], -vector[2]] for node in reversed(w)]
-        return sorted(loom)
+            with span('level', z=z):
+                woven = set()
+                yarn = [VI[(*xy, z)] for xy in spool[z % 4][-len(zorder) if z == -1 else -zorder:]]
+                with span('cut'):
+                    warps = cut(yarn, bobbins) if bobbins else [yarn]
+                for thread in loom:
+                    for idx, warp in enumerate(warps):
+                        if idx not in woven:
+                            for end in 0, -1:
+                                if thread[end] == warp[0]:
+                                    woven.add(idx)
+                                    thread.extend(warp[1:]) if end else thread.extendleft(warp[1:])
+                loom.extend((deque(wp) for wp in (w for idx, w in enumerate(warps) if idx not in woven)))
+                levels.extend([-z] * (len(loom) - len(levels)))
+                with span('wind'):
+                    bobbins = wind(loom) if z != -1 else None
+        with span('mirror'):
+            for w in loom:
+                w += [VI[(vector := V[node])[0], vector[1], -vector[2]] for node in reversed(w)]
+        order = sorted(range(len(loom)), key=loom.__getitem__)
+        extents[:] = [levels[idx] for idx in order]
+        return [loom[idx] for idx in order]
 
     def spin() -> Spool:
         """
@@ -263,13 +343,20 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
 
         Color the natural thread blue by rotating the sequence vectors 180 degrees around the z-axis and displace 1
         unit length along the y-axis.
+
+        With symmetry, the walk isn't taken: it is made of one quarter of each ring, rotated (see make_spool).
         """
-        spool = [max(ZA[-1])]
-        to_spin = len(ZA[-1]) - 1
-        for _ in range(to_spin):
-            spool += sorted(ZA[-1][spool[-1]] - {*spool}, key=lambda n: W[n])[-1:]
+        if symmetry and len(natural := make_spool(-min(ZA))) == len(ZA[-1]):
+            natural = natural.tolist()
+        else:
+            rank = {n: (W[n], sum(c * c for c in V[n]), *V[n]) for n in ZA[-1]}
+            spool = [max(ZA[-1], key=rank.__getitem__)]
+            to_spin = len(ZA[-1]) - 1
+            for _ in range(to_spin):
+                spool += sorted(ZA[-1][spool[-1]] - {*spool}, key=rank.__getitem__)[-1:]
+            natural = [V[node][:2] for node in spool]
         return {
-            3: (natural := [V[node][:2] for node in spool]),
+            3: natural,
             1: np.add(np.dot(np.array(natural), [[-1, 0], [0, -1]])[-ZA[-3]:], [0, 2])
         }
 
@@ -302,7 +389,8 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
             For each r in R, if the first element of r is not in T, then r is in reverse order.
         """
         subtours, prev, last_ix = [], -1, len(tour) - 1
-        for e, idx in enumerate(idxs := sorted((tour.index(node) for node in subset))):
+        at = dict(zip(tour, range(len(tour))))
+        for e, idx in enumerate(idxs := sorted(at[node] for node in subset)):
             if e == len(idxs) - 1 and idx != last_ix:
                 subtours += [tour[prev + 1: idx], tour[idx:]]
             else:
@@ -327,26 +415,305 @@ def weave_solution(A: AdjDict, V: Verts, VI: IdxMap, EA: EAdj, W: Weights, ZA: G
     return weave()
 
 
+def plan_weave(
+    loops: Paths, A: AdjDict, EA: EAdj, root: int = 0, bridges: int = 4
+) -> Tuple[List[Tuple[int, Any, Any]], NodeSet]:
+    """
+    Plan the joins of loops along a spanning tree of their contact graph.
+
+    Every node is labelled with its loop and its position in it, then the edges of every loop are scanned once against
+    EA for parallel edges belonging to another loop (up to bridges of them per pair of loops; only the edges of the
+    lower numbered loop of a pair are scanned, so a large root is best put last). Starting from the root loop, the
+    contact graph is walked breadth first, joining every loop reached to its parent through a bridge whose edges
+    no other join has used.
+
+    Returns the joins as (child, parent bridge, child bridge), a bridge being (loop, position, position) with the
+    nodes at the positions adjacent pairwise, and the loops the plan couldn't reach.
+    """
+    lid = np.full(max(map(max, loops)) + 1, -1, dtype=np.int64)
+    pos = np.zeros_like(lid)
+    for idx, loop in enumerate(loops):
+        lid[loop] = idx
+        pos[loop] = np.arange(len(loop))
+    contacts = defaultdict(list)
+    for idx, loop in enumerate(loops[:-1]):
+        size = len(loop)
+        for i, (u, v) in enumerate(zip(loop, loop[1:] + loop[:1])):
+            for edge in EA[frozenset((u, v))]:
+                a, b = edge
+                if a >= len(lid) or b >= len(lid) or (other := lid[a]) <= idx or lid[b] != other:
+                    continue
+                if (pa := pos[a]) - (pb := pos[b]) not in (1, -1, len(loops[other]) - 1, 1 - len(loops[other])):
+                    continue
+                if len(found := contacts[idx, other]) < bridges:
+                    pa, pb = (pa, pb) if a in A[u] else (pb, pa)
+                    found.append(((idx, i, (i + 1) % size), (int(other), int(pa), int(pb))))
+    neighbours = defaultdict(list)
+    for idx, other in contacts:
+        neighbours[idx].append(other)
+        neighbours[other].append(idx)
+    joins, used, reached, queue = [], set(), {root}, deque([root])
+    while queue:
+        idx = queue.popleft()
+        for other in neighbours[idx]:
+            if other in reached:
+                continue
+            for bridge in contacts[min(idx, other), max(idx, other)]:
+                parent, child = bridge if bridge[0][0] == idx else bridge[::-1]
+                keys = (parent[0], *sorted(parent[1:])), (child[0], *sorted(child[1:]))
+                if used.isdisjoint(keys):
+                    used.update(keys)
+                    joins.append((other, parent, child))
+                    reached.add(other)
+                    queue.append(other)
+                    break
+    return joins, {*range(len(loops))} - reached
+
+
+def weave_loops(loops: Paths, A: AdjDict, EA: EAdj, root: int = 0) -> Paths:
+    """
+    Join loops into one cycle following plan_weave, in time linear in the number of nodes (see splice). Returns the
+    cycle followed by the loops that couldn't be reached, if any.
+    """
+    joins, unreached = plan_weave(loops, A, EA, root=root)
+    return [splice(loops, joins, root=root), *(loops[idx] for idx in sorted(unreached))]
+
+
+def splice(loops: Paths, joins: List[Tuple[int, Any, Any]], root: int = 0) -> Path:
+    """
+    Write out the cycle joining loops at joins (child, parent bridge, child bridge), as planned by plan_weave.
+
+    Instead of joining two loops at a time, the joined cycle is written out in one walk: the root is walked from a
+    position none of its joins uses and, on reaching the edge of a join, the walk turns into the child, around it
+    (and its own children) and back. The loops may be lists or numpy arrays; the cycle is of the same kind.
+    """
+    children = defaultdict(list)
+    for child, parent, bridge in joins:
+        children[parent[0]].append((parent[1:], child, bridge[1:]))
+    taken = {p for edge, *_ in children[root] for p in edge}
+    start = next((i for i in range(len(loops[root])) if not {i, (i - 1) % len(loops[root])} & taken), 0)
+
+    def walk(idx: int, begin: int, step: int, out: Paths):
+        loop, size = loops[idx], len(loops[idx])
+        head, tail = (loop[begin:], loop[:begin]) if step == 1 else (loop[begin::-1], loop[:begin:-1])
+        seq = np.concatenate((head, tail)) if isinstance(loop, np.ndarray) else head + tail
+        turns = []
+        for (p, q), child, (cp, cq) in children[idx]:
+            if (p + step) % size != q:
+                p, q, cp, cq = q, p, cq, cp
+            first, enter, leave = (p - begin) * step % size, cp, cq
+            turns.append((first, child, enter, -1 if (enter + 1) % len(loops[child]) == leave else 1))
+        prev = 0
+        for first, child, enter, direction in sorted(turns):
+            out.append(seq[prev:first + 1])
+            walk(child, enter, direction, out)
+            prev = first + 1
+        out.append(seq[prev:])
+
+    parts: Paths = []
+    walk(root, start, 1, parts)
+    return np.concatenate(parts) if isinstance(loops[root], np.ndarray) else [n for part in parts for n in part]
+
+
+def extend_solution(solution: Solution, G: Graph, G_next: Graph) -> Solution:
+    """
+    Extend a hamiltonian cycle of a discocube to the next order, the discocube with one more shell.
+
+    The levels |z| >= 3 of the next order are the levels of this order moved one level away from the origin, so the
+    cycle is moved with them: levels below the origin down by one, levels above up by one, opening a slab of two new
+    levels z = ±1 in the middle. Every edge of the cycle that crossed the origin plane now crosses the slab through its
+    column, and the rest of the slab is covered by paths the columns carry (thread_slab): the column detours along its
+    path at z = -1 and back at z = 1. The cycle extended crosses the origin plane at the far ends of the paths, so it
+    can be extended in turn. The zigzags no path reaches (the innermost, every other order) are closed into ladder
+    loops over the two levels, next to a bend a path shortcuts (see thread_slab), and joined into the cycle with
+    weave_loops: every ladder adds two crossings. Should a ladder not be joined, the next order is solved from
+    scratch.
+    """
+    from easy_dc.utils.chain import vector_array
+    return extend_vectors(vector_array(G['V'])[np.asarray(solution)], G_next)[0]
+
+
+def extend_vectors(vectors: np.ndarray, G_next: Graph) -> Tuple[Solution, np.ndarray]:
+    """
+    extend_solution on the vectors of the cycle, an (n, 3) array: returns the cycle extended as nodes of G_next and as
+    vectors, which is all the next extension needs, so a run of extensions turns the vertices of every order into an
+    array once.
+    """
+    from easy_dc.utils.chain import make_coord_index, to_nodes, vector_array
+    with span('accrete'):
+        V_next = vector_array(G_next['V'])
+        vectors = vectors.copy()
+        vectors[:, 2] += np.where(vectors[:, 2] > 0, 2, -2)
+        crossings = np.flatnonzero(vectors[:, 2] * np.roll(vectors[:, 2], -1) < 0)
+        columns = {*map(tuple, vectors[crossings, :2].tolist())}
+        slab = {*map(tuple, V_next[V_next[:, 2] == -1, :2].tolist())}
+        carried, ladders = thread_slab(slab, columns)
+        pieces, prev = [], 0
+        for idx in crossings:
+            pieces.append(vectors[prev:idx + 1])
+            column = (*map(int, vectors[idx, :2]),)
+            cells = carried.get(column, [])
+            path = [(*column, -1), *((*c, -1) for c in cells), *((*c, 1) for c in reversed(cells)), (*column, 1)]
+            pieces.append(np.array(path if vectors[idx, 2] < 0 else path[::-1], dtype=np.int64))
+            prev = idx + 1
+        pieces.append(vectors[prev:])
+        index = make_coord_index(V_next)
+        main = to_nodes(vectors := np.concatenate(pieces), index)
+        if not ladders:
+            return main.tolist(), vectors
+        loops = [to_nodes(np.array([(*c, -1) for c in path] + [(*c, 1) for c in reversed(path)]), index).tolist()
+                 for path in ladders]
+    with span('plan'):
+        cycle, *rest = weave_loops([*loops, main.tolist()], G_next['A'], G_next['EA'], root=len(loops))
+    if rest:
+        cycle = weave_solution(*(G_next[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+    return cycle, V_next[np.asarray(cycle)]
+
+
+def zigzags(size: int) -> Paths:
+    """
+    The zigzags of the slab of a discocube: the cells (x, y) with |x| + |y| <= size (x, y odd) cut into the closed
+    paths through the rings |x| + |y| = k and k - 2 for k = size, size - 4, ... zigzagging between the two, the
+    innermost first.
+
+    >>> zigzags(4)[0][:5]
+    [(1, 3), (1, 1), (3, 1), (3, -1), (1, -1)]
+    """
+    cycles = []
+    for k in range(size, 0, -4):
+        quarter = [cell for j in range(1, k, 2) for cell in ((j, k - j), (j, k - j - 2))][:-1]
+        cycles.append(
+            quarter + [(x, -y) for x, y in reversed(quarter)] + [(-x, -y) for x, y in quarter]
+            + [(-x, y) for x, y in reversed(quarter)]
+        )
+    return cycles[::-1]
+
+
+def thread_slab(cells: QuickSet, columns: QuickSet) -> Tuple[Dict[Tuple[int, int], Path], Paths]:
+    """
+    Cover the cells (x, y) of the slab of extend_solution but its columns with paths carried by the columns.
+
+    The slab is cut into its zigzags. The columns on a zigzag cut it into arcs, each carried by the column before it
+    (in the direction leaving the most path ends next to the zigzags without a column), ending next to the column
+    after it. A zigzag without a column is threaded on the end of a path next to it: the path steps onto it and goes
+    all the way round, ending next to where it stepped on, on the side of a zigzag still to thread if there is one.
+    An end in the outer ring of a zigzag only reaches the zigzag outside it and one in the inner ring the zigzag
+    inside, and a path threads on through the zigzags it reaches in that direction.
+
+    No end reaches the innermost zigzag when it has 4 cells, so a zigzag no path reaches is left to be woven in as a
+    ladder: a path going round a bend of the zigzag outside it, (-1, k + 1) (-1, k + 3) (1, k + 3) (1, k + 1) for a
+    zigzag of outer ring k, shortcuts it, leaving the tips (-1, k + 3) (1, k + 3) as a ladder of their own, and both
+    ladders have an edge parallel to the shortcut (the zigzag cut open next to its tips (-1, k - 1) (1, k - 1)).
+
+    Returns the paths, by column, each from its cell next to the column, and the ladders, as open paths of cells.
+
+    >>> carried, ladders = thread_slab({cell for cycle in zigzags(6) for cell in cycle}, {(-3, 1)})
+    >>> ladders
+    [[(-1, 5), (1, 5)], [(-1, 1), (1, 1), (1, -1), (-1, -1)]]
+    """
+    cycles = zigzags(max(abs(x) + abs(y) for x, y in cells))
+    near = lambda cell: ((cell[0] - 2, cell[1]), (cell[0] + 2, cell[1]), (cell[0], cell[1] - 2), (cell[0], cell[1] + 2))
+    zig = {cell: idx for idx, cycle in enumerate(cycles) for cell in cycle}
+    pending = {idx for idx, cycle in enumerate(cycles) if columns.isdisjoint(cycle)}
+    carried, ends = {}, {}
+    for idx, cycle in enumerate(cycles):
+        if idx in pending:
+            continue
+        stops = [i for i, cell in enumerate(cycle) if cell in columns]
+        options = []
+        for step in (1, -1):
+            ordered = cycle if step == 1 else cycle[::-1]
+            at = [i if step == 1 else len(cycle) - 1 - i for i in stops][::step]
+            arcs = {ordered[i]: ordered[i + 1:j] if j > i else ordered[i + 1:] + ordered[:j]
+                    for i, j in zip(at, at[1:] + at[:1])}
+            if len(at) == 1:
+                arcs = {ordered[at[0]]: ordered[at[0] + 1:] + ordered[:at[0]]}
+            reach = {zig[other] for column, arc in arcs.items() for other in near(arc[-1] if arc else column)
+                     if zig.get(other) in pending}
+            options.append((len(reach), step, arcs))
+        *_, arcs = max(options, key=lambda option: option[:2])
+        for column, arc in arcs.items():
+            carried[column] = arc
+            ends[arc[-1] if arc else column] = column
+    while pending:
+        for end, column in ends.items():
+            step = next(((i, cell) for cell in near(end) if (i := zig.get(cell)) in pending), None)
+            if step is not None:
+                break
+        else:
+            break
+        idx, cell = step
+        cycle, at = cycles[idx], cycles[idx].index(cell)
+        ahead, behind = cycle[at:] + cycle[:at], cycle[at::-1] + cycle[:at:-1]
+        path = max((behind, ahead), key=lambda path: any(zig.get(other) in pending - {idx} for other in near(path[-1])))
+        carried[column] = carried[column] + path
+        del ends[end]
+        ends[path[-1]] = column
+        pending.discard(idx)
+    ladders = []
+    for idx in sorted(pending):
+        cycle, k = cycles[idx], max(abs(x) + abs(y) for x, y in cycles[idx])
+        for turn in (lambda a, b: (a, b), lambda a, b: (b, -a), lambda a, b: (-a, -b), lambda a, b: (-b, a)):
+            bend = [turn(-1, k + 1), turn(-1, k + 3), turn(1, k + 3), turn(1, k + 1)]
+            found = next(((column, i) for column, path in carried.items() for i in range(len(path) - 3)
+                          if path[i:i + 4] in (bend, bend[::-1])), None)
+            if found is None:
+                continue
+            column, i = found
+            path = carried[column]
+            carried[column] = path[:i + 1] + path[i + 3:]
+            a, b = cycle.index(turn(-1, k - 1)), cycle.index(turn(1, k - 1))
+            first = a if (a + 1) % len(cycle) == b else b
+            ladders += [path[i + 1:i + 3], cycle[first:] + cycle[:first]]
+            break
+        else:
+            ladders.append(cycle)
+    return carried, ladders
+
+
+def weave_range(start: int = 32, end: int = 26208, get: Optional[Any] = None) -> Solutions:
+    """
+    Solve every order from start to end, solving the first from scratch and extending each solution to the next
+    order with extend_solution, carrying the vectors of the cycle from one order to the next (see extend_vectors).
+    Graphs are fetched with get (utils.io.get_G by default).
+    """
+    from easy_dc.utils.chain import vector_array
+    from easy_dc.utils.gens import uon
+    from easy_dc.utils.io import get_G
+    get, vectors = get or get_G, None
+    for order in uon(start, end):
+        G = get(order)
+        if vectors is None:
+            solution = weave_solution(G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA'])
+            vectors = vector_array(G['V'])[np.asarray(solution)]
+        else:
+            solution, vectors = extend_vectors(vectors, G)
+        yield order, solution
+
+
+def weave_grid(x: int, y: int, z: Optional[int] = None) -> np.ndarray:
+    """
+    Solves the hamiltonian cycle problem in rectangular 2d/3d grid graphs (make_gridgraph) in linear time.
+
+    The grid counterpart to weave_solution: a boustrophedon snake is spun over the cross-section of the grid and
+    stacked along an axis of even length with assemble_cycle. Any axis of even length will do, so every box with an
+    even number of nodes (and a cross-section of more than one node) is solved; the nodes are numbered as in
+    make_grid_ae, n = ix + iy * x + iz * x * y, and the returned cycle can be certified with id_seq against the grid's
+    adjacency.
+    """
+    dims, strides = (x, y, z or 1), (1, x, x * y)
+    axis = next(filter(lambda i: dims[i] % 2 == 0, (2, 1, 0)), None)
+    if axis is None:
+        raise ValueError(f'a {x}x{y}x{z or 1} grid has an odd number of nodes and no hamiltonian cycle')
+    (a, b), (sa, sb) = zip(*((dims[i], strides[i]) for i in range(3) if i != axis))
+    if a * b < 2:
+        raise ValueError(f'a {x}x{y}x{z or 1} grid is a path and has no hamiltonian cycle')
+    return assemble_cycle(a, b, dims[axis], make_snake(a, b, xstride=sa, ystride=sb), stride=strides[axis])
+
+
 def main():
-    from utils import info, gens, decs, io
-    uon_range = tuple([10640] * 2)
-    woven, orders, all_times = None, [], []
-    woven = None
-    for order in gens.uon(*uon_range):
-        ord_times = []
-        G = io.get_G(order)
-        for _ in range(10):
-            start = decs.time.time()
-            woven = weave_solution(G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA'])
-            dur = decs.time.time() - start
-            ord_times.append(dur)
-        # print(woven)
-        all_times.append(sum(ord_times))
-        orders.append(order / 1000000)
-        # print('NONTURNS:', count_nonturns(woven, A, V), '|', 'AXES:', count_axes(woven, V), len(woven))
-        print(f'⭕️ {order:>7} | ⏱️ {all_times[-1]:.7f} | "🩺", {len(woven)}/{order}: {info.id_seq(woven, G["A"])}')
-    print(f'orders = {orders}')
-    print(f'all_times = {all_times}')
+    from easy_dc.bench import run_bench
+    run_bench([10640], stages=('solve', 'certify'), repeats=10)
 
 
 if __name__ == '__main__':
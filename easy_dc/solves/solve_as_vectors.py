@@ -1,10 +1,13 @@
-import numpy as np
-
+import time
 from collections import deque
 from itertools import combinations, pairwise
 
+import numpy as np
+
 from easy_dc.defs import *
-from easy_dc.utils import profile, timed, time, count_nonturns, count_axes, save_G  # noqa
+from easy_dc.utils.decs import profile, timed  # noqa
+from easy_dc.utils.info import count_axes, count_nonturns  # noqa
+from easy_dc.utils.io import save_G  # noqa
 
 
 def stratify_A2(A: AdjDict, V: Verts) -> GLvls:
@@ -243,14 +246,16 @@ def weave_solution(A: AdjDict, EA: EAdj, W: Weights, ZA: GLvls) -> Solution:
 
 
 def main():
-    from easy_dc.utils import get_G, id_seq, uon
+    from easy_dc.utils.gens import uon
+    from easy_dc.utils.info import id_seq
+    from easy_dc.utils.io import get_G
     uon_range = 79040, 79040
     woven, orders, all_times = None, [], []
     woven = None
     for order in uon(*uon_range):
         ord_times = []
         G = get_G(order)
-        A, V, VI, EA, W, ZA = G['A'], G['V'], G['VI'], G['EA'], G['W'], G['ZA']
+        A, V, EA, W, ZA = G['A'], G['V'], G['EA'], G['W'], G['ZA']
         print(W)
         EA1 = {frozenset([V[n] for n in k]): {frozenset([V[node] for node in val]) for val in values} for k, values in EA.items()}
         W = {V[k]: v for k, v in W.items()}
@@ -258,7 +263,7 @@ def main():
         for _ in range(100):
             start = time.time()
 
-            woven = weave_solution(A, V, VI, EA1, W, ZA)
+            woven = weave_solution(A, EA1, W, ZA)
             dur = time.time() - start
             # print(f'⏱️ {dur:.7f} ')
             # print('NONTURNS:', count_nonturns(woven, A, V), '|', 'AXES:', count_axes(woven, V), len(woven))
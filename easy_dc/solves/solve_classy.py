@@ -2,7 +2,7 @@ from collections import deque
 from itertools import combinations
 
 from easy_dc.defs import *
-from easy_dc.utils import times
+from easy_dc.utils.decs import times
 
 
 @times(1000)
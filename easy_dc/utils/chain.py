@@ -0,0 +1,128 @@
+"""
+Direction chains: a cycle as its start vector and the direction code of every step along it.
+codes: 0: +x, 1: -x, 2: +y, 3: -y, 4: +z, 5: -z (the order of make.basis_vectors), each step 2 units long.
+"""
+from itertools import chain
+
+import numpy as np
+
+from easy_dc.defs import *
+
+DIRECTIONS = np.array([[2, 0, 0], [-2, 0, 0], [0, 2, 0], [0, -2, 0], [0, 0, 2], [0, 0, -2]], dtype=np.int32)
+
+
+def to_vectors(seq: Path, V: Verts) -> np.ndarray:
+    """
+    The vectors of a sequence of nodes as an (n, 3) array: V a sequence of vectors (read as int64, see vector_array),
+    an (n, 3) array, or utils.lattice.RankedV for nested ids.
+    """
+    seq = np.asarray(seq, dtype=np.int64)
+    if hasattr(V, 'ORD'):
+        return np.asarray(V[seq])
+    return (V.reshape(-1, 3) if isinstance(V, np.ndarray) else vector_array(V))[seq]
+
+
+def vector_array(V: Verts) -> np.ndarray:
+    """
+    The vectors of V as an (n, 3) int64 array: V itself if it is one, a sequence of vectors read without converting
+    its tuples one by one (2-3 times faster than np.asarray).
+    """
+    if isinstance(V, np.ndarray):
+        return V.astype(np.int64, copy=False).reshape(-1, 3)
+    return np.fromiter(chain.from_iterable(V), dtype=np.int64, count=3 * len(V)).reshape(-1, 3)
+
+
+def direction_codes(vectors: np.ndarray) -> np.ndarray:
+    """
+    Direction code of every step between consecutive vectors.
+    """
+    steps = np.diff(vectors, axis=0)
+    axes = np.abs(steps).argmax(axis=1)
+    lengths = steps[np.arange(len(steps)), axes]
+    if (np.abs(steps).sum(axis=1) != np.abs(lengths)).any() or (np.abs(lengths) != 2).any():
+        raise ValueError('consecutive nodes of a cycle must be one lattice step apart')
+    return (axes * 2 + (lengths < 0)).astype(np.uint8)
+
+
+def encode_chain(seq: Path, V: Verts, closed: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode a sequence of nodes as its start vector and direction codes.
+
+    closed adds the step from the last node back to the first, so a cycle gives one code per node.
+    """
+    vectors = to_vectors(seq, V)
+    if closed:
+        vectors = np.concatenate((vectors, vectors[:1]))
+    return vectors[0], direction_codes(vectors)
+
+
+def decode_chain(start: Vector, codes: np.ndarray) -> np.ndarray:
+    """
+    Decode a direction chain back to its (len(codes) + 1, 3) vectors.
+    """
+    vectors = np.empty((len(codes) + 1, 3), dtype=np.int32)
+    vectors[0] = start
+    np.cumsum(DIRECTIONS[np.asarray(codes)], axis=0, out=vectors[1:])
+    vectors[1:] += vectors[0]
+    return vectors
+
+
+def pack_directions(codes: np.ndarray) -> bytes:
+    """
+    Pack direction codes into 3 bits each.
+    """
+    return np.packbits(np.unpackbits(codes.astype(np.uint8)[:, None], axis=1)[:, 5:]).tobytes()
+
+
+def unpack_directions(packed: np.ndarray, length: int) -> np.ndarray:
+    """
+    Unpack the first length direction codes from a packed stream.
+    """
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8))[:length * 3].reshape(length, 3)
+    return (bits[:, 0] << 2 | bits[:, 1] << 1 | bits[:, 2]).astype(np.uint8)
+
+
+def make_coord_index(V: Verts) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """
+    Make the encoded-coordinate index of V: every vector packed into one integer key, the keys sorted, and the nodes
+    in the order of their keys. It replaces VI for arrays of vectors.
+    """
+    V = np.asarray(V, dtype=np.int64)
+    low, span = int(V.min()), int(V.max() - V.min()) + 1
+    keys = encode_coords(V, low, span)
+    order = np.argsort(keys, kind='stable')
+    return keys[order], order, low, span
+
+
+def encode_coords(vectors: np.ndarray, low: int, span: int) -> np.ndarray:
+    """
+    Pack (n, 3) vectors into one integer key each.
+    """
+    vectors = np.asarray(vectors, dtype=np.int64) - low
+    return (vectors[:, 0] * span + vectors[:, 1]) * span + vectors[:, 2]
+
+
+def to_nodes(vectors: np.ndarray, index: Tuple[np.ndarray, np.ndarray, int, int]) -> np.ndarray:
+    """
+    Map an array of vectors to their nodes through the encoded-coordinate index (see make_coord_index).
+    """
+    keys, order, low, span = index
+    wanted = encode_coords(vectors, low, span)
+    found = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    if (keys[found] != wanted).any():
+        raise KeyError('vectors not in the graph')
+    return order[found]
+
+
+def chain_nonturns(codes: np.ndarray) -> int:
+    """
+    Count the non-turns of a closed direction chain: consecutive steps in the same direction.
+    """
+    return int(np.count_nonzero(codes == np.roll(codes, 1)))
+
+
+def chain_axes(codes: np.ndarray) -> int:
+    """
+    Count the steps along each axis of a direction chain, return the min (as info.count_axes).
+    """
+    return int(np.bincount(np.asarray(codes) // 2, minlength=3).min())
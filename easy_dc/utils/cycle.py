@@ -0,0 +1,144 @@
+"""
+Cycle index: a solution with the position of every node in it, for answering many queries on one cycle without
+list.index.
+
+The nodes of a solution of order ORD are a permutation of 0..ORD-1, so the positions are its inverse permutation, one
+array: position, successor, predecessor and whether two nodes are consecutive are O(1), a segment is O(k) in its
+length. Given the vertices, the positions are also sorted by level once (O(n log n)) and the nodes of a level, in the
+order of the cycle, are then a slice.
+
+    >>> index = CycleIndex(cycle, V)
+    >>> index.position(node), index.next(node), index.between(u, v), index.level(-1), index.runs(-1)
+"""
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.utils.chain import to_vectors
+
+
+class CycleIndex:
+    """
+    nodes: the cycle as an array, at: its inverse, at[nodes[i]] == i, and (given V) z, the level of every position.
+    """
+
+    def __init__(self, cycle: Solution, V: Optional[Verts] = None):
+        self.nodes = np.asarray(cycle)
+        self.at = np.empty(len(self.nodes), dtype=np.int64)
+        self.at[self.nodes] = np.arange(len(self.nodes))
+        self.z = None if V is None else to_vectors(self.nodes, V)[:, 2]
+        self._levels: Optional[Tuple[np.ndarray, Dict[int, Tuple[int, int]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, i: int) -> int:
+        """
+        The node at position i, modulo the length of the cycle.
+        """
+        return int(self.nodes[i % len(self.nodes)])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.nodes.tolist())
+
+    def __contains__(self, node) -> bool:
+        return 0 <= node < len(self.at)
+
+    def position(self, node: int) -> int:
+        return int(self.at[node])
+
+    def positions(self, nodes: np.ndarray) -> np.ndarray:
+        return self.at[np.asarray(nodes)]
+
+    def next(self, node: int, k: int = 1) -> int:
+        """
+        The node k steps after node (before it for negative k).
+        """
+        return int(self.nodes[(self.at[node] + k) % len(self.nodes)])
+
+    def prev(self, node: int, k: int = 1) -> int:
+        return self.next(node, -k)
+
+    def neighbours(self, node: int) -> Tuple[int, int]:
+        """
+        The predecessor and the successor of node.
+        """
+        return self.prev(node), self.next(node)
+
+    def is_edge(self, u: int, v: int) -> bool:
+        """
+        Whether u and v are consecutive in the cycle (either way round).
+        """
+        return (self.at[u] - self.at[v]) % len(self.nodes) in (1, len(self.nodes) - 1)
+
+    def distance(self, u: int, v: int) -> int:
+        """
+        The number of steps forward from u to v.
+        """
+        return int((self.at[v] - self.at[u]) % len(self.nodes))
+
+    def segment(self, start: int, stop: int) -> np.ndarray:
+        """
+        The nodes from position start up to position stop excluded, wrapping around the end (a copy if it does).
+        """
+        n = len(self.nodes)
+        start, length = start % n, (stop - start) % n or (n if stop != start else 0)
+        if start + length <= n:
+            return self.nodes[start:start + length]
+        return np.concatenate((self.nodes[start:], self.nodes[:start + length - n]))
+
+    def between(self, u: int, v: int, forward: bool = True) -> np.ndarray:
+        """
+        The nodes from u to v, both included, following the cycle forward (or backward).
+        """
+        if forward:
+            return self.segment(self.at[u], self.at[u] + self.distance(u, v) + 1)
+        return self.segment(self.at[v], self.at[v] + self.distance(v, u) + 1)[::-1]
+
+    def rotated(self, node: int, reverse: bool = False) -> np.ndarray:
+        """
+        The cycle starting at node, forward or reversed.
+        """
+        i = int(self.at[node])
+        if reverse:
+            return np.concatenate((self.nodes[i::-1], self.nodes[:i:-1]))
+        return np.concatenate((self.nodes[i:], self.nodes[:i]))
+
+    def levels(self) -> Tuple[np.ndarray, Dict[int, Tuple[int, int]]]:
+        """
+        The positions sorted by level, in the order of the cycle within a level, and where every level starts and
+        stops in them.
+        """
+        if self._levels is None:
+            if self.z is None:
+                raise ValueError('a CycleIndex made without V has no levels')
+            order = np.argsort(self.z, kind='stable')
+            zs, starts = np.unique(self.z[order], return_index=True)
+            stops = np.append(starts[1:], len(order))
+            self._levels = order, {int(z): (int(a), int(b)) for z, a, b in zip(zs, starts, stops)}
+        return self._levels
+
+    def level(self, z: int) -> np.ndarray:
+        """
+        The positions of the nodes of level z, in the order of the cycle (a view).
+        """
+        order, bounds = self.levels()
+        start, stop = bounds.get(z, (0, 0))
+        return order[start:stop]
+
+    def level_nodes(self, z: int) -> np.ndarray:
+        return self.nodes[self.level(z)]
+
+    def runs(self, z: int) -> List[Tuple[int, int]]:
+        """
+        The maximal segments of the cycle within level z, as (start, stop) positions for segment, a run through the
+        end of the cycle joined to the one at its start.
+        """
+        positions = self.level(z)
+        if not len(positions):
+            return []
+        breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+        starts = np.concatenate((positions[:1], positions[breaks])).tolist()
+        stops = (np.concatenate((positions[breaks - 1], positions[-1:])) + 1).tolist()
+        if len(starts) > 1 and starts[0] == 0 and stops[-1] == len(self.nodes):
+            starts, stops = starts[1:-1] + [starts[-1]], stops[1:-1] + [stops[0] + len(self.nodes)]
+        return [*zip(starts, stops)]
@@ -1,9 +1,12 @@
 import cProfile
+from collections.abc import Sized
 from datetime import datetime
 from functools import wraps
 import pstats
 import time
 
+from easy_dc.utils.trace import TRACE, traced
+
 
 _c = 0
 
@@ -33,29 +36,11 @@ def cp(show=False, spacing=None, label=' №', justify=0) -> int:
 
 def timed(fn):
     """
-    Decorator that times a function and prints a pretty readout
+    Decorator that times a function into the trace collector (see utils.trace), a no-op unless tracing is enabled.
     fn: function to time
-    :return: fn + runtime of decorated function.
+    :return: fn, its runtime recorded as a span named after it.
     """
-
-    @wraps(fn)
-    def inner(*args, **kwargs):
-        """
-        inner function with lots of emojis.
-        """
-        fn_name = fn.__name__.upper()
-        st = time.perf_counter()
-        border = '═' + ('══' * ((len(fn.__name__) + 30) // 2))
-        print()
-        cp(show=True)
-        print(border + '╕')
-        print(f' 📌 {fn_name} | 🏁 {tstamp()}\n')
-        res = fn(*args, **kwargs)
-        print('\n', f'🕳 {fn_name} | 🕗 {time.perf_counter() - st:.7f} secs')
-        print(border + '╛', '\n')
-        return res
-
-    return inner
+    return traced(fn)
 
 
 def parametrized(dec):
@@ -93,25 +78,34 @@ def times(fn, n=10):
 
 
 @parametrized
-def profile(func, dump=None):
+def profile(func, dump=None, show=False):
     """
     cprofile decorated function.
+    Records the call counts (and calls per node when the first argument is sized, e.g. the adjacency) into the trace
+    collector, prints the stats table only when show is set.
     """
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        ORD = len(args[0])
+        ORD = len(args[0]) if args and isinstance(args[0], Sized) else None
         profiler = cProfile.Profile()
+        start = time.perf_counter()
         profiler.enable()
         try:
             return_value = func(*args, **kwargs)
         finally:
             profiler.disable()
+            wall = time.perf_counter() - start
             stats = pstats.Stats(profiler)
-            stats.sort_stats("tottime")
-            stats.print_stats()
             prim, total = stats.__dict__['prim_calls'], stats.__dict__['total_calls']
-            print(f'⭕️ {ORD}: {prim / total:.2%} primitive of {total} calls | {round(total / ORD, 2)} calls / n')
+            if TRACE.enabled:
+                TRACE.add(
+                    func.__name__, wall=wall, ORD=ORD, calls=total, primitive_calls=prim,
+                    calls_per_node=round(total / ORD, 2) if ORD else None
+                )
+            if show:
+                stats.sort_stats("tottime")
+                stats.print_stats()
             if dump:
                 stats.dump_stats(dump)
         return return_value
@@ -16,7 +16,10 @@ def uon(start=8, end=3000000, max_n=800) -> UonGen:
     """
     Generator for the uncentered octahedral numbers.
     """
-    for i in range(max_n + 2):
-        _uon = sum([(n * (n + 2)) for n in range(0, max_n * 2 + 2, 2)][:i])
-        if end >= _uon >= start:
+    _uon = 0
+    for n in range(0, max_n * 2 + 4, 2):
+        if _uon > end:
+            return
+        if _uon >= start:
             yield _uon
+        _uon += n * (n + 2)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from easy_dc.defs import *
 
 
@@ -57,6 +59,26 @@ def id_seq(seq, A, show=False) -> str or bool:
     return 'snake'
 
 
+def id_chain(vectors: np.ndarray, ORD: int) -> str or bool:
+    """
+    Certify a sequence given by the vectors of its nodes, without the graph: 'loop' if it visits every vertex of the
+    discocube of order ORD once, each step an edge and the last vector next to the first, 'snake' without the closing
+    edge, False otherwise.
+    """
+    vectors = np.asarray(vectors, dtype=np.int64).reshape(-1, 3)
+    max_xyz = next(filter(lambda n: get_uon(n) == ORD, range(ORD // 4 + 2)), 0) * 2 - 1
+    if len(vectors) != ORD or max_xyz < 1:
+        return False
+    if not ((vectors & 1).all() and (np.abs(vectors).max(axis=1) <= max_xyz).all()
+            and (np.abs(vectors).sum(axis=1) < max_xyz + 4).all()):
+        return False
+    if len(np.unique(vectors, axis=0)) != ORD:
+        return False
+    if (np.abs(np.diff(vectors, axis=0)).sum(axis=1) != 2).any():
+        return False
+    return 'loop' if np.abs(vectors[0] - vectors[-1]).sum() == 2 else 'snake'
+
+
 def show_broken(seq, A):
     return list(filter(lambda n: not n[1], (((seq[s - 1], seq[s]), seq[s - 1] in A[seq[s]]) for s in range(len(seq)))))
 
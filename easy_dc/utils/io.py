@@ -1,7 +1,35 @@
+import io
 import os
 import pickle
+import struct
+import zlib
+
+import numpy as np
 
 from easy_dc.defs import *
+from easy_dc.utils.lattice import RankedV
+from easy_dc.utils.chain import (
+    decode_chain, direction_codes, make_coord_index, pack_directions, to_nodes, unpack_directions
+)
+
+
+"""
+Compact cycle format: a 64 byte header followed by the payload, either the nodes as int32 or the steps between them as
+3 bit direction codes (2 * axis + (step < 0)), 8 steps to 3 bytes.
+header: magic, version, encoding, order, number of nodes, start node, start vector, crc32 of the payload.
+"""
+CYCLE_MAGIC = b'EZDC'
+CYCLE_VERSION = 1
+CYCLE_HEADER = struct.Struct('<4sBB2xQQq3iI')
+CYCLE_HEADER_SIZE = 64
+CYCLE_ENCODINGS = {'int32': 0, 'dir3': 1}
+
+"""
+Nested layout: one record per vertex, its vector and its neighbours along the basis vectors (-1 where there is none),
+ordered shell by shell so that every order is a prefix of the largest (see make.make_nested).
+"""
+NESTED_DTYPE = np.dtype([('v', '<i2', (3,)), ('nb', '<i4', (6,))])
+NESTED_FILE = 'nested.npy'
 
 
 def pickleload(filename, mode='rb', show=False, raise_error=False) -> Any:
@@ -36,11 +64,19 @@ def picklesave(to_pickle, filename, show=True, space=True) -> str:
     return f'💾{" " if space else ""}{filename}'
 
 
-def get_G(ORD, make=False) -> Graph:
+def get_G(ORD, make=False, layout='edist') -> Graph:
     """
     Get DC graph.
+
+    layout 'nested' makes the graph over a prefix of the one nested table on disk (see get_nested and
+    make.graph_from_nested) instead of loading the pickle of the order, 'ranked' does the same without materialising
+    V and VI (see utils.lattice). Missing the edist pickle, a pickle of the order in the nested numbering (as setup.py
+    saves the graphs of GraphBuilder) is renumbered and saved as the edist one. Either way a graph missing on disk is
+    made and saved.
     """
-    from easy_dc.make import make_dcgraph
+    from easy_dc.make import make_dcgraph, graph_from_nested, renumber_graph
+    if layout in ('nested', 'ranked'):
+        return graph_from_nested(get_nested(ORD), ranked=layout == 'ranked')
     if make:
         return make_dcgraph(ORD, save=True)
     try:
@@ -48,13 +84,214 @@ def get_G(ORD, make=False) -> Graph:
             return make_dcgraph(ORD, save=True)
         return loaded
     except FileNotFoundError:
+        if os.path.exists(nested := os.path.join(FP_GRAPHS, f'{ORD}.nested.pickle')):
+            save_G(G := renumber_graph(pickleload(nested), 'edist')[0])
+            return G
         print('GRAPH NOT IN FILE, MAKING....')
         save_G(make_dcgraph(ORD))
         return get_G(ORD)
 
 
-def save_G(G):
+def save_G(G, layout='edist'):
     """
-    Get DC graph.
+    Save DC graph, as ORD.pickle in the edist numbering, as ORD.layout.pickle in any other.
+    """
+    picklesave(G, os.path.join(FP_GRAPHS, str(len(G['A'])) if layout == 'edist' else f'{len(G["A"])}.{layout}'))
+
+
+def get_nested(ORD, make=True, path=None) -> np.ndarray:
+    """
+    Get the nested table of order ORD: a zero-copy view of the first ORD records of the nested table on disk, which is
+    memory-mapped read-only. The vertices are table['v'] and the neighbours table['nb'] (neighbours >= ORD belong to
+    larger orders).
+
+    When the table on disk is smaller than ORD (or missing), it is replaced by the table of order ORD if make is set.
+    Raises ValueError when ORD is not the order of a discocube (its prefix would cut a shell).
+    """
+    from easy_dc.make import is_order, make_nested
+    if not is_order(ORD):
+        raise ValueError(f'{ORD} is not the order of a discocube')
+    path = path or os.path.join(FP_GRAPHS, NESTED_FILE)
+    table = np.load(path, mmap_mode='r') if os.path.exists(path) else np.empty(0, dtype=NESTED_DTYPE)
+    if len(table) < ORD:
+        if not make:
+            raise FileNotFoundError(f'{path} holds {len(table)} vertices, order {ORD} needs to be made first')
+        save_nested(make_nested(ORD), path)
+        table = np.load(path, mmap_mode='r')
+    return table[:ORD]
+
+
+def save_nested(table: np.ndarray, path=None, show=True) -> str:
+    """
+    Save a nested table, replacing the one on disk in one step (readers keep their maps of the old file).
+    """
+    path = path or os.path.join(FP_GRAPHS, NESTED_FILE)
+    with open(tmp := f'{path}.tmp', 'wb') as f:
+        np.save(f, np.asarray(table, dtype=NESTED_DTYPE))
+    os.replace(tmp, path)
+    if show:
+        print(f' 💾 {path}')
+    return path
+
+
+class CycleWriter:
+    """
+    Streams a cycle to disk in the compact cycle format, chunk by chunk, without holding it in memory.
+
+    encoding 'int32' writes the nodes, 'dir3' writes the direction of each step from one node to the next, which needs
+    the vertices V (the closing step back to the start is implied). The header is rewritten with the length and the
+    checksum on close. filename may also be a seekable binary file open for writing, which is left open.
+
+    Examples:
+        >>> with CycleWriter('solution', ORD=len(V), V=V, encoding='dir3') as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(chunk)
+    """
+
+    def __init__(self, filename: Union[str, io.BufferedIOBase], ORD: int = 0, V: Optional[Verts] = None,
+                 encoding: str = 'int32'):
+        if encoding not in CYCLE_ENCODINGS:
+            raise ValueError(f'unknown encoding {encoding}, use one of {[*CYCLE_ENCODINGS]}')
+        if encoding == 'dir3' and V is None:
+            raise ValueError('dir3 encoding needs the vertices V')
+        if isinstance(filename, str):
+            self.filename = filename if filename.endswith('.cycle') else f'{filename}.cycle'
+            self.file = open(self.filename, 'wb')
+        else:
+            self.filename, self.file = None, filename
+        self.ORD, self.encoding, self.closed = ORD, encoding, False
+        self.V = None if V is None else V if isinstance(V, RankedV) else np.asarray(V, dtype=np.int32)
+        self.length, self.crc, self.start, self.last = 0, 0, -1, None
+        self.pending = np.empty(0, dtype=np.uint8)
+        self.offset = self.file.tell()
+        self.file.write(bytes(CYCLE_HEADER_SIZE))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, nodes: Iterable[int]):
+        """
+        Append the next nodes of the cycle.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64).ravel()
+        if not len(nodes):
+            return
+        if self.start < 0:
+            self.start = int(nodes[0])
+        if self.encoding == 'int32':
+            self._put(nodes.astype('<i4').tobytes())
+        else:
+            vectors = self.V[nodes]
+            if self.last is not None:
+                vectors = np.concatenate((self.last[None], vectors))
+            self.last = vectors[-1]
+            codes = np.concatenate((self.pending, direction_codes(vectors)))
+            whole = len(codes) - len(codes) % 8
+            self._put(pack_directions(codes[:whole]))
+            self.pending = codes[whole:]
+        self.length += len(nodes)
+
+    def close(self):
+        """
+        Flush the last partial group of directions and rewrite the header.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if len(self.pending):
+            self._put(pack_directions(self.pending))
+            self.pending = self.pending[:0]
+        start = (*map(int, self.V[self.start]),) if self.V is not None and self.start >= 0 else (0, 0, 0)
+        end = self.file.tell()
+        self.file.seek(self.offset)
+        self.file.write(CYCLE_HEADER.pack(
+            CYCLE_MAGIC, CYCLE_VERSION, CYCLE_ENCODINGS[self.encoding], self.ORD, self.length, self.start, *start,
+            self.crc
+        ))
+        if self.filename:
+            self.file.close()
+        else:
+            self.file.seek(end)
+
+    def _put(self, data: bytes):
+        self.crc = zlib.crc32(data, self.crc)
+        self.file.write(data)
+
+
+def save_cycle(cycle: Solution, filename: str, V: Optional[Verts] = None, encoding: str = 'int32', show=True) -> str:
+    """
+    Write a whole cycle to a .cycle file in the compact cycle format.
+    """
+    with CycleWriter(filename, ORD=len(cycle), V=V, encoding=encoding) as writer:
+        writer.write(cycle)
+    if show:
+        print(f' 💾 {writer.filename}')
+    return writer.filename
+
+
+def cycle_bytes(cycle: Solution, V: Optional[Verts] = None, encoding: str = 'int32') -> bytes:
+    """
+    A whole cycle in the compact cycle format, in memory (what save_cycle writes to a file).
+    """
+    buffer = io.BytesIO()
+    with CycleWriter(buffer, ORD=len(cycle), V=V, encoding=encoding) as writer:
+        writer.write(cycle)
+    return buffer.getvalue()
+
+
+def load_cycle(filename: str, verify: bool = True) -> Tuple[CycleHeader, np.ndarray]:
+    """
+    Read the header of a .cycle file and memory-map its payload.
+
+    Returns the header as a dict and the payload: the nodes as an int32 memmap, or the packed directions as a uint8
+    memmap (see unpack_directions). Raises ValueError when the file isn't a cycle or the checksum doesn't match.
+    """
+    filename = filename if filename.endswith('.cycle') else f'{filename}.cycle'
+    with open(filename, 'rb') as f:
+        magic, version, encoding, ORD, length, start, x, y, z, crc = CYCLE_HEADER.unpack(f.read(CYCLE_HEADER.size))
+    if magic != CYCLE_MAGIC or version != CYCLE_VERSION:
+        raise ValueError(f'{filename} is not a version {CYCLE_VERSION} cycle file')
+    header = {
+        'ORD': ORD,
+        'length': length,
+        'start': start,
+        'vector': (x, y, z),
+        'encoding': next(k for k, v in CYCLE_ENCODINGS.items() if v == encoding),
+        'crc': crc,
+    }
+    if header['encoding'] == 'int32':
+        payload = np.memmap(filename, dtype='<i4', mode='r', offset=CYCLE_HEADER_SIZE, shape=(length,))
+    else:
+        size = -(-max(length - 1, 0) * 3 // 8)
+        payload = np.memmap(filename, dtype=np.uint8, mode='r', offset=CYCLE_HEADER_SIZE, shape=(size,)) if size else (
+            np.empty(0, dtype=np.uint8))
+    if verify and zlib.crc32(payload) != crc:
+        raise ValueError(f'{filename} is corrupt: checksum mismatch')
+    return header, payload
+
+
+def load_cycle_nodes(filename: str, V: Verts) -> np.ndarray:
+    """
+    Read the nodes of a .cycle file, decoding a direction stream through the encoded-coordinate index of V.
+    """
+    header, payload = load_cycle(filename)
+    if header['encoding'] == 'int32':
+        return payload
+    vectors = decode_chain(header['vector'], unpack_directions(payload, max(header['length'] - 1, 0)))
+    return to_nodes(vectors, make_coord_index(V))
+
+
+def load_cycle_vectors(filename: str, V: Optional[Verts] = None) -> np.ndarray:
+    """
+    Read the vectors of a .cycle file as an (n, 3) array: a direction stream is decoded from its start vector, nodes
+    are looked up in V (RankedV for nested ids), which int32 files need.
     """
-    picklesave(G, os.path.join(FP_GRAPHS, str(len(G['A']))))
+    header, payload = load_cycle(filename)
+    if header['encoding'] != 'int32':
+        return decode_chain(header['vector'], unpack_directions(payload, max(header['length'] - 1, 0)))
+    if V is None:
+        raise ValueError(f'{filename} holds nodes, their vertices V are needed to read its vectors')
+    return V[np.asarray(payload, dtype=np.int64)] if isinstance(V, RankedV) else np.asarray(V)[np.asarray(payload)]
@@ -0,0 +1,153 @@
+"""
+Arithmetic index of the nested layout (see make.make_nested): vertices ordered by octahedral shell, then z, y and x.
+
+Shell s holds the vertices with |x| + |y| + |z| = 2s + 1 and starts at uon(s - 1) = 4/3 (s + 1) s (s - 1). Within a
+shell, a vertex below the origin with |x| + |y| = 2R - 2 lies in the z-slice starting at 2 (R - 2)(R - 1); the slice
+holds two vertices (x < 0, x > 0) per y, y ascending. The shell is point symmetric: rank(-v) = last - rank(v), so the
+vertices above the origin are ranked through their mirror image.
+"""
+from math import isqrt
+
+import numpy as np
+
+from easy_dc.defs import *
+
+
+def shell_start(s):
+    """
+    The index of the first vertex of shell s (the order of s - 1 shells).
+    """
+    return (s + 1) * s * (s - 1) * 4 // 3
+
+
+def rank(vectors: np.ndarray) -> np.ndarray:
+    """
+    The index of every (x, y, z) of an (n, 3) array in the nested layout.
+    """
+    v = np.asarray(vectors, dtype=np.int64).reshape(-1, 3)
+    s = (np.abs(v).sum(axis=1) - 1) // 2
+    above = v[:, 2] > 0
+    v = np.where(above[:, None], -v, v)
+    x, y = v[:, 0], v[:, 1]
+    R, b = (np.abs(x) + np.abs(y) + 2) // 2, (np.abs(y) + 1) // 2
+    inshell = 2 * (R - 2) * (R - 1) + 2 * np.where(y < 0, R - 1 - b, R - 2 + b) + (x > 0)
+    return shell_start(s) + np.where(above, 4 * s * (s + 1) - 1 - inshell, inshell)
+
+
+def unrank(ids: np.ndarray) -> np.ndarray:
+    """
+    The (x, y, z) of every index of an array in the nested layout, as an (n, 3) array.
+    """
+    i = np.asarray(ids, dtype=np.int64).ravel()
+    s = np.floor(np.cbrt(0.75 * i)).astype(np.int64) + 1
+    s -= shell_start(s) > i
+    s += shell_start(s + 1) <= i
+    r, full = i - shell_start(s), 4 * s * (s + 1)
+    above = r >= full // 2
+    r = np.where(above, full - 1 - r, r)
+    R = np.floor(1.5 + np.sqrt(r / 2 + 0.25)).astype(np.int64)
+    R -= 2 * (R - 2) * (R - 1) > r
+    R += 2 * (R - 1) * R <= r
+    q = r - 2 * (R - 2) * (R - 1)
+    row, right = q // 2, q % 2
+    b = np.where(row < R - 1, R - 1 - row, row - R + 2)
+    x = np.where(right == 1, 1, -1) * (2 * (R - b) - 1)
+    y = np.where(row < R - 1, -1, 1) * (2 * b - 1)
+    z = -(2 * (s + 2 - R) - 1)
+    v = np.stack((x, y, z), axis=1)
+    return np.where(above[:, None], -v, v)
+
+
+def rank_one(x: int, y: int, z: int) -> int:
+    """
+    rank for a single vector, in plain ints.
+    """
+    if above := z > 0:
+        x, y, z = -x, -y, -z
+    ax, ay = abs(x), abs(y)
+    s, R, b = (ax + ay - z - 1) // 2, (ax + ay + 2) // 2, (ay + 1) // 2
+    inshell = 2 * (R - 2) * (R - 1) + 2 * (R - 1 - b if y < 0 else R - 2 + b) + (x > 0)
+    return (s + 1) * s * (s - 1) * 4 // 3 + (4 * s * (s + 1) - 1 - inshell if above else inshell)
+
+
+def unrank_one(n: int) -> Vector:
+    """
+    unrank for a single index, in plain ints.
+    """
+    s = int((0.75 * n) ** (1 / 3)) + 1
+    while (start := (s + 1) * s * (s - 1) * 4 // 3) > n:
+        s -= 1
+    while (s + 2) * (s + 1) * s * 4 // 3 <= n:
+        s += 1
+        start = (s + 1) * s * (s - 1) * 4 // 3
+    r, full = n - start, 4 * s * (s + 1)
+    if above := r >= full // 2:
+        r = full - 1 - r
+    R = (3 + isqrt(2 * r + 1)) // 2
+    while 2 * (R - 2) * (R - 1) > r:
+        R -= 1
+    while 2 * (R - 1) * R <= r:
+        R += 1
+    row, right = divmod(r - 2 * (R - 2) * (R - 1), 2)
+    b = R - 1 - row if row < R - 1 else row - R + 2
+    x, y, z = (2 * (R - b) - 1) * (1 if right else -1), (2 * b - 1) * (-1 if row < R - 1 else 1), 1 - 2 * (s + 2 - R)
+    return (-x, -y, -z) if above else (x, y, z)
+
+
+class RankedVI:
+    """
+    Stands in for VI (make.make_vi_map) of a nested graph of order ORD without storing it: VI[(x, y, z)] is computed
+    by rank_one.
+    """
+    __slots__ = 'ORD',
+
+    def __init__(self, ORD: int):
+        self.ORD = ORD
+
+    def __getitem__(self, vector: Vector) -> int:
+        x, y, z = vector
+        if (x & y & z & 1) == 0 or (n := rank_one(x, y, z)) >= self.ORD:
+            raise KeyError(vector)
+        return n
+
+    def get(self, vector: Vector, default=None):
+        try:
+            return self[vector]
+        except KeyError:
+            return default
+
+    def __contains__(self, vector) -> bool:
+        return self.get(vector) is not None
+
+    def __len__(self) -> int:
+        return self.ORD
+
+    def __iter__(self):
+        return map(tuple, unrank(np.arange(self.ORD)).tolist())
+
+
+class RankedV:
+    """
+    Stands in for V of a nested graph of order ORD without storing it: V[n] is computed by unrank (V[array] gives an
+    (n, 3) array).
+    """
+    __slots__ = 'ORD',
+
+    def __init__(self, ORD: int):
+        self.ORD = ORD
+
+    def __getitem__(self, n: int) -> Vector:
+        if isinstance(n, np.ndarray):
+            return unrank(n)
+        if not -self.ORD <= n < self.ORD:
+            raise IndexError(n)
+        return unrank_one(n % self.ORD)
+
+    def __len__(self) -> int:
+        return self.ORD
+
+    def __iter__(self):
+        return map(tuple, unrank(np.arange(self.ORD)).tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return unrank(np.arange(self.ORD)).astype(dtype or np.int64)
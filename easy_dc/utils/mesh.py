@@ -0,0 +1,203 @@
+"""
+Mesh export: a solved cycle as solid geometry in binary glTF (.glb), for viewers and renderers.
+
+Every edge of the cycle becomes a box or a tube, generated in batches of edges from one template per axis with numpy,
+and written to the file batch by batch: the sizes of the buffers are known from the number of edges, so the json
+header is written first and the geometry streamed after it, never holding more than one batch.
+
+    box   an axis-aligned box per edge, 8 vertices and 12 triangles, lengthened by its half-width at both ends so the
+          boxes of consecutive edges overlap and fill the corners. No normals: viewers shade it flat.
+    tube  a prism of sides sides per edge, smooth normals, and a sphere joint at every vertex.
+
+    >>> export_cycle(cycle, V, '960.glb', style='tube', radius=0.3)
+"""
+import json
+import struct
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.utils.chain import to_vectors
+
+MeshPart = Dict[str, Any]
+GLB_MAGIC = 0x46546C67
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+FLOAT, UINT = 5126, 5125
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+BATCH = 2 ** 16
+
+"""
+The 8 corners of a box as bits (x, y, z) of (low, high) and its 12 triangles, counterclockwise seen from outside.
+"""
+BOX_CORNERS = np.array([[(c >> 2) & 1, (c >> 1) & 1, c & 1] for c in range(8)], dtype=bool)
+BOX_TRIANGLES = np.array([
+    [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5],
+    [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+    [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+], dtype=np.uint32)
+
+
+def cycle_edges(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The ends of the edges of a closed chain of vectors, from every vector to the next, the last back to the first.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, 3)
+    return vectors, np.roll(vectors, -1, axis=0)
+
+
+def ring(sides: int) -> np.ndarray:
+    """
+    The unit circle of sides points around each axis, (3, sides, 3), starting on an axis so it spans [-1, 1].
+    """
+    angles = 2 * np.pi * np.arange(sides) / sides
+    cos, sin = np.cos(angles), np.sin(angles)
+    zero = np.zeros(sides)
+    return np.array([
+        np.column_stack((zero, cos, sin)),
+        np.column_stack((sin, zero, cos)),
+        np.column_stack((cos, sin, zero)),
+    ], dtype=np.float32)
+
+
+def tube_triangles(sides: int) -> np.ndarray:
+    """
+    The 2 * sides triangles of the side of a prism between the rings 0..sides-1 and sides..2 * sides - 1, the first
+    lower on the axis.
+    """
+    i = np.arange(sides, dtype=np.uint32)
+    j = (i + 1) % sides
+    return np.column_stack((i, j, j + sides, i, j + sides, i + sides)).reshape(-1, 3)
+
+
+def sphere(sides: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A unit uv sphere with sides meridians and sides // 2 parallels, poles included (a ring of sides points each, so
+    the triangles with two of them are left out): its points and triangles.
+    """
+    rows = max(sides // 2, 2)
+    theta = np.pi * np.arange(rows + 1) / rows
+    phi = 2 * np.pi * np.arange(sides) / sides
+    points = np.stack(np.broadcast_arrays(
+        np.sin(theta)[:, None] * np.cos(phi), np.sin(theta)[:, None] * np.sin(phi), np.cos(theta)[:, None]
+    ), axis=-1).reshape(-1, 3).astype(np.float32)
+    r, s = np.meshgrid(np.arange(rows, dtype=np.uint32), np.arange(sides, dtype=np.uint32), indexing='ij')
+    a, b = r * sides + s, r * sides + (s + 1) % sides
+    triangles = np.stack((a, a + sides, b + sides, a, b + sides, b), axis=-1).reshape(-1, 2, 3)
+    return points, np.concatenate((triangles[:sides, 0], triangles[sides:-sides].reshape(-1, 3), triangles[-sides:, 1]))
+
+
+def mesh_parts(vectors: np.ndarray, style: str = 'box', radius: float = 0.25, sides: int = 8) -> List[MeshPart]:
+    """
+    The parts of the mesh of a cycle: for each, the number of items (edges or joints), its vertices and triangles
+    per item, and functions making the positions (and normals) of a batch of items.
+    """
+    starts, ends = cycle_edges(vectors)
+    axes = np.abs(ends - starts).argmax(axis=1)
+    if style == 'box':
+        def box(lo: int, hi: int) -> np.ndarray:
+            low = np.minimum(starts[lo:hi], ends[lo:hi]) - radius
+            high = np.maximum(starts[lo:hi], ends[lo:hi]) + radius
+            return np.where(BOX_CORNERS, high[:, None], low[:, None])
+
+        return [{'count': len(starts), 'vertices': 8, 'triangles': BOX_TRIANGLES, 'positions': box}]
+    if style != 'tube':
+        raise ValueError(f'unknown style {style}, use box or tube')
+    circle = ring(sides)
+    points, triangles = sphere(sides)
+
+    def tube(lo: int, hi: int) -> np.ndarray:
+        around = circle[axes[lo:hi]] * radius
+        low, high = np.minimum(starts[lo:hi], ends[lo:hi]), np.maximum(starts[lo:hi], ends[lo:hi])
+        return np.concatenate((low[:, None] + around, high[:, None] + around), axis=1)
+
+    def tube_normals(lo: int, hi: int) -> np.ndarray:
+        return np.tile(circle[axes[lo:hi]], (1, 2, 1))
+
+    return [
+        {'count': len(starts), 'vertices': 2 * sides, 'triangles': tube_triangles(sides), 'positions': tube,
+         'normals': tube_normals},
+        {'count': len(starts), 'vertices': len(points), 'triangles': triangles,
+         'positions': lambda lo, hi: starts[lo:hi, None] + points * radius,
+         'normals': lambda lo, hi: np.broadcast_to(points, (hi - lo, *points.shape))},
+    ]
+
+
+def batches(count: int, size: int = BATCH) -> Iterator[Tuple[int, int]]:
+    return ((lo, min(lo + size, count)) for lo in range(0, count, size))
+
+
+def write_glb(vectors: np.ndarray, filename: str, style: str = 'box', radius: float = 0.25, sides: int = 8,
+              color: Tuple[float, float, float, float] = (0.8, 0.8, 0.85, 1.0), metallic: float = 0.0,
+              roughness: float = 0.5, show: bool = True) -> str:
+    """
+    Write the mesh of a closed chain of vectors as binary glTF: one mesh of one primitive per part, one material.
+    The positions, normals and indices of every part are each a buffer view, streamed batch by batch.
+    """
+    parts = mesh_parts(vectors, style=style, radius=radius, sides=sides)
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'easy_dc'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [{'mesh': 0, 'name': f'discocube_{len(vectors)}'}],
+        'meshes': [{'primitives': []}],
+        'materials': [{'pbrMetallicRoughness': {
+            'baseColorFactor': [*map(float, color)], 'metallicFactor': metallic, 'roughnessFactor': roughness,
+        }}],
+        'buffers': [{'byteLength': 0}],
+        'bufferViews': [],
+        'accessors': [],
+    }
+    offset, streams = 0, []
+
+    def view(length: int, target: int, accessor: Dict[str, Any], stream) -> int:
+        nonlocal offset
+        gltf['bufferViews'].append({'buffer': 0, 'byteOffset': offset, 'byteLength': length, 'target': target})
+        gltf['accessors'].append({'bufferView': len(gltf['bufferViews']) - 1, **accessor})
+        streams.append(stream)
+        offset += length
+        return len(gltf['accessors']) - 1
+
+    for part in parts:
+        count, size = part['count'], part['vertices']
+        low, high = np.full(3, np.inf), np.full(3, -np.inf)
+        for lo, hi in batches(count):
+            batch = part['positions'](lo, hi).reshape(-1, 3)
+            low, high = np.minimum(low, batch.min(axis=0)), np.maximum(high, batch.max(axis=0))
+        vertices = {'count': count * size, 'componentType': FLOAT, 'type': 'VEC3'}
+        attributes = {'POSITION': view(
+            count * size * 12, ARRAY_BUFFER, {**vertices, 'min': low.tolist(), 'max': high.tolist()},
+            (part['positions'], count, np.float32)
+        )}
+        if 'normals' in part:
+            attributes['NORMAL'] = view(count * size * 12, ARRAY_BUFFER, vertices, (part['normals'], count, np.float32))
+        triangles = part['triangles']
+
+        def indices(lo: int, hi: int, triangles=triangles, size=size) -> np.ndarray:
+            return triangles + (np.arange(lo, hi, dtype=np.uint32) * size)[:, None, None]
+
+        gltf['meshes'][0]['primitives'].append({'attributes': attributes, 'material': 0, 'indices': view(
+            count * triangles.size * 4, ELEMENT_ARRAY_BUFFER,
+            {'count': count * triangles.size, 'componentType': UINT, 'type': 'SCALAR'},
+            (indices, count, np.uint32)
+        )})
+    gltf['buffers'][0]['byteLength'] = offset
+    header = json.dumps(gltf, separators=(',', ':')).encode()
+    header += b' ' * (-len(header) % 4)
+    with open(filename, 'wb') as f:
+        f.write(struct.pack('<III', GLB_MAGIC, 2, 12 + 8 + len(header) + 8 + offset))
+        f.write(struct.pack('<II', len(header), CHUNK_JSON) + header)
+        f.write(struct.pack('<II', offset, CHUNK_BIN))
+        for make, count, dtype in streams:
+            for lo, hi in batches(count):
+                f.write(np.ascontiguousarray(make(lo, hi), dtype=dtype).tobytes())
+    if show:
+        print(f' 💾 {filename} ({len(vectors)} edges, {style}, {12 + 8 + len(header) + 8 + offset} bytes)')
+    return filename
+
+
+def export_cycle(cycle: Solution, V: Verts, filename: str, **kwargs) -> str:
+    """
+    Write the mesh of a cycle of the nodes of V (a sequence of vectors, or utils.lattice.RankedV for nested ids).
+    """
+    return write_glb(to_vectors(cycle, V), filename, **kwargs)
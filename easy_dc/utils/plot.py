@@ -2,10 +2,10 @@ from typing import List
 
 import numpy as np
 from matplotlib import pyplot as plt # noqa
-from sklearn.metrics import r2_score # noqa
 
 
 def plot_curve_with_regression(sizes: List[int], times: List[float]):
+    from sklearn.metrics import r2_score
     plt.scatter(sizes, times)
     plt.xlabel("Input sizes in millions")
     plt.ylabel("Execution times in seconds")
@@ -30,4 +30,15 @@ def plot_curve(sizes: List[int], times: List[float]):
     plt.plot(sizes, times)
     plt.xlabel("Input sizes")
     plt.ylabel("Execution times")
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+def plot_cycle(cycle, V):
+    """
+    Plot a cycle as a 3d line drawing, closed back to its first node.
+    """
+    points = np.array([V[n] for n in [*cycle, cycle[0]]])
+    ax = plt.figure().add_subplot(projection='3d')
+    ax.plot(*points.T, linewidth=0.8)
+    ax.set_axis_off()
+    plt.show()
@@ -0,0 +1,142 @@
+"""
+Off-screen rendering of cycles to PNG, for orders far beyond what a matplotlib 3d line can take.
+
+The cycle is reduced before it is drawn: straight runs are merged into one segment (merge_runs), the corners are
+projected to the image and consecutive corners on the same pixel are dropped (decimate), so the work left is bounded
+by the number of pixels the cycle crosses. The segments are rasterized in batches with numpy, nearest wins per pixel
+(a depth buffer), coloured along the cycle and shaded by depth, and the image is written with zlib (write_png).
+
+    >>> render_cycle(cycle, V, '960.png', size=1024)
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.utils.chain import to_vectors
+
+CHUNK = 2 ** 20
+
+
+def merge_runs(vectors: np.ndarray) -> np.ndarray:
+    """
+    The indices of the corners of a closed chain of vectors, the vectors where the direction changes: the segments
+    between consecutive corners (and from the last back to the first) are its straight runs.
+    """
+    steps = np.diff(vectors, axis=0, append=vectors[:1])
+    corners = np.flatnonzero((steps != np.roll(steps, 1, axis=0)).any(axis=1))
+    return corners if len(corners) else np.zeros(1, dtype=np.int64)
+
+
+def project(vectors: np.ndarray, azimuth: float = 30, elevation: float = 25) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orthographic projection of vectors, turned by azimuth about z and tilted by elevation towards the viewer (degrees):
+    the (n, 2) screen points, y up, and the depth of every point, larger nearer.
+    """
+    a, e = np.radians(azimuth), np.radians(elevation)
+    x, y, z = np.asarray(vectors, dtype=np.float64).T
+    u = x * np.cos(a) - y * np.sin(a)
+    w = x * np.sin(a) + y * np.cos(a)
+    return np.column_stack((u, z * np.cos(e) - w * np.sin(e))), z * np.sin(e) + w * np.cos(e)
+
+
+def to_pixels(points: np.ndarray, size: int, margin: int = 8) -> np.ndarray:
+    """
+    Screen points scaled and centred on a size x size image, as (n, 2) integer (column, row) pixels.
+    """
+    low, high = points.min(axis=0), points.max(axis=0)
+    scale = (size - 2 * margin - 1) / max((high - low).max(), 1e-9)
+    centred = (points - (low + high) / 2) * scale + (size - 1) / 2
+    return np.column_stack((centred[:, 0], size - 1 - centred[:, 1])).round().astype(np.int64)
+
+
+def decimate(pixels: np.ndarray) -> np.ndarray:
+    """
+    The indices of the points kept drawing a closed polyline at pixel resolution: a point on the same pixel as the one
+    before it adds nothing.
+    """
+    keep = np.flatnonzero((pixels != np.roll(pixels, 1, axis=0)).any(axis=1))
+    return keep if len(keep) else np.zeros(1, dtype=np.int64)
+
+
+def hues(t: np.ndarray) -> np.ndarray:
+    """
+    Fully saturated colours (n, 3) in [0, 1] around the colour wheel for t in [0, 1).
+    """
+    return np.clip(np.abs((t[:, None] * 6 + [0, 4, 2]) % 6 - 3) - 1, 0, 1)
+
+
+def rasterize(pixels: np.ndarray, depth: np.ndarray, colors: np.ndarray, size: int,
+              background: int = 255) -> np.ndarray:
+    """
+    Draw the closed polyline through pixels (one pixel wide, DDA), every segment interpolating the depth and colour
+    of its ends, into a size x size RGB image where the nearest point of every pixel wins.
+    """
+    image = np.full((size * size, 3), background, dtype=np.uint8)
+    zbuffer = np.full(size * size, -np.inf)
+    ends = np.append(np.arange(1, len(pixels)), 0)
+    low, scale = depth.min(), (2 ** 20 - 1) / max(np.ptp(depth), 1e-9)
+    for lo in range(0, len(pixels), CHUNK):
+        a, b = np.arange(lo, min(lo + CHUNK, len(pixels))), ends[lo:lo + CHUNK]
+        delta = pixels[b] - pixels[a]
+        steps = np.abs(delta).max(axis=1) + 1
+        segment = np.repeat(np.arange(len(a)), steps)
+        start = np.repeat(np.cumsum(steps) - steps, steps)
+        t = (np.arange(len(segment)) - start) / np.repeat(np.maximum(steps - 1, 1), steps)
+        at = (pixels[a][segment] + delta[segment] * t[:, None]).round().astype(np.int64)
+        flat = at[:, 1] * size + at[:, 0]
+        z = depth[a][segment] + (depth[b] - depth[a])[segment] * t
+        # one sort by pixel then depth, the depth quantized to the low 20 bits of the key: the last of a pixel wins
+        key = flat << 20 | ((z - low) * scale).astype(np.int64)
+        order = key.argsort()
+        win = order[np.append(flat[order][1:] != flat[order][:-1], True)]
+        nearer = win[z[win] > zbuffer[flat[win]]]
+        zbuffer[flat[nearer]] = z[nearer]
+        c = colors[a][segment[nearer]] + (colors[b] - colors[a])[segment[nearer]] * t[nearer, None]
+        image[flat[nearer]] = (c * 255).round().astype(np.uint8)
+    return image.reshape(size, size, 3)
+
+
+def write_png(image: np.ndarray, filename: str) -> str:
+    """
+    Write an (h, w, 3) uint8 image as an 8 bit RGB PNG.
+    """
+    height, width = image.shape[:2]
+    rows = np.concatenate((np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)), axis=1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+    return filename
+
+
+def render_vectors(vectors: np.ndarray, filename: str, size: int = 1024, azimuth: float = 30, elevation: float = 25,
+                   background: int = 255, show: bool = True) -> str:
+    """
+    Render a closed chain of vectors to a size x size PNG, coloured around the colour wheel along the chain and darker
+    away from the viewer.
+    """
+    vectors = np.asarray(vectors).reshape(-1, 3)
+    corners = merge_runs(vectors)
+    points, depth = project(vectors[corners], azimuth, elevation)
+    pixels = to_pixels(points, size)
+    kept = decimate(pixels)
+    shade = (depth[kept] - depth.min()) / max(np.ptp(depth), 1e-9) * 0.55 + 0.45
+    colors = hues(corners[kept] / len(vectors)) * shade[:, None]
+    write_png(rasterize(pixels[kept], depth[kept], colors, size, background), filename)
+    if show:
+        print(f' 🖼️ {filename} ({len(vectors)} vectors, {len(corners)} corners, {len(kept)} drawn)')
+    return filename
+
+
+def render_cycle(cycle: Solution, V: Verts, filename: str, **kwargs) -> str:
+    """
+    Render a cycle of the nodes of V (a sequence of vectors, or utils.lattice.RankedV for nested ids) to a PNG.
+    """
+    return render_vectors(to_vectors(cycle, V), filename, **kwargs)
@@ -0,0 +1,228 @@
+"""
+Shared-memory graphs: the arrays of a graph are placed in one shared memory block by the process that owns it, and
+worker processes attach to it through a small picklable handle instead of unpickling their own copy of the graph.
+
+    V   (n, 3) vertices               NB  (n, 6) neighbours along chain.DIRECTIONS, -1 where there is none
+    W   (n,) weights                  VI  grid of the nodes, (x, y, z) at ((x, y, z) - low) // 2, -1 outside the graph
+    Z1  the nodes of the level z = -1
+
+The graph attached (attach_graph) holds zero-copy views of these arrays, and A, VI, EA and ZA[-1] are mappings
+computing their items from them, so weave_solution runs on it as on the graph it was made from.
+"""
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from easy_dc.defs import *
+
+GraphHandle = Dict[str, Any]
+ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, Graph]] = {}
+
+
+class SharedAdjacency:
+    """
+    A (make.make_adjacency) over the neighbour array: A[n] is the set of neighbours of n. The neighbours past the end
+    of the array are left out, so it may be a prefix of a larger graph's (a nested table, see make.graph_from_nested).
+    """
+    __slots__ = 'NB', 'size'
+
+    def __init__(self, NB: np.ndarray):
+        self.NB, self.size = NB, len(NB)
+
+    def __getitem__(self, n: int) -> NodeSet:
+        row = self.NB[n].tolist()
+        return {m for m in row if 0 <= m < self.size}
+
+    def get(self, n: int, default=None):
+        return self[n] if 0 <= n < self.size else default
+
+    def __contains__(self, n) -> bool:
+        return 0 <= n < self.size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return iter(range(self.size))
+
+    def items(self):
+        return ((n, self[n]) for n in self)
+
+
+class SharedEdgeAdjacency:
+    """
+    EA (make.make_edges_adjacency) over the neighbour array: the edges parallel to the edge {u, p} are the pairs of
+    neighbours of u and p along the same direction, for the four directions across the edge (within the array, as
+    for SharedAdjacency).
+    """
+    __slots__ = 'NB', 'size'
+
+    def __init__(self, NB: np.ndarray):
+        self.NB, self.size = NB, len(NB)
+
+    def __getitem__(self, edge: FrozenSet[int]) -> FrozenEdges:
+        u, p = edge
+        nu, np_ = self.NB[u].tolist(), self.NB[p].tolist()
+        if (d := nu.index(p) // 2 if p in nu else -1) < 0:
+            raise KeyError(edge)
+        return {
+            frozenset((nu[e], np_[e])) for e in range(6)
+            if e // 2 != d and 0 <= nu[e] < self.size and 0 <= np_[e] < self.size
+        }
+
+    def get(self, edge: FrozenSet[int], default=None):
+        try:
+            return self[edge]
+        except (KeyError, IndexError, ValueError):
+            return default
+
+
+class SharedIndex:
+    """
+    VI (make.make_vi_map) over the grid of the nodes.
+    """
+    __slots__ = 'grid', 'low'
+
+    def __init__(self, grid: np.ndarray, low: int):
+        self.grid, self.low = grid, low
+
+    def __getitem__(self, vector: Vector) -> int:
+        i, j, k = ((int(c) - self.low) // 2 for c in vector)
+        size = len(self.grid)
+        if not (0 <= i < size and 0 <= j < size and 0 <= k < size) or (n := int(self.grid[i, j, k])) < 0:
+            raise KeyError(vector)
+        return n
+
+    def get(self, vector: Vector, default=None):
+        try:
+            return self[vector]
+        except KeyError:
+            return default
+
+    def __contains__(self, vector) -> bool:
+        return self.get(vector) is not None
+
+
+class SharedLevel:
+    """
+    ZA[-1] (make.shrink_adjacency): the adjacency of the level z = -1 within itself (within the array, as for
+    SharedAdjacency).
+    """
+    __slots__ = 'nodes', 'NB', 'size'
+
+    def __init__(self, nodes: np.ndarray, NB: np.ndarray):
+        self.nodes, self.NB, self.size = nodes, NB, len(NB)
+
+    def __getitem__(self, n: int) -> NodeSet:
+        return {m for m in self.NB[n, :4].tolist() if 0 <= m < self.size}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes.tolist())
+
+    def items(self):
+        return ((n, self[n]) for n in self)
+
+
+def graph_arrays(G: Graph) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    The arrays of G to be shared (see the module docs) and the low corner of its grid.
+    """
+    V = np.asarray(G['V'], dtype=np.int32).reshape(-1, 3)
+    ORD = len(V)
+    us, ms = zip(*((u, m) for u, ms in G['A'].items() for m in ms))
+    us, ms = np.array(us, dtype=np.int64), np.array(ms, dtype=np.int64)
+    step = V[ms] - V[us]
+    NB = np.full((ORD, 6), -1, dtype=np.int32)
+    NB[us, (np.abs(step) * [0, 1, 2]).sum(axis=1) // 2 * 2 + (step.sum(axis=1) < 0)] = ms
+    low = int(V.min())
+    grid = np.full(((int(V.max()) - low) // 2 + 1,) * 3, -1, dtype=np.int32)
+    grid[tuple(((V - low) // 2).T)] = np.arange(ORD, dtype=np.int32)
+    W = np.array([G['W'][n] for n in range(ORD)], dtype=np.int32)
+    return {'V': V, 'NB': NB, 'W': W, 'VI': grid, 'Z1': np.fromiter(G['ZA'][-1], dtype=np.int32)}, low
+
+
+class SharedGraph:
+    """
+    A graph placed in shared memory, owned by the process that made it: the block lives until close (or the end of
+    the with block), workers attach to it through handle.
+
+    Examples:
+        >>> with SharedGraph(G) as shared, ProcessPoolExecutor() as pool:
+        ...     cycles = [*pool.map(solve_handle, repeat(shared.handle, 4))]
+    """
+
+    def __init__(self, G: Graph):
+        arrays, low = graph_arrays(G)
+        layout, offset = {}, 0
+        for key, array in arrays.items():
+            layout[key] = offset, array.dtype.str, array.shape
+            offset += -(-array.nbytes // 8) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        for key, array in arrays.items():
+            start = layout[key][0]
+            np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=start)[...] = array
+        self.handle: GraphHandle = {
+            'name': self.shm.name,
+            'ORD': len(arrays['V']),
+            'layout': layout,
+            'low': low,
+            'counts': {z: count for z, count in G['ZA'].items() if z != -1},
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Release and remove the block (attached views in other processes stay valid until they detach).
+        """
+        ATTACHED.pop(self.shm.name, None)
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_graph(handle: GraphHandle) -> Graph:
+    """
+    The graph of a SharedGraph handle, as views of the shared block (attached once per process).
+    """
+    if (attached := ATTACHED.get(handle['name'])) is not None:
+        return attached[1]
+    try:
+        shm = shared_memory.SharedMemory(name=handle['name'], track=False)
+    except TypeError:
+        # before python 3.13 attaching registers the block with the resource tracker, which unlinks it when the process
+        # exits: a process with a tracker of its own (spawned) unregisters it, one sharing the owner's (forked) can't
+        spawned = resource_tracker._resource_tracker._fd is None
+        shm = shared_memory.SharedMemory(name=handle['name'])
+        if spawned:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    views = {
+        key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for key, (offset, dtype, shape) in handle['layout'].items()
+    }
+    G = {
+        'ORD': handle['ORD'],
+        'V': views['V'],
+        'VI': SharedIndex(views['VI'], handle['low']),
+        'A': SharedAdjacency(views['NB']),
+        'EA': SharedEdgeAdjacency(views['NB']),
+        'W': views['W'],
+        'ZA': {**handle['counts'], -1: SharedLevel(views['Z1'], views['NB'])},
+    }
+    ATTACHED[handle['name']] = shm, G
+    return G
+
+
+def solve_handle(handle: GraphHandle) -> Solution:
+    """
+    Attach to a shared graph and solve it (for a pool worker).
+    """
+    from easy_dc.solve import weave_solution
+    G = attach_graph(handle)
+    return weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
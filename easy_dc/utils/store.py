@@ -0,0 +1,151 @@
+"""
+Solution store: solutions are deterministic for an order and a version of the solver, so they are kept once solved,
+keyed by (graph family, order, solver variant, layout, version) where the layout is the numbering of the nodes (edist,
+nested, ...) and the version is a hash of the source of the modules the variant runs. A change to the solver changes
+the version and the old solutions are simply no longer found.
+
+On disk a solution is a .cycle file (int32 encoding, see utils.io) at root/family/variant/ORD.layout.version.cycle,
+written to a temporary file and moved into place with os.replace, so concurrent writers never leave a partial file and
+readers see either no file or a whole one. Reads verify the checksum; a corrupt file is dropped and counts as missing.
+Given the vertices, the start vector of the header is checked against them too, so a solution of another numbering
+is never served as this one (it counts as stale). On top sits an LRU of the solutions read or written, shared
+read-only.
+
+    >>> store = SolutionStore()
+    >>> cycle = store.solve(26208)          # solved once, then read from disk, then from memory
+"""
+import hashlib
+import importlib.util
+import os
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from easy_dc.defs import *
+from easy_dc.utils.io import CycleWriter, load_cycle
+
+StoreKey = Tuple[str, int, str, str, str]
+
+"""
+The modules each variant runs, whose source makes its version, and the numbering of its nodes.
+"""
+VARIANTS = {
+    'weave_solution': ('easy_dc.solve', 'easy_dc.make'),
+    'weave_sharded': ('easy_dc.shard', 'easy_dc.ooc', 'easy_dc.solve', 'easy_dc.make', 'easy_dc.utils.lattice'),
+    'weave_discocube': ('easy_dc.solves.solve',),
+    'weave_classy': ('easy_dc.solves.solve_classy', 'easy_dc.solves.solve'),
+    'weave_vectors': ('easy_dc.solves.solve_as_vectors',),
+}
+LAYOUTS = {'weave_sharded': 'nested'}
+
+
+@lru_cache(maxsize=None)
+def solver_version(variant: str = 'weave_solution') -> str:
+    """
+    The version of a solver variant: the first 16 hex digits of the sha256 of the source of its modules.
+    """
+    digest = hashlib.sha256()
+    for module in VARIANTS[variant]:
+        with open(importlib.util.find_spec(module).origin, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class SolutionStore:
+    """
+    Solutions on disk under root (FP_GRAPHS/solutions by default) with the capacity most recently used kept in memory.
+    """
+
+    def __init__(self, root: Optional[str] = None, capacity: int = 64):
+        self.root = root or os.path.join(FP_GRAPHS, 'solutions')
+        self.capacity = capacity
+        self.memory: OrderedDict = OrderedDict()
+        self.counts = {'memory': 0, 'disk': 0, 'misses': 0, 'corrupt': 0, 'stale': 0}
+
+    def key(self, ORD: int, family: str = 'discocube', variant: str = 'weave_solution',
+            layout: Optional[str] = None) -> StoreKey:
+        return family, ORD, variant, layout or LAYOUTS.get(variant, 'edist'), solver_version(variant)
+
+    def path(self, key: StoreKey) -> str:
+        family, ORD, variant, layout, version = key
+        return os.path.join(self.root, family, variant, f'{ORD}.{layout}.{version}.cycle')
+
+    def get(self, ORD: int, family: str = 'discocube', variant: str = 'weave_solution', layout: Optional[str] = None,
+            V: Optional[Verts] = None) -> Optional[np.ndarray]:
+        """
+        The stored solution (a read-only int array), None if there is none for the current version and layout, or if
+        the vertices V are given and the stored solution doesn't start at the vector it was stored with.
+        """
+        key = self.key(ORD, family, variant, layout)
+        if (cycle := self.memory.get(key)) is not None:
+            self.memory.move_to_end(key)
+            self.counts['memory'] += 1
+            return cycle
+        try:
+            header, payload = load_cycle(path := self.path(key))
+        except FileNotFoundError:
+            self.counts['misses'] += 1
+            return None
+        except ValueError:
+            self.counts['corrupt'] += 1
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+        if V is not None and (header['length'] != ORD or tuple(map(int, V[header['start']])) != header['vector']):
+            self.counts['stale'] += 1
+            return None
+        self.counts['disk'] += 1
+        return self.remember(key, np.array(payload))
+
+    def put(self, ORD: int, cycle: Solution, family: str = 'discocube', variant: str = 'weave_solution',
+            layout: Optional[str] = None, V: Optional[Verts] = None) -> str:
+        """
+        Store a solution, returning its file. The start vector is recorded when the vertices V are given.
+        """
+        key = self.key(ORD, family, variant, layout)
+        os.makedirs(os.path.dirname(path := self.path(key)), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{ORD}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f, CycleWriter(f, ORD=ORD, V=V) as writer:
+                writer.write(cycle)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.remember(key, np.array(cycle, dtype=np.int32))
+        return path
+
+    def remember(self, key: StoreKey, cycle: np.ndarray) -> np.ndarray:
+        cycle.flags.writeable = False
+        self.memory[key] = cycle
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+        return cycle
+
+    def solve(self, ORD: int, variant: str = 'weave_solution', G: Optional[Graph] = None,
+              layout: Optional[str] = None) -> np.ndarray:
+        """
+        The solution of the discocube of order ORD, solved by variant (and stored) unless it is already stored.
+        The variants of the registry number the nodes as the graph G (get_G(ORD) by default), weave_sharded in the
+        nested layout; layout names the numbering of G when it isn't the edist one.
+        """
+        from easy_dc.utils.lattice import RankedV
+        layout = layout or LAYOUTS.get(variant, 'edist')
+        V = G['V'] if G is not None else RankedV(ORD) if layout == 'nested' else None
+        if (cycle := self.get(ORD, variant=variant, layout=layout, V=V)) is not None:
+            return cycle
+        if variant == 'weave_sharded':
+            from easy_dc.shard import weave_sharded
+            cycle = weave_sharded(ORD)
+        else:
+            from easy_dc.registry import SOLVERS
+            from easy_dc.utils.io import get_G
+            V = (G := G or get_G(ORD))['V']
+            cycle = SOLVERS[variant](G)
+        self.put(ORD, cycle, variant=variant, layout=layout, V=V)
+        return self.memory[self.key(ORD, variant=variant, layout=layout)]
@@ -0,0 +1,226 @@
+import json
+import linecache
+import os
+import sys
+import time
+import tracemalloc
+from functools import wraps
+
+from easy_dc.defs import *
+
+
+PACKAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '*')
+
+
+class Span:
+    """
+    A named, timed stage of a run. Records its wall time and the number of memory blocks it left allocated into the
+    collector on exit, and with memory tracing its peak and net traced bytes (see Collector.enable).
+    """
+    __slots__ = 'collector', 'name', 'attrs', 'start', 'blocks', 'current', 'peak'
+
+    def __init__(self, collector, name: str, attrs: Dict[str, Any]):
+        self.collector, self.name, self.attrs = collector, name, attrs
+
+    def __enter__(self):
+        self.collector.stack.append(self.label)
+        if self.collector.memory:
+            self.collector.descend(self)
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        allocs = sys.getallocatedblocks() - self.blocks
+        memory = self.collector.ascend(self) if self.collector.memory else {}
+        self.collector.add(self.name, wall=wall, allocs=allocs, **memory, **self.attrs)
+        self.collector.stack.pop()
+
+    @property
+    def label(self) -> str:
+        return f'{self.name}[{",".join(f"{k}={v}" for k, v in self.attrs.items())}]' if self.attrs else self.name
+
+
+class NoSpan:
+    """
+    Stands in for Span while tracing is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+NOSPAN = NoSpan()
+
+
+class Collector:
+    """
+    Collects spans of the solver stages when enabled, does nothing otherwise.
+
+    Examples:
+        >>> TRACE.enable()
+        >>> with span('spin'):
+        ...     spin()
+        >>> TRACE.summary()['spin']['wall']
+        0.0001
+        >>> TRACE.to_json('trace.json')
+        >>> TRACE.to_folded('trace.folded')   # flamegraph.pl / speedscope input
+
+    With memory, every span also records the peak of the traced memory while it ran and what it left allocated, in
+    bytes above the traced memory when it started (tracemalloc, started if need be: about twice the wall time), and
+    the spans named in snapshots the live memory per source line of the package at their exit:
+        >>> TRACE.enable(memory=True, snapshots=('weave',))
+        >>> TRACE.summary()['weave;stitch']['peak']
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.snapshots: FrozenSet[str] = frozenset()
+        self.records: List[Dict[str, Any]] = []
+        self.stack: List[str] = []
+        self.open: List[Span] = []
+        self.started = False
+
+    def enable(self, reset: bool = True, memory: bool = False, snapshots: Iterable[str] = ()):
+        if reset:
+            self.reset()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        self.enabled, self.memory, self.snapshots = True, memory, frozenset(snapshots)
+
+    def disable(self):
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+        self.enabled = self.memory = False
+
+    def reset(self):
+        self.records, self.stack, self.open = [], [], []
+
+    def descend(self, span: Span):
+        """
+        Start the memory of span: tracemalloc has one peak, so the peak so far goes to the enclosing span and is reset.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if self.open:
+            self.open[-1].peak = max(self.open[-1].peak, peak)
+        tracemalloc.reset_peak()
+        span.current = span.peak = current
+        self.open.append(span)
+
+    def ascend(self, span: Span) -> Dict[str, Any]:
+        """
+        The memory fields of span on its exit: its peak (passed on to the enclosing span), net and, if named in
+        snapshots, the largest live allocations per source line.
+        """
+        self.open.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        span.peak = max(span.peak, peak)
+        if self.open:
+            self.open[-1].peak = max(self.open[-1].peak, span.peak)
+        fields = {'peak': span.peak - span.current, 'net': current - span.current}
+        if span.name in self.snapshots:
+            fields['lines'] = top_lines(tracemalloc.take_snapshot())
+            tracemalloc.reset_peak()
+        return fields
+
+    def span(self, name: str, **attrs) -> Union[Span, NoSpan]:
+        return Span(self, name, attrs) if self.enabled else NOSPAN
+
+    def add(self, name: str, wall: float = 0.0, allocs: int = 0, **fields):
+        """
+        Record a measurement under the current span path, the path ending in name.
+        """
+        path = ';'.join(self.stack) if self.stack and self.stack[-1].startswith(name) else ';'.join([*self.stack, name])
+        self.records.append({'name': name, 'path': path, 'wall': wall, 'allocs': allocs, **fields})
+
+    def summary(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Total wall time, allocations and number of calls per span path.
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['path'], {'calls': 0, 'wall': 0.0, 'allocs': 0})
+            total['calls'] += 1
+            total['wall'] += record['wall']
+            total['allocs'] += record['allocs']
+            if 'peak' in record:
+                total['peak'] = max(total.get('peak', 0), record['peak'])
+        return totals
+
+    def to_json(self, filename: Optional[str] = None) -> str:
+        """
+        The records and their summary as json, written to filename if given.
+        """
+        out = json.dumps({'records': self.records, 'summary': self.summary()}, indent=1)
+        if filename:
+            with open(filename, 'w') as f:
+                f.write(out)
+        return out
+
+    def to_folded(self, filename: Optional[str] = None) -> str:
+        """
+        The records in folded stack format (path self-time in microseconds) for flamegraph tools, written to filename
+        if given.
+        """
+        summary = self.summary()
+        own = {path: total['wall'] for path, total in summary.items()}
+        for path, total in summary.items():
+            if (parent := path.rpartition(';')[0]) in own:
+                own[parent] -= total['wall']
+        out = '\n'.join(f'{path} {max(round(wall * 1e6), 0)}' for path, wall in own.items())
+        if filename:
+            with open(filename, 'w') as f:
+                f.write(out)
+        return out
+
+
+def top_lines(snapshot: tracemalloc.Snapshot, limit: int = 10, pattern: str = PACKAGE) -> List[Dict[str, Any]]:
+    """
+    The source lines of the files matching pattern holding the most live memory in snapshot (the records of the
+    collector left out): where, the code, bytes and blocks.
+    """
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(True, pattern), tracemalloc.Filter(False, os.path.abspath(__file__)),
+    ]).statistics('lineno')
+    return [{
+        'line': f'{os.path.basename(frame.filename)}:{frame.lineno}',
+        'code': linecache.getline(frame.filename, frame.lineno).strip(),
+        'bytes': stat.size,
+        'blocks': stat.count,
+    } for stat in stats[:limit] for frame in stat.traceback[:1]]
+
+
+TRACE = Collector()
+
+
+def span(name: str, **attrs) -> Union[Span, NoSpan]:
+    """
+    Span of the global collector: `with span('cut'): ...`.
+    """
+    return TRACE.span(name, **attrs) if TRACE.enabled else NOSPAN
+
+
+def traced(fn=None, name: Optional[str] = None):
+    """
+    Decorator recording every call of fn as a span of the global collector.
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            if not TRACE.enabled:
+                return func(*args, **kwargs)
+            with TRACE.span(label):
+                return func(*args, **kwargs)
+        return inner
+
+    return decorate(fn) if fn else decorate
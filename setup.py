@@ -1,8 +1,8 @@
 from setuptools import setup, find_packages
 import os
 
-from easy_dc.make import make_dcgraph
-from easy_dc.utils import uon
+from easy_dc.make import GraphBuilder
+from easy_dc.utils.io import save_G
 
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -16,8 +16,8 @@ def create_graph_folder():
 
 def post_install():
     create_graph_folder()
-    for order in uon(32, 26208):
-        make_dcgraph(order)
+    for G in GraphBuilder().graphs(32, 26208):
+        save_G(G, layout='nested')
 
 
 setup(
@@ -38,7 +38,7 @@ setup(
     entry_points={
         'console_scripts': [
             'easy_dc = easy_dc.__main__:main',
-            'easy_dc-solve=easy_dc.weave:weave_discocube'
+            'easy_dc-solve = easy_dc.__main__:solve_main'
         ]
     },
     zip_safe=False,
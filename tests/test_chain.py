@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from easy_dc.make import make_dcgraph
+from easy_dc.solve import weave_solution
+from easy_dc.utils.chain import (
+    decode_chain, encode_chain, make_coord_index, pack_directions, to_nodes, unpack_directions, vector_array
+)
+
+
+def test_chains_decode_to_the_cycle():
+    G = make_dcgraph(1320, save=False)
+    cycle = weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+    start, codes = encode_chain(cycle, G['V'], closed=True)
+    assert len(codes) == len(cycle)
+    codes = unpack_directions(np.frombuffer(pack_directions(codes), dtype=np.uint8), len(codes))
+    vectors = decode_chain(start, codes)
+    assert (vectors[-1] == vectors[0]).all()
+    assert to_nodes(vectors[:-1], make_coord_index(G['V'])).tolist() == cycle
+
+
+def test_chains_refuse_jumps_and_unknown_vectors():
+    G = make_dcgraph(80, save=False)
+    with pytest.raises(ValueError):
+        encode_chain([G['VI'][(-1, -1, -1)], G['VI'][(-3, -3, -1)]], G['V'])
+    with pytest.raises(KeyError):
+        to_nodes(np.array([[1, 1, 101]]), make_coord_index(G['V']))
+    assert (vector_array(G['V']) == np.asarray(G['V'])).all()
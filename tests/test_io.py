@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from easy_dc.make import make_dcgraph
+from easy_dc.solve import weave_solution
+from easy_dc.utils import io
+from easy_dc.utils.info import id_seq
+
+
+def test_nested_layouts_make_a_missing_table(monkeypatch, tmp_path):
+    monkeypatch.setattr(io, 'FP_GRAPHS', str(tmp_path))
+    for order, layout in ((960, 'nested'), (2912, 'ranked'), (280, 'nested')):
+        G = io.get_G(order, layout=layout)
+        assert id_seq(weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA'))), G['A']) == 'loop'
+    assert len(io.get_nested(2912, make=False)) == 2912
+
+
+def test_cycles_round_trip_in_both_encodings(tmp_path):
+    G = make_dcgraph(960, save=False)
+    cycle = weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+    for encoding in io.CYCLE_ENCODINGS:
+        filename = io.save_cycle(cycle, str(tmp_path / encoding), V=G['V'], encoding=encoding, show=False)
+        header, _ = io.load_cycle(filename)
+        assert (header['ORD'], header['length'], header['encoding']) == (960, 960, encoding)
+        assert header['vector'] == G['V'][cycle[0]]
+        assert io.load_cycle_nodes(filename, G['V']).tolist() == cycle
+        assert (io.load_cycle_vectors(filename, G['V']) == np.asarray(G['V'])[cycle]).all()
+        assert io.cycle_bytes(cycle, V=G['V'], encoding=encoding) == open(filename, 'rb').read()
+
+
+def test_corrupt_cycles_are_refused(tmp_path):
+    G = make_dcgraph(280, save=False)
+    filename = io.save_cycle(weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA'))), str(tmp_path / 'c'),
+                             V=G['V'], encoding='dir3', show=False)
+    data = bytearray(open(filename, 'rb').read())
+    data[io.CYCLE_HEADER_SIZE + 7] ^= 1
+    open(filename, 'wb').write(data)
+    with pytest.raises(ValueError, match='checksum'):
+        io.load_cycle(filename)
+    open(filename, 'wb').write(b'NOPE' + data[4:])
+    with pytest.raises(ValueError, match='not a version'):
+        io.load_cycle(filename)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from easy_dc.make import make_nested
+from easy_dc.utils.lattice import RankedV, RankedVI, rank, rank_one, unrank, unrank_one
+
+
+def test_rank_and_unrank_follow_the_nested_table():
+    table = make_nested(26208)
+    ids = np.arange(len(table))
+    assert (unrank(ids) == table['v']).all()
+    assert (rank(table['v']) == ids).all()
+    for n in (0, 1, 31, 32, 959, 960, 26207):
+        assert unrank_one(n) == tuple(map(int, table['v'][n])) and rank_one(*map(int, table['v'][n])) == n
+
+
+def test_ranked_maps_stop_at_the_order():
+    V, VI = RankedV(960), RankedVI(960)
+    assert len(V) == len(VI) == 960
+    assert VI[V[959]] == 959 and V[np.arange(960)].shape == (960, 3)
+    assert unrank_one(960) not in VI and (2, 1, 1) not in VI
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from easy_dc.make import GraphBuilder, make_dcgraph, renumber_graph
+from easy_dc.solve import weave_solution
+from easy_dc.utils import io
+from easy_dc.utils.info import id_seq
+
+
+def test_built_graphs_load_in_the_edist_numbering(monkeypatch, tmp_path):
+    monkeypatch.setattr(io, 'FP_GRAPHS', str(tmp_path))
+    for G in GraphBuilder().graphs(32, 960):
+        io.save_G(G, layout='nested')
+    assert not (tmp_path / '960.pickle').exists()
+    for order in (32, 280, 960):
+        G, M = io.get_G(order), make_dcgraph(order, save=False)
+        assert [tuple(v) for v in G['V']] == M['V'] and G['A'] == M['A'] and G['ZA'] == M['ZA']
+    assert (tmp_path / '960.pickle').exists()
+
+
+def test_renumbered_graphs_solve_and_map_back():
+    G = make_dcgraph(960, save=False)
+    for scheme in ('zlevel', 'morton', 'edist'):
+        R, perm = renumber_graph(G, scheme)
+        assert sorted(perm.tolist()) == [*range(960)]
+        assert all(R['V'][n] == G['V'][o] and R['VI'][G['V'][o]] == n for n, o in enumerate(perm.tolist()))
+        assert {frozenset(perm[[*e]].tolist()) for e in map(tuple, R['E'])} == {frozenset(e) for e in G['E']}
+        cycle = weave_solution(*(R[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+        assert id_seq(cycle, R['A']) == 'loop' and id_seq(perm[cycle].tolist(), G['A']) == 'loop'
+    zlevel = np.asarray(renumber_graph(G, 'zlevel')[0]['V'])[:, 2]
+    assert (np.diff(zlevel) >= 0).all()
+    assert (renumber_graph(G, 'edist')[1] == np.arange(960)).all()
+    with pytest.raises(ValueError):
+        renumber_graph(G, 'hilbert')
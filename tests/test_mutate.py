@@ -0,0 +1,24 @@
+import pytest
+
+from easy_dc.make import make_dcgraph
+from easy_dc.mutate import Mutator, polish
+from easy_dc.solve import weave_solution
+from easy_dc.utils.info import id_seq
+
+
+def test_moves_keep_the_counts_and_the_cycle():
+    G = make_dcgraph(2912, save=False)
+    mutator = Mutator(weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA'))), G['V'], seed=1)
+    for temperature in (24, 8, 0):
+        assert mutator.run(20000, temperature, stop=False) > 0
+        assert mutator.recount() == (mutator.nonturns, mutator.axes)
+        assert id_seq(mutator.cycle(), G['A']) == 'loop'
+
+
+def test_polish_keeps_a_hamiltonian_cycle():
+    G = make_dcgraph(960, save=False)
+    cycle = polish(weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA'))), G['V'], steps=20000, seed=2)
+    assert id_seq(cycle, G['A']) == 'loop'
+    cycle[0], cycle[2] = cycle[2], cycle[0]
+    with pytest.raises(ValueError):
+        Mutator(cycle, G['V'])
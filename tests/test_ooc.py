@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+from easy_dc.make import graph_from_nested, make_nested
+from easy_dc.ooc import weave_out_of_core
+from easy_dc.utils.info import id_seq
+from easy_dc.utils.io import load_cycle, load_cycle_nodes
+
+
+@pytest.mark.parametrize('order', [32, 80, 160, 960, 4480])
+def test_out_of_core_cycles_are_hamiltonian(order, tmp_path):
+    G = graph_from_nested(make_nested(order))
+    filename = weave_out_of_core(order, str(tmp_path / str(order)), budget=2 ** 20, tmpdir=str(tmp_path))
+    assert load_cycle(filename)[0]['length'] == order
+    assert id_seq(load_cycle_nodes(filename, G['V']).tolist(), G['A']) == 'loop'
+    assert os.listdir(tmp_path) == [os.path.basename(filename)]
+
+
+def test_out_of_core_refuses_a_budget_below_one_level(tmp_path):
+    with pytest.raises(MemoryError):
+        weave_out_of_core(960, str(tmp_path / '960'), budget=64)
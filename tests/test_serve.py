@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from easy_dc.make import get_max_xyz
+from easy_dc.serve import SolverService
+
+
+def test_get_max_xyz_rejects_non_orders():
+    assert get_max_xyz(32) == 3 and get_max_xyz(960) == 15
+    with pytest.raises(ValueError):
+        get_max_xyz(961)
+
+
+def test_solve_of_a_non_order_is_refused(tmp_path):
+    async def ask(path):
+        service = SolverService(workers=1)
+        server = asyncio.create_task(service.serve(path=path))
+        while not (tmp_path / 'easy_dc.sock').exists():
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+        answers = []
+        for _ in range(2):
+            writer.write(b'{"op": "solve", "order": 961}\n')
+            answers.append(await asyncio.wait_for(reader.readline(), 5))
+        writer.write(b'{"op": "stats"}\n')
+        answers.append(await asyncio.wait_for(reader.readline(), 5))
+        writer.close()
+        server.cancel()
+        return answers
+
+    *refused, stats = asyncio.run(ask(str(tmp_path / 'easy_dc.sock')))
+    assert all(b'"ok": false' in line and b'961 is not the order' in line for line in refused)
+    assert b'"queue": 0' in stats and b'"errors": 2' in stats
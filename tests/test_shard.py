@@ -0,0 +1,12 @@
+import pytest
+
+from easy_dc.make import graph_from_nested, make_nested
+from easy_dc.shard import weave_sharded
+from easy_dc.utils.info import id_seq
+
+
+@pytest.mark.parametrize('order, workers, slabs', [(32, 1, None), (80, 1, 3), (960, 2, None), (4480, 2, 5)])
+def test_sharded_cycles_are_hamiltonian(order, workers, slabs):
+    G = graph_from_nested(make_nested(order))
+    cycle = weave_sharded(order, workers=workers, slabs=slabs)
+    assert len(cycle) == order and id_seq(cycle.tolist(), G['A']) == 'loop'
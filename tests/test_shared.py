@@ -0,0 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from easy_dc.make import make_dcgraph
+from easy_dc.solve import weave_solution
+from easy_dc.utils.shared import SharedGraph, attach_graph, solve_handle
+
+
+def test_shared_graphs_solve_like_the_graph():
+    G = make_dcgraph(960, save=False)
+    cycle = weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA')))
+    with SharedGraph(G) as shared:
+        attached = attach_graph(shared.handle)
+        assert all(attached['A'][n] == G['A'][n] for n in G['A'])
+        assert all(attached['VI'][v] == n for n, v in enumerate(G['V']))
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            cycles = [*pool.map(solve_handle, repeat(shared.handle, 2))]
+    assert [list(c) for c in cycles] == [cycle, cycle]
@@ -0,0 +1,38 @@
+import time
+
+import easy_dc.solve
+from easy_dc.make import make_dcgraph
+from easy_dc.solve import weave_range, weave_solution
+from easy_dc.utils.gens import uon
+from easy_dc.utils.info import id_seq
+
+
+def test_weave_range_extends_every_order(monkeypatch):
+    solved = []
+    weave_solution = easy_dc.solve.weave_solution
+    monkeypatch.setattr(
+        easy_dc.solve, 'weave_solution', lambda A, *args: solved.append(len(A)) or weave_solution(A, *args)
+    )
+    graphs = {}
+    get = lambda order: graphs.setdefault(order, make_dcgraph(order, save=False))
+    for order, solution in weave_range(32, 960, get=get):
+        assert id_seq(solution, graphs.pop(order)['A']) == 'loop'
+    assert solved == [32]
+
+
+def test_weave_range_is_faster_than_solving_every_order():
+    graphs = {order: make_dcgraph(order, save=False) for order in uon(32, 5280)}
+
+    def best(run):
+        times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    sweep = best(lambda: [*weave_range(32, 5280, get=graphs.__getitem__)])
+    scratch = best(lambda: [
+        weave_solution(*(G[k] for k in ('A', 'V', 'VI', 'EA', 'W', 'ZA'))) for G in graphs.values()
+    ])
+    assert sweep < scratch
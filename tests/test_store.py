@@ -0,0 +1,30 @@
+import os
+
+import numpy as np
+
+from easy_dc.make import make_dcgraph, renumber_graph
+from easy_dc.utils.info import id_seq
+from easy_dc.utils.store import SolutionStore
+
+
+def test_stored_solutions_are_read_back(tmp_path):
+    G = make_dcgraph(960, save=False)
+    cycle = SolutionStore(str(tmp_path)).solve(960, G=G)
+    store = SolutionStore(str(tmp_path))
+    assert (store.solve(960, G=G) == cycle).all() and store.counts['disk'] == 1
+    assert (store.solve(960, G=G) == cycle).all() and store.counts['memory'] == 1
+    assert id_seq(cycle.tolist(), G['A']) == 'loop'
+
+
+def test_corrupt_and_stale_solutions_are_not_served(tmp_path):
+    G = make_dcgraph(960, save=False)
+    path = SolutionStore(str(tmp_path)).put(960, np.arange(960), V=G['V'])
+    R = renumber_graph(G, 'zlevel')[0]
+    store = SolutionStore(str(tmp_path))
+    assert store.get(960, V=R['V']) is None and store.counts['stale'] == 1
+    data = bytearray(open(path, 'rb').read())
+    data[-1] ^= 1
+    open(path, 'wb').write(data)
+    assert store.get(960, V=G['V']) is None and store.counts['corrupt'] == 1 and not os.path.exists(path)
+    cycle = store.solve(960, G=R, layout='zlevel')
+    assert id_seq(cycle.tolist(), R['A']) == 'loop' and store.counts['misses'] == 1